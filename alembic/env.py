@@ -8,7 +8,7 @@ from alembic import context
 import os
 from dotenv import load_dotenv
 from app.database import Base
-from app.models import user, exercise, workout_plan, workout_exercise, scheduled_workout
+from app.models import user, exercise, workout_plan, workout_exercise, scheduled_workout, training_volume, workout_recurrence, sync, revoked_token, rate_limit
 
 # Load environment variables
 load_dotenv()
@@ -0,0 +1,93 @@
+"""exercise full-text search
+
+Revision ID: 3f1c9a2b7d40
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2b7d40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        # STORED generated column: adding it computes the vector for every existing row
+        op.execute(
+            """
+            ALTER TABLE exercises ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        op.create_index(
+            "ix_exercises_search_vector",
+            "exercises",
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+    elif bind.dialect.name == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE exercises_fts USING fts5(
+                name, description, content='exercises', content_rowid='id'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER exercises_fts_ai AFTER INSERT ON exercises BEGIN
+                INSERT INTO exercises_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER exercises_fts_ad AFTER DELETE ON exercises BEGIN
+                INSERT INTO exercises_fts(exercises_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER exercises_fts_au AFTER UPDATE ON exercises BEGIN
+                INSERT INTO exercises_fts(exercises_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO exercises_fts(rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """
+        )
+        # Backfill the index from existing rows
+        op.execute("INSERT INTO exercises_fts(exercises_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == "postgresql":
+        op.drop_index("ix_exercises_search_vector", table_name="exercises")
+        op.drop_column("exercises", "search_vector")
+
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS exercises_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS exercises_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS exercises_fts_ai")
+        op.execute("DROP TABLE IF EXISTS exercises_fts")
@@ -0,0 +1,32 @@
+"""scheduled workouts user/date index
+
+Revision ID: 8b2e4d6a1c93
+Revises: 3f1c9a2b7d40
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6a1c93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a2b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_scheduled_workouts_user_id_scheduled_date",
+        "scheduled_workouts",
+        ["user_id", "scheduled_date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_scheduled_workouts_user_id_scheduled_date", table_name="scheduled_workouts")
@@ -0,0 +1,33 @@
+"""rate limit counters
+
+Revision ID: b5d7f9a1c246
+Revises: a2c4e6f8b013
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d7f9a1c246'
+down_revision: Union[str, Sequence[str], None] = 'a2c4e6f8b013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("window_start", sa.BigInteger(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("rate_limit_counters")
@@ -0,0 +1,51 @@
+"""training volume weekly rollup
+
+Revision ID: c5d1f7a3e284
+Revises: 8b2e4d6a1c93
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d1f7a3e284'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types already created for the exercises table
+MUSCLE_GROUP = postgresql.ENUM(
+    "CHEST", "BACK", "SHOULDERS", "ARMS", "LEGS", "CORE", "FULL_BODY", "GLUTES",
+    name="musclegroup", create_type=False,
+)
+EXERCISE_CATEGORY = postgresql.ENUM(
+    "STRENGTH", "CARDIO", "FLEXIBILITY", "BALANCE", "SPORTS",
+    name="exercisecategory", create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "training_volume_weeks",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("muscle_group", MUSCLE_GROUP, nullable=False),
+        sa.Column("category", EXERCISE_CATEGORY, nullable=False),
+        sa.Column("volume", sa.Numeric(14, 2), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.Column("workouts", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "week_start", "muscle_group", "category"),
+    )
+    # Backfill with: python -m app.services.analytics_service
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("training_volume_weeks")
@@ -0,0 +1,68 @@
+"""scheduled workout volume snapshots
+
+Revision ID: c7e9a1b3d5f8
+Revises: c5d1f7a3e284
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9a1b3d5f8'
+down_revision: Union[str, Sequence[str], None] = 'c5d1f7a3e284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum types already created for the exercises table
+MUSCLE_GROUP = postgresql.ENUM(
+    "CHEST", "BACK", "SHOULDERS", "ARMS", "LEGS", "CORE", "FULL_BODY", "GLUTES",
+    name="musclegroup", create_type=False,
+)
+EXERCISE_CATEGORY = postgresql.ENUM(
+    "STRENGTH", "CARDIO", "FLEXIBILITY", "BALANCE", "SPORTS",
+    name="exercisecategory", create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduled_workout_volumes",
+        sa.Column(
+            "scheduled_workout_id",
+            sa.Integer(),
+            sa.ForeignKey("scheduled_workouts.id", ondelete="CASCADE"),
+            nullable=False
+        ),
+        sa.Column("muscle_group", MUSCLE_GROUP, nullable=False),
+        sa.Column("category", EXERCISE_CATEGORY, nullable=False),
+        sa.Column("volume", sa.Numeric(14, 2), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("scheduled_workout_id", "muscle_group", "category"),
+    )
+    # Workouts completed so far: their plans as they are now, which is what
+    # the rollup would be rebuilt from
+    op.execute("""
+        INSERT INTO scheduled_workout_volumes
+            (scheduled_workout_id, muscle_group, category, volume, sets, repetitions)
+        SELECT sw.id, e.muscle_group, e.category,
+               SUM(we.sets * we.repetitions * COALESCE(we.weight, 0)),
+               SUM(we.sets),
+               SUM(we.sets * we.repetitions)
+        FROM scheduled_workouts sw
+        JOIN workout_exercises we ON we.workout_plan_id = sw.workout_plan_id
+        JOIN exercises e ON e.id = we.exercise_id
+        WHERE sw.status = 'completed'
+        GROUP BY sw.id, e.muscle_group, e.category
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("scheduled_workout_volumes")
@@ -0,0 +1,68 @@
+"""workout recurrences
+
+Revision ID: d8e2a4b6f071
+Revises: c7e9a1b3d5f8
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2a4b6f071'
+down_revision: Union[str, Sequence[str], None] = 'c7e9a1b3d5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "workout_recurrences",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("workout_plan_id", sa.Integer(), sa.ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("scheduled_time", sa.Time(), nullable=True),
+        sa.Column("frequency", sa.String(20), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("weekdays", sa.String(20), nullable=True),
+        sa.Column("until", sa.Date(), nullable=True),
+        sa.Column("count", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_workout_recurrences_id", "workout_recurrences", ["id"])
+    op.create_index("ix_workout_recurrences_user_id", "workout_recurrences", ["user_id"])
+
+    # batch mode so the constraints can be added on SQLite too
+    with op.batch_alter_table("scheduled_workouts") as batch:
+        batch.add_column(sa.Column("recurrence_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("occurrence_date", sa.Date(), nullable=True))
+        batch.create_foreign_key(
+            "fk_scheduled_workouts_recurrence_id",
+            "workout_recurrences",
+            ["recurrence_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch.create_unique_constraint(
+            "uq_scheduled_workouts_recurrence_occurrence",
+            ["recurrence_id", "occurrence_date"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("scheduled_workouts") as batch:
+        batch.drop_constraint("uq_scheduled_workouts_recurrence_occurrence", type_="unique")
+        batch.drop_constraint("fk_scheduled_workouts_recurrence_id", type_="foreignkey")
+        batch.drop_column("occurrence_date")
+        batch.drop_column("recurrence_id")
+    op.drop_index("ix_workout_recurrences_user_id", table_name="workout_recurrences")
+    op.drop_index("ix_workout_recurrences_id", table_name="workout_recurrences")
+    op.drop_table("workout_recurrences")
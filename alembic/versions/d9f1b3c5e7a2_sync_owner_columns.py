@@ -0,0 +1,55 @@
+"""sync by owner: workout_exercises.user_id, workout_recurrences.change_seq
+
+Revision ID: d9f1b3c5e7a2
+Revises: e4b7c9d2a158
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c5e7a2'
+down_revision: Union[str, Sequence[str], None] = 'e4b7c9d2a158'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plan exercises carry their plan's owner, so delta sync is one
+    # (user_id, change_seq) range scan instead of a join through workout_plans
+    op.add_column("workout_exercises", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE workout_exercises
+        SET user_id = (SELECT user_id FROM workout_plans WHERE workout_plans.id = workout_exercises.workout_plan_id)
+    """)
+    with op.batch_alter_table("workout_exercises") as batch_op:
+        batch_op.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            "fk_workout_exercises_user_id_users", "users", ["user_id"], ["id"], ondelete="CASCADE"
+        )
+    op.drop_index("ix_workout_exercises_workout_plan_id_change_seq", table_name="workout_exercises")
+    op.create_index("ix_workout_exercises_user_id_change_seq", "workout_exercises", ["user_id", "change_seq"])
+
+    # Recurrences join the sync feed; existing rows sort before any allocated position
+    op.add_column("workout_recurrences", sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+    op.execute("UPDATE workout_recurrences SET change_seq = -id")
+    op.create_index("ix_workout_recurrences_user_id_change_seq", "workout_recurrences", ["user_id", "change_seq"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_workout_recurrences_user_id_change_seq", table_name="workout_recurrences")
+    op.drop_column("workout_recurrences", "change_seq")
+
+    op.drop_index("ix_workout_exercises_user_id_change_seq", table_name="workout_exercises")
+    op.create_index(
+        "ix_workout_exercises_workout_plan_id_change_seq", "workout_exercises", ["workout_plan_id", "change_seq"]
+    )
+    with op.batch_alter_table("workout_exercises") as batch_op:
+        batch_op.drop_constraint("fk_workout_exercises_user_id_users", type_="foreignkey")
+        batch_op.drop_column("user_id")
@@ -0,0 +1,75 @@
+"""sync change sequences
+
+Revision ID: e4b7c9d2a158
+Revises: d8e2a4b6f071
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c9d2a158'
+down_revision: Union[str, Sequence[str], None] = 'd8e2a4b6f071'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ("exercises", "workout_plans", "workout_exercises", "scheduled_workouts")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+    op.add_column("exercises", sa.Column("public_change_seq", sa.BigInteger(), nullable=True))
+
+    # Existing rows get distinct positions below any allocated one, so a full
+    # sync can page through them and every later change sorts after them
+    for table in SYNCED_TABLES:
+        op.execute(f"UPDATE {table} SET change_seq = -id")
+    op.execute("UPDATE exercises SET public_change_seq = -id WHERE is_public")
+
+    op.create_index("ix_exercises_created_by_change_seq", "exercises", ["created_by", "change_seq"])
+    op.create_index("ix_exercises_public_change_seq", "exercises", ["public_change_seq"])
+    op.create_index("ix_workout_plans_user_id_change_seq", "workout_plans", ["user_id", "change_seq"])
+    op.create_index(
+        "ix_workout_exercises_workout_plan_id_change_seq", "workout_exercises", ["workout_plan_id", "change_seq"]
+    )
+    op.create_index("ix_scheduled_workouts_user_id_change_seq", "scheduled_workouts", ["user_id", "change_seq"])
+
+    op.create_table(
+        "sync_counters",
+        sa.Column("scope", sa.String(64), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("scope", sa.String(64), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("entity_type", sa.String(32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_sync_tombstones_scope_change_seq", "sync_tombstones", ["scope", "change_seq"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sync_tombstones_scope_change_seq", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
+    op.drop_table("sync_counters")
+
+    op.drop_index("ix_scheduled_workouts_user_id_change_seq", table_name="scheduled_workouts")
+    op.drop_index("ix_workout_exercises_workout_plan_id_change_seq", table_name="workout_exercises")
+    op.drop_index("ix_workout_plans_user_id_change_seq", table_name="workout_plans")
+    op.drop_index("ix_exercises_public_change_seq", table_name="exercises")
+    op.drop_index("ix_exercises_created_by_change_seq", table_name="exercises")
+
+    op.drop_column("exercises", "public_change_seq")
+    for table in SYNCED_TABLES:
+        op.drop_column(table, "change_seq")
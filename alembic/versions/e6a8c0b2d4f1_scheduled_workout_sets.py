@@ -0,0 +1,56 @@
+"""scheduled workout set snapshots
+
+Revision ID: e6a8c0b2d4f1
+Revises: b5d7f9a1c246
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8c0b2d4f1'
+down_revision: Union[str, Sequence[str], None] = 'b5d7f9a1c246'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduled_workout_sets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "scheduled_workout_id",
+            sa.Integer(),
+            sa.ForeignKey("scheduled_workouts.id", ondelete="CASCADE"),
+            nullable=False
+        ),
+        sa.Column("exercise_id", sa.Integer(), sa.ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.Column("weight", sa.Numeric(10, 2), nullable=True),
+    )
+    op.create_index(
+        "ix_scheduled_workout_sets_scheduled_workout_id",
+        "scheduled_workout_sets",
+        ["scheduled_workout_id"]
+    )
+    # Workouts completed so far: their plans as they are now, which is what
+    # personal records were computed from until this change
+    op.execute("""
+        INSERT INTO scheduled_workout_sets (scheduled_workout_id, exercise_id, sets, repetitions, weight)
+        SELECT sw.id, we.exercise_id, we.sets, we.repetitions, we.weight
+        FROM scheduled_workouts sw
+        JOIN workout_exercises we ON we.workout_plan_id = sw.workout_plan_id
+        WHERE sw.status = 'completed'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_scheduled_workout_sets_scheduled_workout_id", table_name="scheduled_workout_sets")
+    op.drop_table("scheduled_workout_sets")
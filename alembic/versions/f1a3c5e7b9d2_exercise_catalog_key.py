@@ -0,0 +1,30 @@
+"""exercise catalog key
+
+Revision ID: f1a3c5e7b9d2
+Revises: d9f1b3c5e7a2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b9d2'
+down_revision: Union[str, Sequence[str], None] = 'd9f1b3c5e7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("exercises", sa.Column("catalog_key", sa.String(100), nullable=True))
+    op.create_index("ix_exercises_catalog_key", "exercises", ["catalog_key"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_exercises_catalog_key", table_name="exercises")
+    op.drop_column("exercises", "catalog_key")
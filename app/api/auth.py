@@ -2,7 +2,7 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.database import get_db
 from app.schemas.auth import Token, LoginRequest
 from app.schemas.user import UserCreate, UserResponse
 from app.services.user_service import (
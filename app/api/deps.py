@@ -1,25 +1,57 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+import math
+from typing import AsyncGenerator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.database import get_async_db, open_read_session, get_replicas
 from app.core.security import verify_token
+from app.core.cache import get_principal_cache
+from app.core.read_your_writes import LAST_WRITE_COOKIE, wrote_recently
+from app.core.request_timing import timing_phase
+from app.core.password_pool import get_password_pool
+from app.core.rate_limit import Rate, get_rate_limiter
+from app.config import settings
 from app.models.user import User
 
 # OAuth2 scheme for JWT
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+# Same, for dependencies that also serve anonymous requests
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
-def get_db() -> Generator:
-  db = SessionLocal()
-  try:
-    yield db
-  finally:
-    db.close()
+async def get_async_read_db(
+  request: Request,
+  token: Optional[str] = Depends(optional_oauth2_scheme),
+  db: AsyncSession = Depends(get_async_db)
+) -> AsyncGenerator[AsyncSession, None]:
+  """
+  Session for read-only routes: a read replica when configured, the primary
+  (the request's get_async_db session) right after the caller's own write,
+  whether this worker took it or the client's last-write cookie says so.
+  Never write through it.
+  """
+  # The subject only matters for stickiness, which needs replicas
+  subject = verify_token(token) if token and get_replicas() else None
+  sticky = subject is not None and wrote_recently(request.cookies.get(LAST_WRITE_COOKIE), subject)
+  async for read_db in open_read_session(db, subject, wrote_recently=sticky):
+    yield read_db
+
+def _detached_copy(user: User) -> User:
+  """Snapshot a user's columns so the cached copy is never mutated by a request"""
+  copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+  make_transient_to_detached(copy)
+  return copy
 
 async def get_current_user(
   token: str = Depends(oauth2_scheme),
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_async_read_db),
+  primary_db: AsyncSession = Depends(get_async_db)
 ) -> User:
+  with timing_phase("auth"):
+    return await _resolve_user(token, db, primary_db)
+
+async def _resolve_user(token: str, db: AsyncSession, primary_db: AsyncSession) -> User:
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,9 +62,59 @@ async def get_current_user(
     email = verify_token(token)
     if email is None:
       raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+
+    cached_user = get_principal_cache().get(email)
+    if cached_user is not None:
+      # Attach a copy to this request's session without hitting the database
+      return await db.merge(cached_user, load=False)
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
+    if user is None and db is not primary_db:
+      # A replica may not have a just-registered user yet
+      result = await primary_db.execute(select(User).where(User.email == email))
+      user = result.scalar_one_or_none()
     if user is None:
       raise credentials_exception
-    
+
+    get_principal_cache().set(email, _detached_copy(user))
     return user
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+  """The current user, if listed in ADMIN_EMAILS"""
+  admin_emails = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+  if current_user.email.lower() not in admin_emails:
+    raise HTTPException(
+      status_code=status.HTTP_403_FORBIDDEN,
+      detail="Admin access required"
+    )
+  return current_user
+
+async def limit_auth_attempts(request: Request, action: str, email: Optional[str] = None) -> None:
+  """
+  Guard an endpoint that costs a bcrypt hash: 503 while the hashing queue is
+  too deep (load shedding), 429 past the per-IP or per-email rate limit.
+  Both carry Retry-After. Call before any hashing work.
+  """
+  queue_depth = get_password_pool().stats()["queue_depth"]
+  if queue_depth > settings.PASSWORD_HASH_MAX_QUEUE:
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Server is busy, try again shortly",
+      headers={"Retry-After": str(max(1, math.ceil(get_password_pool().wait_estimate())))}
+    )
+
+  window = settings.AUTH_RATE_LIMIT_WINDOW_SECONDS
+  # Behind a proxy, run uvicorn with --proxy-headers so this is the client's address
+  limits = [(f"{action}:ip:{request.client.host if request.client else 'unknown'}", Rate(settings.AUTH_RATE_LIMIT_PER_IP, window))]
+  if email:
+    limits.append((f"{action}:email:{email.strip().lower()}", Rate(settings.AUTH_RATE_LIMIT_PER_EMAIL, window)))
+
+  for key, rate in limits:
+    retry_after = await get_rate_limiter().hit(key, rate)
+    if retry_after:
+      raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+      )
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from app.api.deps import get_async_db, get_current_user
+from app.models.user import User
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.schemas.analytics import TrainingVolumeWeekResponse, PersonalRecordResponse
+from app.services.analytics_service import get_training_volume_async
+from app.services.personal_record_service import get_personal_records_async
+from app.core.request_timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+# Weeks shown when no range is given
+DEFAULT_RANGE_WEEKS = 12
+
+# Longest range served by a single request
+MAX_RANGE_DAYS = 5 * 366
+
+
+@router.get("/volume", response_model=List[TrainingVolumeWeekResponse])
+async def get_weekly_training_volume(
+    date_from: Optional[date] = Query(None, alias="from", description="First day of the range (defaults to 12 weeks ago)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last day of the range (defaults to today)"),
+    muscle_group: Optional[MuscleGroup] = Query(None, description="Filter by muscle group"),
+    category: Optional[ExerciseCategory] = Query(None, description="Filter by category"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get your weekly training volume (sets x repetitions x weight) per muscle
+    group and category, from completed scheduled workouts.
+
+    Weeks start on Monday; every week overlapping the range is included.
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(weeks=DEFAULT_RANGE_WEEKS)
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be on or after 'from'"
+        )
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range can't exceed {MAX_RANGE_DAYS} days"
+        )
+
+    return await get_training_volume_async(
+        db, current_user.id, date_from, date_to, muscle_group, category
+    )
+
+
+@router.get("/personal-records", response_model=List[PersonalRecordResponse])
+async def get_personal_records(
+    exercise_id: Optional[int] = Query(None, description="Only this exercise"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get your personal records per exercise from completed scheduled workouts:
+    estimated one-rep max (Epley and Brzycki), heaviest weight, best set and
+    the heaviest weight in each rep range.
+
+    Bodyweight entries (no weight) are not counted.
+    """
+    records = await get_personal_records_async(db, current_user.id)
+    if exercise_id is not None:
+        records = [record for record in records if record["exercise_id"] == exercise_id]
+    return records
@@ -1,26 +1,30 @@
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db, limit_auth_attempts
 from app.schemas.auth import Token, LoginRequest, RefreshTokenRequest
 from app.schemas.user import UserCreate, UserResponse
 from app.services.user_service import (
-    create_user,
-    authenticate_user,
-    get_user_by_email
+    create_user_async,
+    authenticate_user_async,
+    get_user_by_email_async
 )
-from app.core.security import create_access_token, create_refresh_token,verify_token
+from app.services.token_revocation_service import revoke_token_async, revoke_all_tokens_async
+from app.core.security import create_access_token, create_refresh_token, verify_token_claims
 from app.config import settings
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user with email and password"""
+    await limit_auth_attempts(request, "register", user.email)
+
     # Check if user already exists
-    existing_user = get_user_by_email(db, user.email)
+    existing_user = await get_user_by_email_async(db, user.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -28,18 +32,21 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    db_user = create_user(db, user)
+    db_user = await create_user_async(db, user)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login with email and password, returns JWT token"""
+    await limit_auth_attempts(request, "login", form_data.username)
+
     # Authenticate user
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,25 +70,43 @@ def login(
         }
 
 @router.post("/refresh", response_model=Token)
-def refresh_access_token(
+async def refresh_access_token(
     refresh_request: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    email = verify_token(refresh_request.refresh_token, token_type="refresh")
-    if email is None:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    Each refresh token works once: presenting a used one again revokes
+    all of the user's tokens, as it has probably leaked.
+    """
+    # A used jti is left to the rotation below, which also detects reuse
+    claims = verify_token_claims(refresh_request.refresh_token, token_type="refresh", check_jti=False)
+    # Tokens issued before rotation have no jti and can't be made single-use
+    if claims is None or "jti" not in claims:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    email = claims["sub"]
 
     # Check if user still exists
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email_async(db, email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+
+    # Rotate: the unique jti makes this atomic across workers
+    expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+    if not await revoke_token_async(db, claims["jti"], email, expires_at, reason="rotated"):
+        await revoke_all_tokens_async(db, email, reason="reuse")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token already used",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     # Create new access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -96,4 +121,25 @@ def refresh_access_token(
         "access_token": access_token,
         "token_type": "bearer",
         "refresh_token": new_refresh_token
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_request: RefreshTokenRequest,
+    all_sessions: bool = Query(False, description="Also revoke every other token issued to you"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Revoke a refresh token, or with all_sessions every access and refresh
+    token issued to its user so far. Invalid or already revoked tokens are ignored.
+    """
+    claims = verify_token_claims(refresh_request.refresh_token, token_type="refresh")
+    if claims is None:
+        return
+
+    if all_sessions:
+        await revoke_all_tokens_async(db, claims["sub"], reason="logout")
+    elif "jti" in claims:
+        expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+        await revoke_token_async(db, claims["jti"], claims["sub"], expires_at, reason="logout")
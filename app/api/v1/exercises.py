@@ -1,28 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_async_read_db, get_current_user, get_current_admin
 from app.models.user import User
 from app.models.exercise import ExerciseCategory, MuscleGroup
 from app.schemas.exercise import (
     ExerciseCreate,
     ExerciseResponse,
     ExerciseUpdate,
-    ExerciseListResponse
+    ExerciseListResponse,
+    ExerciseCatalogLoadResponse
 )
 from app.services.exercise_service import (
-    get_exercises,
-    get_exercise_by_id,
-    create_exercise,
-    update_exercise,
-    delete_exercise
+    get_exercises_async,
+    get_exercise_by_id_async,
+    create_exercise_async,
+    update_exercise_async,
+    delete_exercise_async,
+    EXERCISE_LIST_FIELDS,
+    PUBLIC_EXERCISES
 )
+from app.services.exercise_catalog_service import iter_csv_catalog_records, load_catalog_async
+from app.services.plan_import_service import iter_lines, iter_jsonl_records
+from app.core.cache import collection_versions, get_etag_cache
+from app.core.etag import compute_etag, etag_matches, not_modified, set_etag
+from app.core.pagination import InvalidCursorError
+from app.core.request_timing import TimedRoute
+from app.core.responses import ORJSONResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
-@router.get("", response_model=ExerciseListResponse)
-def list_exercises(
+# --- Helper ---
+
+def _etag_cache_key(user_id: int, request: Request) -> tuple:
+    """Key for the last ETag served for this request, valid until the user's or public exercises change"""
+    return (
+        "exercises",
+        user_id,
+        collection_versions.get(("exercises", user_id)),
+        collection_versions.get(PUBLIC_EXERCISES),
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items()))
+    )
+
+
+@router.get("", response_model=ExerciseListResponse, response_class=ORJSONResponse)
+async def list_exercises(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Max number of records to return"),
     only_mine: bool = Query(False, description="Show only exercises created by me"),
@@ -30,10 +55,13 @@ def list_exercises(
     muscle_group: Optional[MuscleGroup] = Query(None, description="Filter by muscle group"),
     is_public: Optional[bool] = Query(None, description="Filter by public/private status"),
     search: Optional[str] = Query(None, min_length=1, description="Search in name and description"),
-    sort_by: str = Query("created_at", description="Field to sort by (name, created_at, category)"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by (name, created_at, category, relevance). Defaults to relevance when searching, otherwise created_at"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order: asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Compute the total number of matching exercises"),
+    estimate_total: bool = Query(False, description="Allow an approximate total for the unfiltered catalog"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get list of exercises with filters and pagination.
@@ -46,35 +74,82 @@ def list_exercises(
     - only_mine: Show only your exercises
     - category: Filter by exercise type (strength, cardio, etc.)
     - muscle_group: Filter by target muscle
-    - search: Search in exercise name and description
+    - search: Full-text search in exercise name and description (ranked by relevance)
+
+    For deep pages, pass the returned next_cursor back as cursor (keeping the
+    same filters and sorting). Cursor pages don't include a total count.
+    Infinite-scroll clients can skip the count with include_total=false, or
+    accept an approximate one with estimate_total=true.
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    when nothing changed.
     """
-    exercises, total = get_exercises(
-        db=db,
-        current_user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        only_mine=only_mine,
-        category=category,
-        muscle_group=muscle_group,
-        is_public=is_public,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
+    cache_key = _etag_cache_key(current_user.id, request)
+    cached_etag = get_etag_cache().get(cache_key) if request.headers.get("if-none-match") else None
+    if cached_etag and etag_matches(request, cached_etag):
+        return not_modified(cached_etag)
+
+    try:
+        exercises, total, next_cursor = await get_exercises_async(
+            db=db,
+            current_user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            only_mine=only_mine,
+            category=category,
+            muscle_group=muscle_group,
+            is_public=is_public,
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total,
+            estimate_total=estimate_total,
+            columns_only=True
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
     
-    return ExerciseListResponse(
-        exercises=exercises,
-        total=total,
-        skip=skip,
-        limit=limit
+    # From the page's row versions, so a repeat request is answered before rendering
+    etag = compute_etag(
+        current_user.id,
+        sorted(request.query_params.multi_items()),
+        total,
+        next_cursor,
+        [(exercise.id, exercise.change_seq, exercise.public_change_seq) for exercise in exercises]
     )
+    get_etag_cache().set(cache_key, etag)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Rows are plain column values, so they're encoded directly (shaped like ExerciseListResponse)
+    list_response = ORJSONResponse({
+        "exercises": [dict(zip(EXERCISE_LIST_FIELDS, exercise)) for exercise in exercises],
+        "total": total,
+        # Estimates only apply to the unfiltered catalog (and may fall back to exact)
+        "total_is_estimate": bool(
+            estimate_total
+            and total is not None
+            and not (only_mine or category or muscle_group or is_public is not None or search)
+        ),
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    })
+    set_etag(list_response, etag)
+    return list_response
 
 
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
-def get_exercise(
+async def get_exercise(
     exercise_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get a specific exercise by ID.
@@ -82,8 +157,15 @@ def get_exercise(
     You can only view:
     - Exercises you created
     - Public exercises created by others
+
+    Supports If-None-Match with the returned ETag.
     """
-    exercise = get_exercise_by_id(db, exercise_id)
+    cache_key = _etag_cache_key(current_user.id, request)
+    cached_etag = get_etag_cache().get(cache_key) if request.headers.get("if-none-match") else None
+    if cached_etag and etag_matches(request, cached_etag):
+        return not_modified(cached_etag)
+
+    exercise = await get_exercise_by_id_async(db, exercise_id)
     
     if not exercise:
         raise HTTPException(
@@ -97,15 +179,26 @@ def get_exercise(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to view this exercise"
         )
-    
+
+    etag = compute_etag(
+        exercise.id,
+        exercise.change_seq,
+        exercise.public_change_seq,
+        exercise.updated_at or exercise.created_at
+    )
+    get_etag_cache().set(cache_key, etag)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     return exercise
 
 
 @router.post("", response_model=ExerciseResponse, status_code=status.HTTP_201_CREATED)
-def create_new_exercise(
+async def create_new_exercise(
     exercise: ExerciseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new exercise.
@@ -113,22 +206,48 @@ def create_new_exercise(
     The exercise will be created with you as the owner.
     Set is_public=true to share it with other users.
     """
-    return create_exercise(db, exercise, current_user.id)
+    return await create_exercise_async(db, exercise, current_user.id)
+
+
+@router.post("/catalog", response_model=ExerciseCatalogLoadResponse)
+async def load_exercise_catalog(
+    request: Request,
+    current_user: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Load the public exercise catalog from a streamed request body (admins only).
+
+    - application/x-ndjson (default): one exercise per line with key, name,
+      description, category, muscle_group
+    - text/csv: the same fields as columns, with a header row
+
+    Rows are matched on key (the lowercased name when omitted): new ones are
+    inserted, changed ones updated. Catalog exercises are public and have no owner.
+    """
+    lines = iter_lines(request.stream())
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        records = iter_csv_catalog_records(lines)
+    else:
+        records = iter_jsonl_records(lines)
+
+    loaded, unchanged, errors = await load_catalog_async(db, records)
+    return ExerciseCatalogLoadResponse(loaded=loaded, unchanged=unchanged, failed=len(errors), errors=errors)
 
 
 @router.put("/{exercise_id}", response_model=ExerciseResponse)
-def update_existing_exercise(
+async def update_existing_exercise(
     exercise_id: int,
     exercise_update: ExerciseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an exercise.
     
     You can only update exercises you created.
     """
-    updated_exercise = update_exercise(db, exercise_id, exercise_update, current_user.id)
+    updated_exercise = await update_exercise_async(db, exercise_id, exercise_update, current_user.id)
     
     if not updated_exercise:
         raise HTTPException(
@@ -140,10 +259,10 @@ def update_existing_exercise(
 
 
 @router.delete("/{exercise_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_exercise(
+async def delete_existing_exercise(
     exercise_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an exercise.
@@ -151,7 +270,7 @@ def delete_existing_exercise(
     You can only delete exercises you created.
     Note: This will fail if the exercise is used in any workout plans.
     """
-    success = delete_exercise(db, exercise_id, current_user.id)
+    success = await delete_exercise_async(db, exercise_id, current_user.id)
     
     if not success:
         raise HTTPException(
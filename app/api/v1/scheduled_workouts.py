@@ -0,0 +1,364 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from app.api.deps import get_async_db, get_current_user
+from app.models.user import User
+from app.schemas.scheduled_workout import (
+    ScheduledWorkoutCreate,
+    ScheduledWorkoutUpdate,
+    ScheduledWorkoutResponse,
+    ScheduledWorkoutComplete,
+    WorkoutRecurrenceCreate,
+    WorkoutRecurrenceUpdate,
+    WorkoutRecurrenceResponse
+)
+from app.services.schedule_service import (
+    SCHEDULE_STATUSES,
+    get_scheduled_workout_by_id_async,
+    create_scheduled_workout_async,
+    update_scheduled_workout_async,
+    complete_scheduled_workout_async,
+    delete_scheduled_workout_async
+)
+from app.services.recurrence_service import (
+    RECURRENCE_FREQUENCIES,
+    WEEKDAY_CODES,
+    get_calendar_async,
+    get_recurrences_async,
+    create_recurrence_async,
+    update_recurrence_async,
+    delete_recurrence_async,
+    update_occurrence_async,
+    complete_occurrence_async
+)
+from app.services.workout_service import get_workout_plan_by_id_async
+from app.core.request_timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+# Longest calendar window served by a single request
+MAX_RANGE_DAYS = 366
+
+
+# --- Helpers ---
+
+async def _check_plan_owner(db: AsyncSession, plan_id: int, user_id: int):
+    """Make sure the workout plan exists and belongs to the user."""
+    plan = await get_workout_plan_by_id_async(db, plan_id, load_exercises=False)
+    if not plan or plan.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workout plan not found"
+        )
+
+
+def _check_status(value: Optional[str]):
+    if value is not None and value not in SCHEDULE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status must be one of: {', '.join(SCHEDULE_STATUSES)}"
+        )
+
+
+def _check_recurrence_end(start_date: Optional[date], until: Optional[date], count: Optional[int]):
+    if until is not None and count is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Set either 'until' or 'count', not both"
+        )
+    if until is not None and start_date is not None and until < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'until' must be on or after 'start_date'"
+        )
+
+
+def _check_recurrence(recurrence: WorkoutRecurrenceCreate):
+    if recurrence.frequency not in RECURRENCE_FREQUENCIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Frequency must be one of: {', '.join(RECURRENCE_FREQUENCIES)}"
+        )
+    invalid = [code for code in recurrence.weekdays if code not in WEEKDAY_CODES]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Weekdays must be among: {', '.join(WEEKDAY_CODES)}"
+        )
+    if recurrence.weekdays and recurrence.frequency != "weekly":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Weekdays only apply to weekly recurrences"
+        )
+    _check_recurrence_end(recurrence.start_date, recurrence.until, recurrence.count)
+
+
+# --- Scheduled Workout CRUD ---
+
+@router.get("", response_model=List[ScheduledWorkoutResponse])
+async def list_scheduled_workouts(
+    date_from: date = Query(..., alias="from", description="First day of the range (inclusive)"),
+    date_to: date = Query(..., alias="to", description="Last day of the range (inclusive)"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get your scheduled workouts for a calendar range (e.g. a month view).
+
+    Occurrences of recurring schedules are included; those not yet completed,
+    moved or cancelled have no id (change them through /recurrences).
+    Results are ordered by date and time. The range can span at most a year.
+    """
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be on or after 'from'"
+        )
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range can't exceed {MAX_RANGE_DAYS} days"
+        )
+    _check_status(status_filter)
+
+    return await get_calendar_async(
+        db, current_user.id, date_from, date_to, status_filter
+    )
+
+
+# --- Recurring schedules ---
+# Declared before /{scheduled_id} so "recurrences" isn't taken for an ID
+
+@router.get("/recurrences", response_model=List[WorkoutRecurrenceResponse])
+async def list_recurrences(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get your recurring schedules.
+    """
+    return await get_recurrences_async(db, current_user.id)
+
+
+@router.post("/recurrences", response_model=WorkoutRecurrenceResponse, status_code=status.HTTP_201_CREATED)
+async def create_recurrence(
+    recurrence: WorkoutRecurrenceCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Schedule a workout plan on a repeating basis (RRULE-style).
+
+    - frequency: daily or weekly, every `interval` days/weeks
+    - weekdays: for weekly rules, e.g. ["MO", "WE", "FR"] (defaults to start_date's day)
+    - until (last date) or count (number of occurrences); neither repeats indefinitely
+
+    The rule is stored once; occurrences appear in the calendar without
+    creating a row per date.
+    """
+    _check_recurrence(recurrence)
+    await _check_plan_owner(db, recurrence.workout_plan_id, current_user.id)
+    return await create_recurrence_async(db, recurrence, current_user.id)
+
+
+@router.put("/recurrences/{recurrence_id}", response_model=WorkoutRecurrenceResponse)
+async def update_existing_recurrence(
+    recurrence_id: int,
+    recurrence_update: WorkoutRecurrenceUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Change when a recurring schedule ends, its time, or its notes.
+    """
+    _check_recurrence_end(None, recurrence_update.until, recurrence_update.count)
+
+    updated = await update_recurrence_async(db, recurrence_id, recurrence_update, current_user.id)
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurrence not found or you don't have permission to update it"
+        )
+    return updated
+
+
+@router.delete("/recurrences/{recurrence_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_recurrence(
+    recurrence_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a recurring schedule and its upcoming occurrences.
+
+    Completed occurrences are kept in your history.
+    """
+    success = await delete_recurrence_async(db, recurrence_id, current_user.id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurrence not found or you don't have permission to delete it"
+        )
+    return None
+
+
+@router.put(
+    "/recurrences/{recurrence_id}/occurrences/{occurrence_date}",
+    response_model=ScheduledWorkoutResponse
+)
+async def update_recurrence_occurrence(
+    recurrence_id: int,
+    occurrence_date: date,
+    scheduled_update: ScheduledWorkoutUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Move, cancel (status=cancelled) or annotate a single occurrence of a
+    recurring schedule, identified by the date the rule generated.
+    """
+    _check_status(scheduled_update.status)
+
+    updated = await update_occurrence_async(
+        db, recurrence_id, occurrence_date, scheduled_update, current_user.id
+    )
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Occurrence not found"
+        )
+    return updated
+
+
+@router.post(
+    "/recurrences/{recurrence_id}/occurrences/{occurrence_date}/complete",
+    response_model=ScheduledWorkoutResponse
+)
+async def complete_recurrence_occurrence(
+    recurrence_id: int,
+    occurrence_date: date,
+    complete_data: ScheduledWorkoutComplete,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mark a single occurrence of a recurring schedule as completed.
+    """
+    completed = await complete_occurrence_async(
+        db, recurrence_id, occurrence_date, complete_data, current_user.id
+    )
+
+    if not completed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Occurrence not found"
+        )
+    return completed
+
+
+@router.get("/{scheduled_id}", response_model=ScheduledWorkoutResponse)
+async def get_scheduled_workout(
+    scheduled_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific scheduled workout by ID.
+
+    You can only view your own scheduled workouts.
+    """
+    scheduled = await get_scheduled_workout_by_id_async(db, scheduled_id)
+
+    if not scheduled or scheduled.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled workout not found"
+        )
+    return scheduled
+
+
+@router.post("", response_model=ScheduledWorkoutResponse, status_code=status.HTTP_201_CREATED)
+async def schedule_workout(
+    scheduled: ScheduledWorkoutCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Schedule one of your workout plans for a date (and optional time).
+    """
+    await _check_plan_owner(db, scheduled.workout_plan_id, current_user.id)
+    return await create_scheduled_workout_async(db, scheduled, current_user.id)
+
+
+@router.put("/{scheduled_id}", response_model=ScheduledWorkoutResponse)
+async def update_existing_scheduled_workout(
+    scheduled_id: int,
+    scheduled_update: ScheduledWorkoutUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reschedule a workout or change its status or notes.
+
+    You can only update your own scheduled workouts.
+    """
+    _check_status(scheduled_update.status)
+
+    updated = await update_scheduled_workout_async(
+        db, scheduled_id, scheduled_update, current_user.id
+    )
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled workout not found or you don't have permission to update it"
+        )
+    return updated
+
+
+@router.post("/{scheduled_id}/complete", response_model=ScheduledWorkoutResponse)
+async def complete_workout(
+    scheduled_id: int,
+    complete_data: ScheduledWorkoutComplete,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mark a scheduled workout as completed, optionally with notes.
+    """
+    completed = await complete_scheduled_workout_async(
+        db, scheduled_id, complete_data, current_user.id
+    )
+
+    if not completed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled workout not found or you don't have permission to update it"
+        )
+    return completed
+
+
+@router.delete("/{scheduled_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_existing_scheduled_workout(
+    scheduled_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cancel (delete) a scheduled workout.
+
+    You can only delete your own scheduled workouts.
+    """
+    success = await delete_scheduled_workout_async(db, scheduled_id, current_user.id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled workout not found or you don't have permission to delete it"
+        )
+    return None
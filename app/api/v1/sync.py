@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.api.deps import get_async_db, get_current_user
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import InvalidSyncTokenError, get_changes_async
+from app.core.request_timing import TimedRoute
+from app.core.responses import ORJSONResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("", response_model=SyncResponse, response_class=ORJSONResponse)
+async def get_changes(
+    token: Optional[str] = Query(None, description="sync_token from the previous response (omit for a full sync)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get everything that changed since the sync token, for offline-first clients:
+    your exercises, workout plans, plan exercises, scheduled workouts and
+    recurring schedules, other users' public exercises, and the ids of deleted rows.
+
+    Without a token, returns everything (a full sync). Store the returned
+    sync_token and send it next time; while has_more is true, call again
+    right away with the new token.
+    """
+    try:
+        changes = await get_changes_async(db, current_user.id, token)
+    except InvalidSyncTokenError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+    # Rows are plain column values, so they're encoded directly (shaped like SyncResponse)
+    return ORJSONResponse(changes)
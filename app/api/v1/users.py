@@ -1,23 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
-from app.schemas.user import UserResponse, UserUpdate
-from app.services.user_service import update_user, delete_user
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db, get_current_user, limit_auth_attempts
+from app.schemas.user import UserResponse, UserUpdate, PasswordChange
+from app.services.user_service import update_user_async, change_password_async, delete_user_async
+from app.services.export_service import stream_account_export
 from app.models.user import User
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: User = Depends(get_current_user)):
   return current_user
 
+@router.get("/me/export")
+async def export_current_user_account(
+  gzip: bool = Query(False, description="Gzip-compress the export"),
+  current_user: User = Depends(get_current_user)
+):
+  """
+  Download everything in your account as NDJSON, one record per line with a
+  "type" field: user, exercise, workout_plan, workout_exercise,
+  workout_recurrence, scheduled_workout.
+  """
+  filename = f"account-export-{current_user.id}-{date.today().isoformat()}.ndjson"
+  if gzip:
+    filename += ".gz"
+  return StreamingResponse(
+    stream_account_export(current_user.id, compress=gzip),
+    media_type="application/gzip" if gzip else "application/x-ndjson",
+    headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+  )
+
 @router.put("/me", response_model=UserResponse)
-def update_current_user_profile(
+async def update_current_user_profile(
   user_update: UserUpdate,
   current_user: User = Depends(get_current_user),
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_async_db)
 ):
-  updated_user = update_user(db, current_user.id, user_update)
+  updated_user = await update_user_async(db, current_user.id, user_update)
   if not updated_user:
     raise HTTPException(
       status_code=status.HTTP_404_NOT_FOUND,
@@ -25,12 +48,33 @@ def update_current_user_profile(
     )
   return updated_user
 
+@router.put("/me/password", status_code=status.HTTP_204_NO_CONTENT)
+async def change_current_user_password(
+  request: Request,
+  password_change: PasswordChange,
+  current_user: User = Depends(get_current_user),
+  db: AsyncSession = Depends(get_async_db)
+):
+  """
+  Change your password. Every access and refresh token issued so far is
+  revoked, so all sessions (this one included) have to log in again.
+  """
+  await limit_auth_attempts(request, "password", current_user.email)
+  changed = await change_password_async(
+    db, current_user, password_change.current_password, password_change.new_password
+  )
+  if not changed:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail="Current password is incorrect"
+    )
+
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_current_user_account(
+async def delete_current_user_account(
   current_user: User = Depends(get_current_user),
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_async_db)
 ):
-  success = delete_user(db, current_user.id)
+  success = await delete_user_async(db, current_user.id)
   if not success:
     raise HTTPException(
       status_code=status.HTTP_404_NOT_FOUND,
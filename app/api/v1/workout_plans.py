@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_async_read_db, get_current_user
 from app.models.user import User
 from app.schemas.workout_plan import (
     WorkoutPlanCreate,
@@ -9,28 +9,47 @@ from app.schemas.workout_plan import (
     WorkoutPlanResponse,
     WorkoutExerciseCreate,
     WorkoutExerciseUpdate,
-    WorkoutExerciseResponse
+    WorkoutExerciseBatchUpdate,
+    WorkoutExerciseResponse,
+    WorkoutPlanImportResponse
 )
 from app.services.workout_service import (
-    get_workout_plans,
-    get_workout_plan_by_id,
-    create_workout_plan,
-    update_workout_plan,
-    delete_workout_plan,
-    add_exercise_to_plan,
-    update_exercise_in_plan,
-    remove_exercise_from_plan,
-    get_workout_exercise
+    get_workout_plans_async,
+    get_workout_plan_by_id_async,
+    create_workout_plan_async,
+    update_workout_plan_async,
+    delete_workout_plan_async,
+    add_exercise_to_plan_async,
+    update_exercise_in_plan_async,
+    remove_exercise_from_plan_async,
+    batch_update_exercises_in_plan_async,
+    get_workout_exercise_async
 )
+from app.services.plan_import_service import (
+    iter_lines,
+    iter_jsonl_records,
+    iter_csv_records,
+    import_workout_plans_async
+)
+from app.core.cache import collection_versions, get_etag_cache
+from app.core.etag import compute_etag, etag_matches, not_modified, set_etag
+from app.core.pagination import InvalidCursorError
+from app.core.request_timing import TimedRoute
+from app.core.responses import ORJSONResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 # --- Helper ---
 
-def _get_owned_plan(db: Session, plan_id: int, user_id: int):
+async def _get_owned_plan(
+    db: AsyncSession,
+    plan_id: int,
+    user_id: int,
+    load_exercises: bool = True
+):
     """Fetch a plan and verify ownership, raising appropriate HTTP errors."""
-    plan = get_workout_plan_by_id(db, plan_id)
+    plan = await get_workout_plan_by_id_async(db, plan_id, load_exercises)
     if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,74 +65,143 @@ def _get_owned_plan(db: Session, plan_id: int, user_id: int):
 
 # --- Workout Plan CRUD ---
 
-@router.get("", response_model=List[WorkoutPlanResponse])
-def list_workout_plans(
+@router.get("", response_model=List[WorkoutPlanResponse], response_class=ORJSONResponse)
+async def list_workout_plans(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Max number of records to return"),
     search: Optional[str] = Query(None, min_length=1, description="Search in plan name"),
     sort_by: str = Query("created_at", description="Field to sort by (name, created_at)"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order: asc or desc"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from a previous page (replaces skip)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get all workout plans belonging to the current user.
 
     Supports search by name, sorting, and pagination.
+    When more plans exist, the cursor for the next page is returned
+    in the X-Next-Cursor header.
     """
-    plans, _ = get_workout_plans(
-        db=db,
-        current_user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
-    return plans
+    try:
+        plans, _, next_cursor = await get_workout_plans_async(
+            db=db,
+            current_user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            columns_only=True
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+
+    # Plans are already dicts shaped like WorkoutPlanResponse
+    list_response = ORJSONResponse(plans)
+    if next_cursor:
+        list_response.headers["X-Next-Cursor"] = next_cursor
+    return list_response
 
 
 @router.get("/{plan_id}", response_model=WorkoutPlanResponse)
-def get_workout_plan(
+async def get_workout_plan(
     plan_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific workout plan by ID.
 
     You can only view plans you created.
+    Supports If-None-Match with the returned ETag.
     """
-    return _get_owned_plan(db, plan_id, current_user.id)
+    cache_key = (
+        "workout_plan",
+        current_user.id,
+        collection_versions.get(("workout_plans", current_user.id)),
+        plan_id
+    )
+    cached_etag = get_etag_cache().get(cache_key) if request.headers.get("if-none-match") else None
+    if cached_etag and etag_matches(request, cached_etag):
+        return not_modified(cached_etag)
+
+    plan = await _get_owned_plan(db, plan_id, current_user.id)
+
+    etag = compute_etag(
+        plan.id,
+        plan.change_seq,
+        plan.updated_at or plan.created_at,
+        [(item.id, item.change_seq, item.updated_at or item.created_at) for item in plan.exercises]
+    )
+    get_etag_cache().set(cache_key, etag)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return plan
 
 
 @router.post("", response_model=WorkoutPlanResponse, status_code=status.HTTP_201_CREATED)
-def create_new_workout_plan(
+async def create_new_workout_plan(
     plan: WorkoutPlanCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new workout plan.
 
     You can optionally include a list of exercises at creation time.
     """
-    return create_workout_plan(db, plan, current_user.id)
+    return await create_workout_plan_async(db, plan, current_user.id)
+
+
+@router.post("/import", response_model=WorkoutPlanImportResponse)
+async def import_workout_plans(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk import workout plans from a streamed request body.
+
+    - application/x-ndjson (default): one plan per line, same shape as POST /workout-plans
+    - text/csv: one exercise per row with a header of plan_name, plan_description,
+      exercise_id, sets, repetitions, weight, order_index, notes; consecutive rows
+      with the same plan_name form one plan
+
+    Valid plans are imported in batches even if other rows fail;
+    the response lists each rejected row and why.
+    """
+    lines = iter_lines(request.stream())
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        records = iter_csv_records(lines)
+    else:
+        records = iter_jsonl_records(lines)
+
+    imported, errors = await import_workout_plans_async(db, current_user.id, records)
+    return WorkoutPlanImportResponse(imported=imported, failed=len(errors), errors=errors)
 
 
 @router.put("/{plan_id}", response_model=WorkoutPlanResponse)
-def update_existing_workout_plan(
+async def update_existing_workout_plan(
     plan_id: int,
     plan_update: WorkoutPlanUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a workout plan's name or description.
 
     You can only update plans you created.
     """
-    updated_plan = update_workout_plan(db, plan_id, plan_update, current_user.id)
+    updated_plan = await update_workout_plan_async(db, plan_id, plan_update, current_user.id)
 
     if not updated_plan:
         raise HTTPException(
@@ -124,17 +212,17 @@ def update_existing_workout_plan(
 
 
 @router.delete("/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_workout_plan(
+async def delete_existing_workout_plan(
     plan_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a workout plan and all its exercises.
 
     You can only delete plans you created.
     """
-    success = delete_workout_plan(db, plan_id, current_user.id)
+    success = await delete_workout_plan_async(db, plan_id, current_user.id)
 
     if not success:
         raise HTTPException(
@@ -147,45 +235,82 @@ def delete_existing_workout_plan(
 # --- Exercises within a Plan ---
 
 @router.post("/{plan_id}/exercises", response_model=WorkoutExerciseResponse, status_code=status.HTTP_201_CREATED)
-def add_exercise(
+async def add_exercise(
     plan_id: int,
     exercise_data: WorkoutExerciseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add an exercise to a workout plan.
 
     You can only modify plans you created.
     """
-    _get_owned_plan(db, plan_id, current_user.id)
+    await _get_owned_plan(db, plan_id, current_user.id, load_exercises=False)
 
-    existing = get_workout_exercise(db, plan_id, exercise_data.exercise_id)
+    existing = await get_workout_exercise_async(db, plan_id, exercise_data.exercise_id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This exercise is already in the workout plan"
         )
 
-    return add_exercise_to_plan(db, plan_id, exercise_data)
+    return await add_exercise_to_plan_async(db, plan_id, exercise_data)
+
+
+@router.patch("/{plan_id}/exercises", response_model=List[WorkoutExerciseResponse])
+async def batch_update_exercises(
+    plan_id: int,
+    batch: WorkoutExerciseBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update many exercises within a workout plan at once, e.g. a drag-and-drop
+    reorder: {"exercises": [{"exercise_id": 4, "order_index": 0}, ...]}.
+
+    Each entry changes only the fields it includes. All changes are applied
+    together or not at all. Returns the plan's exercises in their new order.
+
+    You can only modify plans you created.
+    """
+    exercise_ids = [item.exercise_id for item in batch.exercises]
+    if len(set(exercise_ids)) != len(exercise_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each exercise can only appear once in a batch"
+        )
+
+    await _get_owned_plan(db, plan_id, current_user.id, load_exercises=False)
+
+    exercises, missing = await batch_update_exercises_in_plan_async(
+        db, plan_id, batch.exercises, current_user.id
+    )
+
+    if exercises is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercises not found in this workout plan: {', '.join(map(str, missing))}"
+        )
+    return exercises
 
 
 @router.put("/{plan_id}/exercises/{exercise_id}", response_model=WorkoutExerciseResponse)
-def update_exercise(
+async def update_exercise(
     plan_id: int,
     exercise_id: int,
     exercise_update: WorkoutExerciseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an exercise within a workout plan (sets, reps, weight, order, notes).
 
     You can only modify plans you created.
     """
-    _get_owned_plan(db, plan_id, current_user.id)
+    await _get_owned_plan(db, plan_id, current_user.id, load_exercises=False)
 
-    updated = update_exercise_in_plan(db, plan_id, exercise_id, exercise_update)
+    updated = await update_exercise_in_plan_async(db, plan_id, exercise_id, exercise_update)
 
     if not updated:
         raise HTTPException(
@@ -196,20 +321,20 @@ def update_exercise(
 
 
 @router.delete("/{plan_id}/exercises/{exercise_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_exercise(
+async def remove_exercise(
     plan_id: int,
     exercise_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove an exercise from a workout plan.
 
     You can only modify plans you created.
     """
-    _get_owned_plan(db, plan_id, current_user.id)
+    await _get_owned_plan(db, plan_id, current_user.id, load_exercises=False)
 
-    success = remove_exercise_from_plan(db, plan_id, exercise_id)
+    success = await remove_exercise_from_plan_async(db, plan_id, exercise_id)
 
     if not success:
         raise HTTPException(
@@ -1,13 +1,68 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
   # Database
   DATABASE_URL: str
+  ASYNC_DATABASE_URL: str = ""  # Derived from DATABASE_URL when empty
+
+  # Connection pool (per engine, per worker process)
+  DB_POOL_SIZE: int = 5
+  DB_MAX_OVERFLOW: int = 10
+  DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800  # Seconds; -1 disables
+
+  # Read replicas (comma-separated URLs in DATABASE_URL form) for read-only
+  # sessions; each gets its own pool. Empty: reads use the primary.
+  DATABASE_REPLICA_URLS: str = ""
+  # A user's reads stay on the primary this long after their own write (on the
+  # worker that took it, and on others through the client's last-write cookie)
+  REPLICA_STICKY_SECONDS: int = 10
 
   # JWT
   SECRET_KEY: str
   ALGORITHM: str = "HS256"
   ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+  # How often each worker picks up tokens revoked by other workers
+  TOKEN_REVOCATION_REFRESH_SECONDS: int = 5
+
+  # bcrypt process pool (max concurrent hashes)
+  PASSWORD_HASH_WORKERS: int = 2
+  # Auth requests needing a hash get 503 while more than this many hashes wait
+  PASSWORD_HASH_MAX_QUEUE: int = 16
+
+  # Rate limits for login/register/password change, per client IP and per email
+  RATE_LIMIT_ENABLED: bool = True
+  RATE_LIMIT_BACKEND: str = "memory"  # memory (per worker) or database (shared by all workers)
+  RATE_LIMIT_MEMORY_KEYS: int = 100000  # Least recently used buckets are dropped past this
+  AUTH_RATE_LIMIT_WINDOW_SECONDS: int = 60
+  AUTH_RATE_LIMIT_PER_IP: int = 20
+  AUTH_RATE_LIMIT_PER_EMAIL: int = 5
+
+  # Authenticated user cache (per process)
+  PRINCIPAL_CACHE_SIZE: int = 1024
+  PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+  # Exercise list total counts cache (per process)
+  EXERCISE_COUNT_CACHE_SIZE: int = 4096
+  EXERCISE_COUNT_CACHE_TTL_SECONDS: int = 30
+
+  # ETags answered from memory without a DB query (per process). Writes handled
+  # by other workers become visible after the TTL; 0 disables the shortcut.
+  ETAG_CACHE_SIZE: int = 8192
+  ETAG_CACHE_TTL_SECONDS: int = 10
+
+  # Personal records per user (per process). Entries are checked against the user's
+  # change sequence on every read, so the TTL only bounds memory, not staleness
+  PERSONAL_RECORD_CACHE_SIZE: int = 1024
+  PERSONAL_RECORD_CACHE_TTL_SECONDS: int = 600
+
+  # Accounts allowed to load the public exercise catalog (comma-separated emails)
+  ADMIN_EMAILS: str = ""
+
+  # Log one JSON line per request with SQL/phase timings
+  REQUEST_TIMING_LOG: bool = False
 
   # OAuth
   GOOGLE_CLIENT_ID: str = ""
@@ -18,4 +73,18 @@ class Settings(BaseSettings):
   # class Config:
   #   env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+  """Read the environment / .env once, on first use"""
+  return Settings()
+
+class _LazySettings:
+  """
+  Module-level `settings` that defers get_settings() to the first attribute
+  read, so importing app modules doesn't require the environment.
+  """
+
+  def __getattr__(self, name: str):
+    return getattr(get_settings(), name)
+
+settings = _LazySettings()
\ No newline at end of file
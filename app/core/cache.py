@@ -0,0 +1,136 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, Optional
+from app.config import settings
+
+
+class TTLCache:
+  """
+  Small in-process LRU cache whose entries also expire after `ttl` seconds.
+  Safe to share between the event loop and threadpool workers.
+  """
+
+  def __init__(self, maxsize: int, ttl: float):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self.hits = 0
+    self.misses = 0
+    self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key: Hashable) -> Optional[Any]:
+    with self._lock:
+      entry = self._data.get(key)
+      if entry is None or entry[0] < time.monotonic():
+        if entry is not None:
+          del self._data[key]
+        self.misses += 1
+        return None
+      self._data.move_to_end(key)
+      self.hits += 1
+      return entry[1]
+
+  def set(self, key: Hashable, value: Any) -> None:
+    with self._lock:
+      self._data[key] = (time.monotonic() + self.ttl, value)
+      self._data.move_to_end(key)
+      while len(self._data) > self.maxsize:
+        self._data.popitem(last=False)
+
+  def invalidate(self, key: Hashable) -> None:
+    with self._lock:
+      self._data.pop(key, None)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._data.clear()
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "size": len(self._data),
+        "maxsize": self.maxsize,
+        "hits": self.hits,
+        "misses": self.misses,
+      }
+
+
+class VersionCounter:
+  """
+  Per-key version numbers, bumped by write paths so cache keys that embed
+  the version stop matching. Versions come from one process-wide sequence,
+  so a bumped key never goes back to a value it had before.
+  """
+
+  def __init__(self):
+    self._sequence = itertools.count(1)
+    self._versions: dict[Hashable, int] = {}
+    self._lock = threading.Lock()
+
+  def get(self, key: Hashable) -> int:
+    return self._versions.get(key, 0)
+
+  def bump(self, key: Hashable) -> int:
+    with self._lock:
+      version = next(self._sequence)
+      self._versions[key] = version
+      return version
+
+
+# The caches below are created on first use, sized from settings then, so
+# importing this module doesn't read the environment. The old module
+# attributes (principal_cache, ...) still resolve through __getattr__.
+
+@lru_cache
+def get_principal_cache() -> TTLCache:
+  """Resolved users keyed by token subject (email), used by get_current_user"""
+  return TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_exercise_count_cache() -> TTLCache:
+  """Exercise list totals keyed by user, collection versions and filters"""
+  return TTLCache(maxsize=settings.EXERCISE_COUNT_CACHE_SIZE, ttl=settings.EXERCISE_COUNT_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_etag_cache() -> TTLCache:
+  """
+  Last ETag served per (user, collection versions, request), so a matching
+  If-None-Match can be answered without querying the database
+  """
+  return TTLCache(maxsize=settings.ETAG_CACHE_SIZE, ttl=settings.ETAG_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_recent_writers() -> TTLCache:
+  """
+  Token subjects (emails) that wrote recently, whose reads stay on the primary
+  database until replicas have caught up (see app.database)
+  """
+  return TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE * 10, ttl=settings.REPLICA_STICKY_SECONDS)
+
+@lru_cache
+def get_personal_record_cache() -> TTLCache:
+  """
+  Personal record results per user, with the change sequence they were
+  computed at; reads check it against the database (see personal_record_service)
+  """
+  return TTLCache(maxsize=settings.PERSONAL_RECORD_CACHE_SIZE, ttl=settings.PERSONAL_RECORD_CACHE_TTL_SECONDS)
+
+# Collection versions: ("exercises", user_id), ("exercises", "public")
+# and ("workout_plans", user_id)
+collection_versions = VersionCounter()
+
+_LAZY_ATTRIBUTES = {
+  "principal_cache": get_principal_cache,
+  "exercise_count_cache": get_exercise_count_cache,
+  "etag_cache": get_etag_cache,
+  "recent_writers": get_recent_writers,
+  "personal_record_cache": get_personal_record_cache,
+}
+
+def __getattr__(name: str):
+  if name in _LAZY_ATTRIBUTES:
+    return _LAZY_ATTRIBUTES[name]()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,37 @@
+import hashlib
+import json
+from typing import Any
+from fastapi import Request, Response, status
+
+# Clients may keep responses but must revalidate them (If-None-Match) before use
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(*parts: Any) -> str:
+  """
+  Strong ETag over the given values (ids, row versions, page info).
+  Timestamps alone have one-second resolution, so include change_seq.
+  """
+  payload = json.dumps(parts, default=str, separators=(",", ":"))
+  return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+  """Whether the request's If-None-Match header covers the ETag"""
+  header = request.headers.get("if-none-match")
+  if not header:
+    return False
+  candidates = [candidate.strip() for candidate in header.split(",")]
+  return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified(etag: str) -> Response:
+  return Response(
+    status_code=status.HTTP_304_NOT_MODIFIED,
+    headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+  )
+
+
+def set_etag(response: Response, etag: str) -> None:
+  response.headers["ETag"] = etag
+  response.headers["Cache-Control"] = CACHE_CONTROL
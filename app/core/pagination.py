@@ -0,0 +1,119 @@
+import base64
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, Optional
+from sqlalchemy import String, and_, literal, or_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or doesn't match the query"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """Build an opaque cursor pointing just after the given row"""
+    payload = {"s": sort_by, "o": sort_order, "v": _encode_value(value), "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, column) -> tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Returns tuple of (sort_value, last_id)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = _decode_value(column, payload["v"])
+        last_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return value, last_id
+
+
+def _sqlite_timestamp(value: datetime):
+    """
+    SQLite keeps server-default timestamps as 'YYYY-MM-DD HH:MM:SS' text, but
+    binds datetimes with microseconds; compare as text in the stored format.
+    """
+    storage_format = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+    return literal(value.strftime(storage_format), String())
+
+
+def _nullable(column) -> bool:
+    return getattr(column, "nullable", True)
+
+
+def keyset_filter(column, id_column, value: Any, last_id: int, descending: bool, dialect_name: Optional[str] = None):
+    """
+    Rows strictly after (value, last_id) in (column, id) order.
+    NULL sort keys come after every value in either direction, so on a
+    nullable column a NULL value seeks within the trailing NULL rows.
+    """
+    if value is None:
+        return and_(column.is_(None), id_column < last_id if descending else id_column > last_id)
+
+    if dialect_name == "sqlite" and isinstance(value, datetime):
+        value = _sqlite_timestamp(value)
+    if descending:
+        after = or_(column < value, and_(column == value, id_column < last_id))
+    else:
+        after = or_(column > value, and_(column == value, id_column > last_id))
+    if _nullable(column):
+        return or_(after, column.is_(None))
+    return after
+
+
+def keyset_order_by(column, id_column, descending: bool) -> tuple:
+    """ORDER BY clause matching keyset_filter, with id as the tie-breaker"""
+    # Explicit, since dialects disagree on where NULLs sort
+    nulls_last = (column.is_(None).asc(),) if _nullable(column) else ()
+    if descending:
+        return *nulls_last, column.desc(), id_column.desc()
+    return *nulls_last, column.asc(), id_column.asc()
+
+
+def next_cursor(
+    rows: list,
+    limit: int,
+    sort_by: str,
+    sort_order: str
+) -> tuple[list, Optional[str]]:
+    """
+    Trim a page fetched with limit + 1 rows and build the cursor for the next one.
+    Returns tuple of (page_rows, next_cursor)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
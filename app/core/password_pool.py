@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from app.config import settings
+
+
+class PasswordHashPool:
+  """
+  Bounded process pool for bcrypt work.
+
+  At most `max_workers` hashes run at once (one per process, so they scale
+  across cores); further callers wait on a semaphore instead of piling work
+  onto the executor. `waiting` is the queue depth, `in_flight` the running jobs,
+  `average_seconds` a moving average of how long a job takes.
+  """
+
+  def __init__(self, max_workers: int):
+    self.max_workers = max_workers
+    self.waiting = 0
+    self.in_flight = 0
+    self.average_seconds = 0.0
+    self._executor: Optional[ProcessPoolExecutor] = None
+    self._semaphore: Optional[asyncio.Semaphore] = None
+    self._lock = threading.Lock()
+
+  def _get_executor(self) -> ProcessPoolExecutor:
+    with self._lock:
+      if self._executor is None:
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+      return self._executor
+
+  def _get_semaphore(self) -> asyncio.Semaphore:
+    if self._semaphore is None:
+      self._semaphore = asyncio.Semaphore(self.max_workers)
+    return self._semaphore
+
+  async def run(self, fn: Callable, *args: Any) -> Any:
+    semaphore = self._get_semaphore()
+    self.waiting += 1
+    try:
+      await semaphore.acquire()
+    finally:
+      self.waiting -= 1
+
+    self.in_flight += 1
+    start = time.perf_counter()
+    try:
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(self._get_executor(), fn, *args)
+    finally:
+      elapsed = time.perf_counter() - start
+      self.average_seconds = elapsed if not self.average_seconds else 0.9 * self.average_seconds + 0.1 * elapsed
+      self.in_flight -= 1
+      semaphore.release()
+
+  def stats(self) -> dict:
+    return {
+      "max_workers": self.max_workers,
+      "in_flight": self.in_flight,
+      "queue_depth": self.waiting,
+      "average_seconds": round(self.average_seconds, 4),
+    }
+
+  def wait_estimate(self) -> float:
+    """Seconds until a job submitted now would start, from the queue and average job time"""
+    return self.waiting * self.average_seconds / self.max_workers
+
+  def shutdown(self) -> None:
+    with self._lock:
+      if self._executor is not None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+    self._semaphore = None
+
+
+@lru_cache
+def get_password_pool() -> PasswordHashPool:
+  """The process's pool, sized from settings on first use (its processes start on the first job)"""
+  return PasswordHashPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+
+def __getattr__(name: str):
+  # Old module attribute, resolved on first use like the accessor
+  if name == "password_pool":
+    return get_password_pool()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
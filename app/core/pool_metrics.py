@@ -0,0 +1,112 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+  """Checkout counters for one connection pool"""
+
+  def __init__(self):
+    self.checkouts = 0
+    self.waits = 0
+    self.timeouts = 0
+    self.connects = 0
+    self.total_checkout_seconds = 0.0
+    self.max_checkout_seconds = 0.0
+    self.total_connect_seconds = 0.0
+    self._lock = threading.Lock()
+
+  def record_checkout(self, seconds: float, waited: bool) -> None:
+    with self._lock:
+      self.checkouts += 1
+      self.total_checkout_seconds += seconds
+      self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+      if waited:
+        self.waits += 1
+
+  def record_connect(self, seconds: float) -> None:
+    with self._lock:
+      self.connects += 1
+      self.total_connect_seconds += seconds
+
+  def record_timeout(self) -> None:
+    with self._lock:
+      self.timeouts += 1
+
+  def snapshot(self) -> dict:
+    with self._lock:
+      average = self.total_checkout_seconds / self.checkouts if self.checkouts else 0.0
+      average_connect = self.total_connect_seconds / self.connects if self.connects else 0.0
+      return {
+        "checkouts": self.checkouts,
+        "waits": self.waits,
+        "timeouts": self.timeouts,
+        "connects": self.connects,
+        "avg_checkout_ms": round(average * 1000, 3),
+        "max_checkout_ms": round(self.max_checkout_seconds * 1000, 3),
+        "avg_connect_ms": round(average_connect * 1000, 3),
+      }
+
+
+class _InstrumentedPoolMixin:
+  """
+  Times every checkout, including the time spent waiting for a free
+  connection. A checkout counts as a wait only when the pool is saturated
+  (nothing idle and max_overflow reached); opening a new connection is
+  counted and timed separately as a connect.
+  """
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.metrics = PoolMetrics()
+
+  def recreate(self):
+    pool = super().recreate()
+    pool.metrics = self.metrics
+    return pool
+
+  def _saturated(self) -> bool:
+    # The same condition QueuePool._do_get blocks on
+    return self.checkedin() == 0 and -1 < self._max_overflow <= self._overflow
+
+  def _do_get(self):
+    waited = self._saturated()
+    start = time.perf_counter()
+    try:
+      connection = super()._do_get()
+    except PoolTimeoutError:
+      self.metrics.record_timeout()
+      raise
+    self.metrics.record_checkout(time.perf_counter() - start, waited)
+    return connection
+
+  def _create_connection(self):
+    start = time.perf_counter()
+    connection = super()._create_connection()
+    self.metrics.record_connect(time.perf_counter() - start)
+    return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+  pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+  pass
+
+
+def pool_status(pool) -> dict:
+  """Live pool state plus checkout counters, for the metrics endpoint"""
+  status = {"class": type(pool).__name__}
+  if isinstance(pool, QueuePool):
+    status.update({
+      "size": pool.size(),
+      "checked_in": pool.checkedin(),
+      "in_use": pool.checkedout(),
+      "overflow": max(pool.overflow(), 0),
+    })
+  metrics = getattr(pool, "metrics", None)
+  if metrics is not None:
+    status.update(metrics.snapshot())
+  return status
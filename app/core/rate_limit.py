@@ -0,0 +1,155 @@
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.rate_limit import RateLimitCounter
+
+
+class Rate(NamedTuple):
+  count: int  # Requests allowed...
+  seconds: int  # ...per this many seconds
+
+
+class RateLimitBackend(ABC):
+  """
+  Where rate limit state lives. hit() records a request for the key and
+  returns 0 if it's allowed, otherwise the seconds until it would be.
+  Subclass and assign to get_rate_limiter().backend to plug in another store.
+  """
+
+  @abstractmethod
+  async def hit(self, key: str, rate: Rate) -> float:
+    ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+  """
+  Token buckets in this process: each key holds up to rate.count tokens,
+  refilled continuously. With several workers each enforces its own limit.
+  """
+
+  def __init__(self, max_keys: int):
+    self.max_keys = max_keys
+    self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+    self._lock = threading.Lock()
+
+  async def hit(self, key: str, rate: Rate) -> float:
+    return self.take(key, rate)
+
+  def take(self, key: str, rate: Rate) -> float:
+    now = time.monotonic()
+    refill_per_second = rate.count / rate.seconds
+    with self._lock:
+      tokens, updated = self._buckets.get(key, (rate.count, now))
+      tokens = min(rate.count, tokens + (now - updated) * refill_per_second)
+      if tokens >= 1:
+        tokens -= 1
+        retry_after = 0.0
+      else:
+        retry_after = (1 - tokens) / refill_per_second
+      self._buckets[key] = (tokens, now)
+      self._buckets.move_to_end(key)
+      while len(self._buckets) > self.max_keys:
+        self._buckets.popitem(last=False)
+      return retry_after
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+  """
+  Sliding window counters in rate_limit_counters, shared by every worker:
+  the estimate is this window's count plus the previous window's, weighted
+  by how much of it still overlaps the last rate.seconds. Rejected requests
+  count too, so a client hammering the endpoint stays limited.
+  """
+
+  # Old windows are deleted every this many hits (per process)
+  PURGE_EVERY = 1000
+
+  def __init__(self):
+    self._hits = itertools.count(1)
+
+  async def hit(self, key: str, rate: Rate) -> float:
+    async with AsyncSessionLocal() as db:
+      return await db.run_sync(self._hit, key, rate)
+
+  def _increment(self, db: Session, key: str, window_start: int) -> int:
+    table = RateLimitCounter.__table__
+    dialect_name = db.get_bind().dialect.name
+
+    if dialect_name in ("postgresql", "sqlite"):
+      dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+      stmt = dialect_insert(table).values(key=key, window_start=window_start, count=1)
+      return db.execute(
+        stmt.on_conflict_do_update(
+          index_elements=[table.c.key, table.c.window_start],
+          set_={"count": table.c.count + 1}
+        ).returning(table.c.count)
+      ).scalar_one()
+
+    in_window = (table.c.key == key, table.c.window_start == window_start)
+    if db.execute(update(table).where(*in_window).values(count=table.c.count + 1)).rowcount == 0:
+      db.execute(insert(table).values(key=key, window_start=window_start, count=1))
+      return 1
+    return db.execute(select(table.c.count).where(*in_window)).scalar_one()
+
+  def _hit(self, db: Session, key: str, rate: Rate) -> float:
+    table = RateLimitCounter.__table__
+    now = time.time()
+    window_start = int(now // rate.seconds) * rate.seconds
+
+    count = self._increment(db, key, window_start)
+    previous = db.execute(
+      select(table.c.count).where(table.c.key == key, table.c.window_start == window_start - rate.seconds)
+    ).scalar() or 0
+    if next(self._hits) % self.PURGE_EVERY == 0:
+      db.execute(delete(table).where(table.c.window_start < window_start - rate.seconds))
+    db.commit()
+
+    overlap = 1 - (now - window_start) / rate.seconds
+    if previous * overlap + count <= rate.count:
+      return 0.0
+    if count > rate.count:
+      return window_start + rate.seconds - now
+    # Allowed once enough of the previous window has slid out
+    return window_start + rate.seconds * (1 - (rate.count - count) / previous) - now
+
+
+class RateLimiter:
+  def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+    self.backend = backend
+    self.enabled = enabled
+
+  async def hit(self, key: str, rate: Rate) -> float:
+    """Record a request; returns 0 if allowed, otherwise seconds to wait"""
+    if not self.enabled:
+      return 0.0
+    return await self.backend.hit(key, rate)
+
+
+def _configured_backend() -> RateLimitBackend:
+  if settings.RATE_LIMIT_BACKEND == "database":
+    return DatabaseRateLimitBackend()
+  if settings.RATE_LIMIT_BACKEND == "memory":
+    return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MEMORY_KEYS)
+  raise ValueError(f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r} (memory or database)")
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+  """The process's rate limiter, configured from settings on first use"""
+  return RateLimiter(_configured_backend(), enabled=settings.RATE_LIMIT_ENABLED)
+
+
+def __getattr__(name: str):
+  # Old module attribute, resolved on first use like the accessor
+  if name == "rate_limiter":
+    return get_rate_limiter()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,67 @@
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import List, Optional
+from starlette.datastructures import MutableHeaders
+from app.config import settings
+from app.core.security import create_last_write_marker, verify_token_claims
+
+# Carries a create_last_write_marker token for the client's last write
+LAST_WRITE_COOKIE = "last_write"
+
+_request_writers: ContextVar[Optional[List[str]]] = ContextVar("request_writers", default=None)
+
+
+def record_write(subject: str) -> None:
+  """Note that the subject committed a write during the current request"""
+  writers = _request_writers.get()
+  if writers is not None:
+    writers.append(subject)
+
+
+def wrote_recently(marker: Optional[str], subject: str) -> bool:
+  """Whether the client's last-write marker is valid, unexpired and the subject's"""
+  if not marker:
+    return False
+  claims = verify_token_claims(marker, token_type="last_write")
+  return claims is not None and claims["sub"] == subject
+
+
+def _set_cookie_header(marker: str) -> str:
+  cookie = SimpleCookie()
+  cookie[LAST_WRITE_COOKIE] = marker
+  morsel = cookie[LAST_WRITE_COOKIE]
+  morsel["max-age"] = settings.REPLICA_STICKY_SECONDS
+  morsel["path"] = "/"
+  morsel["httponly"] = True
+  morsel["samesite"] = "lax"
+  return morsel.OutputString()
+
+
+class ReadYourWritesMiddleware:
+  """
+  ASGI middleware that gives a response a last-write cookie when its request
+  committed a write for a user. The client sends it back, so the user's next
+  reads stay on the primary database whichever worker serves them; the
+  per-worker recent_writers cache only covers the worker that took the write.
+  """
+
+  def __init__(self, app):
+    self.app = app
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    writers: List[str] = []
+    token = _request_writers.set(writers)
+
+    async def send_with_marker(message):
+      if message["type"] == "http.response.start" and writers:
+        MutableHeaders(scope=message).append("Set-Cookie", _set_cookie_header(create_last_write_marker(writers[-1])))
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_marker)
+    finally:
+      _request_writers.reset(token)
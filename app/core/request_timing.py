@@ -0,0 +1,218 @@
+import functools
+import inspect
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger("app.timing")
+
+
+class RequestTiming:
+  """SQL statement count/time and named phase durations for one request"""
+
+  def __init__(self):
+    self.started = time.perf_counter()
+    self.db_queries = 0
+    self.db_seconds = 0.0
+    self.phases: dict[str, float] = {}
+    self.endpoint_finished: Optional[float] = None
+
+  def add_phase(self, name: str, seconds: float) -> None:
+    self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+  def total_seconds(self) -> float:
+    return time.perf_counter() - self.started
+
+  def server_timing(self) -> str:
+    entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"']
+    entries += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+    entries.append(f"total;dur={self.total_seconds() * 1000:.2f}")
+    return ", ".join(entries)
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+  return _current_timing.get()
+
+
+@contextmanager
+def timing_phase(name: str):
+  """Add the time spent in the block to the current request's `name` phase"""
+  timing = _current_timing.get()
+  start = time.perf_counter()
+  try:
+    yield
+  finally:
+    if timing is not None:
+      timing.add_phase(name, time.perf_counter() - start)
+
+
+# --- SQLAlchemy listeners ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  start = conn.info["query_start_time"].pop()
+  timing = _current_timing.get()
+  if timing is not None:
+    timing.db_queries += 1
+    timing.db_seconds += time.perf_counter() - start
+
+
+def install_sql_timing() -> None:
+  """Count and time every statement on every engine (sync and async) in the process"""
+  if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Middleware and route class ---
+
+class RequestTimingMiddleware:
+  """
+  ASGI middleware that collects a RequestTiming per HTTP request and reports it
+  in a Server-Timing header and, optionally, a structured log line.
+  """
+
+  def __init__(self, app, log_requests: bool = False):
+    self.app = app
+    self.log_requests = log_requests
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    timing = RequestTiming()
+    token = _current_timing.set(timing)
+    status_code = 500
+
+    async def send_with_timing(message):
+      nonlocal status_code
+      if message["type"] == "http.response.start":
+        status_code = message["status"]
+        MutableHeaders(scope=message).append("Server-Timing", timing.server_timing())
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_timing)
+    finally:
+      _current_timing.reset(token)
+      if self.log_requests:
+        logger.info(json.dumps({
+          "method": scope["method"],
+          "path": scope["path"],
+          "status": status_code,
+          "db_queries": timing.db_queries,
+          "db_ms": round(timing.db_seconds * 1000, 2),
+          **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in timing.phases.items()},
+          "total_ms": round(timing.total_seconds() * 1000, 2),
+        }))
+
+
+def _mark_endpoint_finished() -> None:
+  timing = _current_timing.get()
+  if timing is not None:
+    timing.endpoint_finished = time.perf_counter()
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+  """
+  Wrap an endpoint so the route knows when serialization starts.
+  include_router rebuilds routes from their (already wrapped) endpoints,
+  so wrapped endpoints are marked and returned as they are.
+  """
+  if getattr(endpoint, "_timed_endpoint", False):
+    return endpoint
+
+  if inspect.iscoroutinefunction(endpoint):
+    @functools.wraps(endpoint)
+    async def async_wrapper(*args, **kwargs):
+      try:
+        return await endpoint(*args, **kwargs)
+      finally:
+        _mark_endpoint_finished()
+    async_wrapper._timed_endpoint = True
+    return async_wrapper
+
+  @functools.wraps(endpoint)
+  def sync_wrapper(*args, **kwargs):
+    try:
+      return endpoint(*args, **kwargs)
+    finally:
+      _mark_endpoint_finished()
+  sync_wrapper._timed_endpoint = True
+  return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+  """APIRoute that records response validation/serialization as the `serialize` phase"""
+
+  def __init__(self, path: str, endpoint: Callable, **kwargs):
+    super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+  def get_route_handler(self) -> Callable:
+    handler = super().get_route_handler()
+
+    async def timed_handler(request):
+      response = await handler(request)
+      timing = _current_timing.get()
+      if timing is not None and timing.endpoint_finished is not None:
+        timing.add_phase("serialize", time.perf_counter() - timing.endpoint_finished)
+      return response
+
+    return timed_handler
+
+
+# --- Query budget checks (for tests and benchmarks) ---
+
+class QueryBudgetExceeded(AssertionError):
+  pass
+
+
+_DB_QUERIES_RE = re.compile(r'(?:^|,\s*)db;[^,]*desc="(\d+) queries"')
+
+
+def response_query_count(response) -> int:
+  """Number of SQL statements a response reported in its Server-Timing header"""
+  match = _DB_QUERIES_RE.search(response.headers.get("server-timing", ""))
+  if match is None:
+    raise ValueError("Response has no Server-Timing db entry")
+  return int(match.group(1))
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+  """Fail when an endpoint ran more SQL statements than its declared budget"""
+  count = response_query_count(response)
+  if count > max_queries:
+    raise QueryBudgetExceeded(
+      f"{count} queries executed, budget is {max_queries} ({response.request.method} {response.request.url.path})"
+    )
+
+
+@contextmanager
+def query_budget(max_queries: int):
+  """
+  Fail when the block runs more than max_queries SQL statements.
+  For code called directly (services); use assert_query_budget for HTTP responses.
+  """
+  timing = RequestTiming()
+  token = _current_timing.set(timing)
+  try:
+    yield timing
+  finally:
+    _current_timing.reset(token)
+  if timing.db_queries > max_queries:
+    raise QueryBudgetExceeded(f"{timing.db_queries} queries executed, budget is {max_queries}")
@@ -0,0 +1,27 @@
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(value: Any) -> Any:
+  # Same representation pydantic uses in JSON mode
+  if isinstance(value, Decimal):
+    return str(value)
+  raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+  """
+  JSON response rendered with orjson. Used by list endpoints that build plain
+  dicts from column-projected rows and return them directly, skipping
+  response_model validation and the stdlib encoder.
+  Datetimes, dates, enums and Decimals are encoded like pydantic's JSON mode.
+  """
+
+  def render(self, content: Any) -> bytes:
+    return orjson.dumps(
+      content,
+      default=_orjson_default,
+      option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    )
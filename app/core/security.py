@@ -1,61 +1,105 @@
-import bcrypt
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
 # from passlib.context import CryptContext
 from app.config import settings
+from app.core.password_pool import get_password_pool
+from app.core.token_revocation import revocation_list
 
 # Password hashing context
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# JWT settings
-SECRET_KEY = settings.SECRET_KEY
-ALGORITHM = settings.ALGORITHM
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
-
+# JWT settings (SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES) are read
+# from settings per call. bcrypt and jose are imported on first use so they
+# stay off the startup path.
 REFRESH_TOKEN_EXPIRES_DAYS = 7
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
   """Verify a password against a hash"""
+  import bcrypt
   password_bytes = plain_password[:72].encode('utf-8')
   hashed_bytes = hashed_password.encode('utf-8')
   return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 def get_password_hash(password: str) -> str:
   """Hash a password using bcrypt"""
+  import bcrypt
   # Truncate to 72 bytes as bcrypt requires
   password_bytes = password[:72].encode('utf-8')
   salt = bcrypt.gensalt()
   hashed = bcrypt.hashpw(password_bytes, salt)
   return hashed.decode('utf-8')
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+  """Verify a password in the password hashing pool"""
+  return await get_password_pool().run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+  """Hash a password in the password hashing pool"""
+  return await get_password_pool().run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+  from jose import jwt
   to_encode = data.copy()
+  now = datetime.now(timezone.utc)
   if expires_delta:
-      expire = datetime.utcnow() + expires_delta
+      expire = now + expires_delta
   else:
-      expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+      expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
   
-  to_encode.update({"exp": expire,  "type": "access"})
-  encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+  # iat lets a revocation cutoff (e.g. password change) end older tokens; it
+  # keeps sub-second precision so tokens from the cutoff's own second are told apart
+  to_encode.update({"exp": expire, "iat": now.timestamp(), "type": "access"})
+  encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
   return encoded_jwt
 
 def create_refresh_token(data: dict):
+  from jose import jwt
   to_encode = data.copy()
-  expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRES_DAYS)
-  to_encode.update({"exp": expire, "type": "refresh"})
-  encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+  now = datetime.now(timezone.utc)
+  expire = now + timedelta(days=REFRESH_TOKEN_EXPIRES_DAYS)
+  # jti identifies the token for logout and single-use rotation
+  to_encode.update({"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex, "type": "refresh"})
+  encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
   return encoded_jwt
 
-def verify_token(token: str, token_type: str = "access") -> Optional[str]:
-    """Verify a JWT token and return the email"""
+def create_last_write_marker(subject: str) -> str:
+  """
+  Signed, short-lived proof that the subject just committed a write: the
+  client sends it back so any worker keeps its reads on the primary
+  for REPLICA_STICKY_SECONDS (see app.core.read_your_writes)
+  """
+  from jose import jwt
+  now = datetime.now(timezone.utc)
+  to_encode = {
+    "sub": subject,
+    "exp": now + timedelta(seconds=settings.REPLICA_STICKY_SECONDS),
+    "iat": now.timestamp(),
+    "type": "last_write",
+  }
+  return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def verify_token_claims(token: str, token_type: str = "access", check_jti: bool = True) -> Optional[dict]:
+    """
+    Verify a JWT token (signature, expiry, type, revocation) and return its claims.
+    With check_jti=False a revoked jti passes, so the caller can tell reuse apart.
+    """
+    from jose import JWTError, jwt
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        token_type_check: str = payload.get("type")
-        
-        if email is None or token_type_check != token_type:
-            return None
-        return email
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    email: str = payload.get("sub")
+    token_type_check: str = payload.get("type")
+    if email is None or token_type_check != token_type:
+        return None
+    # In-memory check, no query (see app.core.token_revocation)
+    if revocation_list.is_revoked(payload.get("jti") if check_jti else None, email, payload.get("iat")):
+        return None
+    return payload
+
+def verify_token(token: str, token_type: str = "access") -> Optional[str]:
+    """Verify a JWT token and return the email"""
+    payload = verify_token_claims(token, token_type)
+    return payload["sub"] if payload is not None else None
\ No newline at end of file
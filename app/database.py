@@ -1,27 +1,212 @@
-from sqlalchemy import create_engine
+import itertools
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, sessionmaker
+from typing import AsyncGenerator, Generator, Optional
+from app.config import settings
+from app.core.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool
 
-# Load environment variables from .env file
-load_dotenv()
+# Engines (and the DBAPI drivers they import) are created on first use, not at
+# import: `engine`, `async_engine`, `replica_engines` and `replicas` below
+# resolve through the module __getattr__, and the session factories bind on
+# their first call. Importing app.models needs neither settings nor a driver.
 
-# Get database URL from env
-DATABASE_URL = os.getenv("DATABASE_URL")
+def get_async_database_url(url: str) -> str:
+  """Map a sync database URL onto its async driver (asyncpg / aiosqlite)"""
+  if url.startswith(("postgresql://", "postgresql+psycopg2://", "postgres://")):
+    return "postgresql+asyncpg://" + url.split("://", 1)[1]
+  if url.startswith(("sqlite://", "sqlite+pysqlite://")):
+    return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+  return url
 
-# Create database engine (the connection)
-engine =  create_engine(DATABASE_URL)
+def get_async_url() -> str:
+  """Async URL can be overridden, otherwise it's derived from DATABASE_URL"""
+  return settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+def pool_options(url: str, poolclass) -> dict:
+  """Engine keyword arguments for the configured connection pool"""
+  parsed = make_url(url)
+  if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+    # In-memory SQLite lives in a single connection, keep SQLAlchemy's default pool
+    return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+  return {
+    "poolclass": poolclass,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+  }
+
+def _enable_foreign_keys(dbapi_connection, connection_record) -> None:
+  cursor = dbapi_connection.cursor()
+  cursor.execute("PRAGMA foreign_keys=ON")
+  cursor.close()
+
+def enforce_foreign_keys(engine):
+  """
+  SQLite only applies ON DELETE CASCADE when each connection turns it on;
+  do that, so deletes cascade (and sync tombstones match) as on PostgreSQL
+  """
+  if engine.dialect.name == "sqlite":
+    event.listen(getattr(engine, "sync_engine", engine), "connect", _enable_foreign_keys)
+  return engine
+
+@lru_cache
+def get_engine():
+  """Create database engine (the connection)"""
+  return enforce_foreign_keys(
+    create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL, InstrumentedQueuePool))
+  )
+
+@lru_cache
+def get_async_engine():
+  """Async engine used by the request handlers"""
+  return enforce_foreign_keys(
+    create_async_engine(get_async_url(), **pool_options(get_async_url(), InstrumentedAsyncQueuePool))
+  )
+
+@lru_cache
+def get_replica_engines() -> list:
+  """Read replicas: one async engine (and pool) each"""
+  urls = [get_async_database_url(url.strip()) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+  return [enforce_foreign_keys(create_async_engine(url, **pool_options(url, InstrumentedAsyncQueuePool))) for url in urls]
+
+class _BindOnFirstUse:
+  """Session factory mixin: bind to the engine from `get_bind` on the first call"""
+
+  def __init__(self, get_bind, **kw):
+    super().__init__(**kw)
+    self._get_bind = get_bind
+
+  def __call__(self, **local_kw):
+    if self.kw.get("bind") is None:
+      self.configure(bind=self._get_bind())
+    return super().__call__(**local_kw)
+
+class _LazySessionmaker(_BindOnFirstUse, sessionmaker):
+  pass
+
+class _LazyAsyncSessionmaker(_BindOnFirstUse, async_sessionmaker):
+  pass
 
 # Create a session factory (for database transactions)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(get_engine, autocommit=False, autoflush=False)
+
+# Async session factory. Objects stay loaded after commit so they can be
+# serialized without an implicit (blocking) refresh.
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+  get_async_engine,
+  autoflush=False,
+  expire_on_commit=False
+)
+
+class ReplicaSet:
+  """
+  Picks the replica with the fewest checked-out connections (least
+  connections), rotating between equally busy ones (round-robin).
+  """
+
+  def __init__(self, engines: list):
+    self.session_factories = [
+      async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False)
+      for replica in engines
+    ]
+    self._engines = engines
+    self._rotation = itertools.count()
+
+  def __bool__(self) -> bool:
+    return bool(self._engines)
+
+  def choose(self) -> async_sessionmaker:
+    start = next(self._rotation)
+    order = [(start + i) % len(self._engines) for i in range(len(self._engines))]
+    # Pools without checkout tracking (e.g. in-memory SQLite) count as idle
+    index = min(order, key=lambda i: getattr(self._engines[i].pool, "checkedout", lambda: 0)())
+    return self.session_factories[index]
+
+@lru_cache
+def get_replicas() -> ReplicaSet:
+  return ReplicaSet(get_replica_engines())
+
+_LAZY_ATTRIBUTES = {
+  "engine": get_engine,
+  "async_engine": get_async_engine,
+  "replica_engines": get_replica_engines,
+  "replicas": get_replicas,
+}
+
+def __getattr__(name: str):
+  if name in _LAZY_ATTRIBUTES:
+    return _LAZY_ATTRIBUTES[name]()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Base class for all models
 Base = declarative_base()
 
-def get_db():
+def get_db() -> Generator:
   db = SessionLocal()
   try:
     yield db
   finally:
-    db.close()
\ No newline at end of file
+    db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+  async with AsyncSessionLocal() as db:
+    yield db
+
+async def open_read_session(
+  primary: AsyncSession,
+  subject: Optional[str] = None,
+  wrote_recently: bool = False
+) -> AsyncGenerator[AsyncSession, None]:
+  """
+  A session for read-only work: a replica, unless there are none or the
+  subject (token email) wrote within REPLICA_STICKY_SECONDS, in which case
+  the request's primary session so reads see their own writes.
+  wrote_recently is the client's say-so (its last-write cookie), for writes
+  this worker didn't take. Exposed to routes through app.api.deps.get_async_read_db.
+  """
+  from app.core.cache import get_recent_writers
+
+  if subject is not None:
+    # Lets commits on the primary mark the subject as a recent writer
+    primary.info["subject"] = subject
+  replicas = get_replicas()
+  if not replicas or wrote_recently or (subject is not None and get_recent_writers().get(subject) is not None):
+    yield primary
+    return
+  async with replicas.choose()() as db:
+    yield db
+
+
+# --- Read-your-writes ---
+
+def _record_orm_write(session: Session, flush_context) -> None:
+  session.info["wrote"] = True
+
+def _record_core_write(orm_execute_state) -> None:
+  if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+    orm_execute_state.session.info["wrote"] = True
+
+def _mark_writer(session: Session) -> None:
+  if session.info.pop("wrote", False) and session.info.get("subject"):
+    from app.core.cache import get_recent_writers
+    from app.core.read_your_writes import record_write
+    get_recent_writers().set(session.info["subject"], True)
+    # For the response's last-write cookie, which covers the other workers
+    record_write(session.info["subject"])
+
+def _forget_writes(session: Session) -> None:
+  session.info.pop("wrote", None)
+
+def install_read_your_writes() -> None:
+  """Send a user's reads to the primary for a while after they commit a write"""
+  if not event.contains(Session, "after_commit", _mark_writer):
+    event.listen(Session, "after_flush", _record_orm_write)
+    event.listen(Session, "do_orm_execute", _record_core_write)
+    event.listen(Session, "after_commit", _mark_writer)
+    event.listen(Session, "after_rollback", _forget_writes)
@@ -1,21 +1,93 @@
+import asyncio
+import os
 from fastapi import FastAPI
-from app.api.v1 import auth, users, exercises
-
-app = FastAPI(
-  title="Workout Tracker API",
-  description="API for managing workout routines and exercises",
-  version="1.0.0"
-)
-
-# Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-app.include_router(exercises.router, prefix="/api/v1/exercises", tags=["Exercises"])
-
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to Workout Tracker API"}
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+from app.api.v1 import auth, users, exercises, workout_plans, scheduled_workouts, analytics, sync
+from app.core.password_pool import get_password_pool
+from app.core.cache import get_principal_cache
+from app.core.token_revocation import revocation_list
+from app.core.pool_metrics import pool_status
+from app.core.request_timing import RequestTimingMiddleware, install_sql_timing
+from app.core.read_your_writes import ReadYourWritesMiddleware
+from app.services.change_tracking import install_change_tracking
+from app.services.token_revocation_service import refresh_revocations_async, run_revocation_refresh
+from app.config import settings
+from app.database import get_engine, get_async_engine, get_replica_engines, AsyncSessionLocal, install_read_your_writes
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Database engines (and their drivers), bcrypt, jose
+    and numpy load on first use rather than here, so under `gunicorn --preload`
+    or `uvicorn --factory app.main:create_app` each worker opens its own pools
+    after the fork.
+    """
+    app = FastAPI(
+      title="Workout Tracker API",
+      description="API for managing workout routines and exercises",
+      version="1.0.0"
+    )
+
+    # Per-request SQL/auth/serialization timings (Server-Timing header)
+    install_sql_timing()
+    app.add_middleware(RequestTimingMiddleware, log_requests=settings.REQUEST_TIMING_LOG)
+
+    # Stamp delta sync positions and tombstones on every flush
+    install_change_tracking()
+
+    # Keep a user's reads on the primary database right after their writes,
+    # on every worker: commits set a last-write cookie the client sends back
+    install_read_your_writes()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # Include routers
+    app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
+    app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
+    app.include_router(exercises.router, prefix="/api/v1/exercises", tags=["Exercises"])
+    app.include_router(workout_plans.router, prefix="/api/v1/workout-plans", tags=["Workout Plans"])
+    app.include_router(scheduled_workouts.router, prefix="/api/v1/scheduled-workouts", tags=["Scheduled Workouts"])
+    app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
+    app.include_router(sync.router, prefix="/api/v1/sync", tags=["Sync"])
+
+    @app.on_event("startup")
+    async def start_revocation_refresh():
+        # Load revoked tokens before serving, then follow other workers' revocations
+        async with AsyncSessionLocal() as db:
+            await refresh_revocations_async(db)
+        app.state.revocation_refresh = asyncio.create_task(run_revocation_refresh())
+
+    @app.on_event("shutdown")
+    def shutdown_revocation_refresh():
+        task = getattr(app.state, "revocation_refresh", None)
+        if task is not None:
+            task.cancel()
+
+    @app.on_event("shutdown")
+    def shutdown_password_pool():
+        get_password_pool().shutdown()
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to Workout Tracker API"}
+
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/metrics")
+    def metrics():
+        """Per-worker connection pool, auth cache, password hashing and token revocation stats"""
+        return {
+            "pid": os.getpid(),
+            "db_pools": {
+                "async": pool_status(get_async_engine().pool),
+                "sync": pool_status(get_engine().pool),
+                "replicas": [pool_status(replica.pool) for replica in get_replica_engines()],
+            },
+            "principal_cache": get_principal_cache().stats(),
+            "password_hashing": get_password_pool().stats(),
+            "token_revocation": revocation_list.stats(),
+        }
+
+    return app
+
+# For `uvicorn app.main:app`
+app = create_app()
@@ -3,4 +3,9 @@ from app.models.user import User
 from app.models.exercise import Exercise
 from app.models.workout_plan import WorkoutPlan
 from app.models.workout_exercise import WorkoutExercise
-from app.models.scheduled_workout import ScheduledWorkout
\ No newline at end of file
+from app.models.scheduled_workout import ScheduledWorkout, ScheduledWorkoutSet
+from app.models.workout_recurrence import WorkoutRecurrence
+from app.models.training_volume import TrainingVolumeWeek, ScheduledWorkoutVolume
+from app.models.sync import SyncCounter, SyncTombstone
+from app.models.revoked_token import RevokedToken
+from app.models.rate_limit import RateLimitCounter
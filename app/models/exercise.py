@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Enum, Boolean, DateTime, ForeignKey, Index
 import enum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -34,7 +34,18 @@ class Exercise(Base):
   is_public = Column(Boolean, default=False)
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+  # Delta sync positions (see sync_service): in the owner's change sequence,
+  # and in the public one while the exercise is (or just stopped being) public
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+  public_change_seq = Column(BigInteger, nullable=True)
+  # Natural key of rows loaded from the public exercise catalog (None for user exercises)
+  catalog_key = Column(String(100), nullable=True)
 
   # Relationship to user who created it
   creator = relationship("User", backref="exercises")
 
+  __table_args__ = (
+    Index("ix_exercises_created_by_change_seq", "created_by", "change_seq"),
+    Index("ix_exercises_public_change_seq", "public_change_seq"),
+    Index("ix_exercises_catalog_key", "catalog_key", unique=True),
+  )
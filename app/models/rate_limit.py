@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, BigInteger, String
+from app.database import Base
+
+class RateLimitCounter(Base):
+  """Requests per key in a fixed window, for the shared (database) rate limit backend"""
+  __tablename__ = "rate_limit_counters"
+
+  key = Column(String(255), primary_key=True)  # e.g. "login:ip:203.0.113.7"
+  window_start = Column(BigInteger, primary_key=True)  # Unix time, a multiple of the window length
+  count = Column(Integer, nullable=False, default=0)
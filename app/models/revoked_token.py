@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base
+
+class RevokedToken(Base):
+  """
+  A revoked refresh token (jti set), or, with no jti, a cutoff revoking every
+  token issued to the subject before revoked_at (e.g. after a password change).
+  Mirrored in memory by app.core.token_revocation.
+  """
+  __tablename__ = "revoked_tokens"
+
+  id = Column(Integer, primary_key=True)  # Increasing, so the mirror reads only new rows
+  jti = Column(String(64), nullable=True)
+  subject = Column(String(255), nullable=False)  # Token "sub" (email)
+  reason = Column(String(32), nullable=False)  # logout, rotated, password_change, reuse
+  revoked_at = Column(DateTime(timezone=True), nullable=False)
+  expires_at = Column(DateTime(timezone=True), nullable=False)  # When the entry stops mattering
+
+  __table_args__ = (
+    # Inserting a jti twice fails, which makes refresh token rotation single-use
+    Index("ix_revoked_tokens_jti", "jti", unique=True),
+    Index("ix_revoked_tokens_expires_at", "expires_at"),
+  )
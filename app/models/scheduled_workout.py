@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Time, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Numeric, String, Text, Date, Time, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from app.database import Base
 
 class ScheduledWorkout(Base):
@@ -14,9 +14,37 @@ class ScheduledWorkout(Base):
   status = Column(String(50), default="scheduled")  # scheduled, completed, cancelled
   completed_at = Column(DateTime(timezone=True), nullable=True)
   notes = Column(Text, nullable=True)
+  # Set when the row materializes an occurrence of a recurrence (completed,
+  # cancelled or moved); occurrence_date is the date the rule generated
+  recurrence_id = Column(Integer, ForeignKey("workout_recurrences.id", ondelete="SET NULL"), nullable=True)
+  occurrence_date = Column(Date, nullable=True)
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # Owner's delta sync position
 
   # Relationships
   user = relationship("User", backref="scheduled_workouts")
-  workout_plan = relationship("WorkoutPlan", backref="scheduled_workouts")
\ No newline at end of file
+  # Removed by the database's ON DELETE CASCADE with their plan
+  workout_plan = relationship("WorkoutPlan", backref=backref("scheduled_workouts", passive_deletes=True))
+
+  # Calendar range lookups: WHERE user_id = ? AND scheduled_date BETWEEN ? AND ?
+  __table_args__ = (
+    Index("ix_scheduled_workouts_user_id_scheduled_date", "user_id", "scheduled_date"),
+    UniqueConstraint("recurrence_id", "occurrence_date", name="uq_scheduled_workouts_recurrence_occurrence"),
+    Index("ix_scheduled_workouts_user_id_change_seq", "user_id", "change_seq"),
+  )
+
+class ScheduledWorkoutSet(Base):
+  """
+  What one completed scheduled workout performed: its plan's exercise rows
+  (sets, repetitions, weight) as they were when it was completed. Personal
+  records are computed from these, so later plan edits don't rewrite history.
+  """
+  __tablename__ = "scheduled_workout_sets"
+
+  id = Column(Integer, primary_key=True)
+  scheduled_workout_id = Column(Integer, ForeignKey("scheduled_workouts.id", ondelete="CASCADE"), nullable=False, index=True)
+  exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+  sets = Column(Integer, nullable=False)
+  repetitions = Column(Integer, nullable=False)
+  weight = Column(Numeric(10, 2), nullable=True)
\ No newline at end of file
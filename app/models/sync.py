@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class SyncCounter(Base):
+  """
+  Change sequence per scope: "user:<id>" for a user's own data, "public" for
+  the shared exercise catalog. Incremented inside the writing transaction, so
+  the row lock orders a scope's values by commit.
+  """
+  __tablename__ = "sync_counters"
+
+  scope = Column(String(64), primary_key=True)
+  value = Column(BigInteger, nullable=False, default=0)
+
+
+class SyncTombstone(Base):
+  """A deleted (or no longer visible) row, so sync clients can drop it too"""
+  __tablename__ = "sync_tombstones"
+
+  id = Column(Integer, primary_key=True)
+  scope = Column(String(64), nullable=False)
+  owner_id = Column(Integer, nullable=True)  # Owner of the deleted row (public scope only)
+  entity_type = Column(String(32), nullable=False)  # exercise, workout_plan, workout_exercise, scheduled_workout
+  entity_id = Column(Integer, nullable=False)
+  change_seq = Column(BigInteger, nullable=False)
+  deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+  __table_args__ = (
+    Index("ix_sync_tombstones_scope_change_seq", "scope", "change_seq"),
+  )
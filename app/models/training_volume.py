@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Numeric, Date, Enum, ForeignKey
+from app.database import Base
+from app.models.exercise import ExerciseCategory, MuscleGroup
+
+class TrainingVolumeWeek(Base):
+  """
+  Weekly training volume rollup per user, muscle group and category.
+  Maintained incrementally as scheduled workouts are completed (see
+  analytics_service); rebuilt from scratch with `python -m app.services.analytics_service`.
+  """
+  __tablename__ = "training_volume_weeks"
+
+  user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+  week_start = Column(Date, primary_key=True)  # Monday of the ISO week
+  muscle_group = Column(Enum(MuscleGroup), primary_key=True)
+  category = Column(Enum(ExerciseCategory), primary_key=True)
+  volume = Column(Numeric(14, 2), nullable=False, default=0)  # sum of sets x repetitions x weight
+  sets = Column(Integer, nullable=False, default=0)
+  repetitions = Column(Integer, nullable=False, default=0)  # sum of sets x repetitions
+  workouts = Column(Integer, nullable=False, default=0)  # completed workouts that trained the group
+
+class ScheduledWorkoutVolume(Base):
+  """
+  What one completed scheduled workout added to the rollup, per muscle group
+  and category, captured from its plan when it was completed. Un-completing,
+  moving or deleting the workout reverses exactly this, even after the plan
+  has been edited.
+  """
+  __tablename__ = "scheduled_workout_volumes"
+
+  scheduled_workout_id = Column(Integer, ForeignKey("scheduled_workouts.id", ondelete="CASCADE"), primary_key=True)
+  muscle_group = Column(Enum(MuscleGroup), primary_key=True)
+  category = Column(Enum(ExerciseCategory), primary_key=True)
+  volume = Column(Numeric(14, 2), nullable=False, default=0)
+  sets = Column(Integer, nullable=False, default=0)
+  repetitions = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,23 @@
-from sqlalchemy import Column, Integer, Numeric, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Numeric, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+def _plan_owner_id(context) -> int:
+  """Default for user_id when an insert doesn't give it: the plan's owner"""
+  return context.connection.scalar(
+    text("SELECT user_id FROM workout_plans WHERE id = :plan_id"),
+    {"plan_id": context.get_current_parameters()["workout_plan_id"]}
+  )
+
 class WorkoutExercise(Base):
   __tablename__ = "workout_exercises"
 
   id = Column(Integer, primary_key=True, index=True)
   workout_plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False)
   exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+  # The plan's owner, copied here so delta sync reads an (owner, change_seq) range
+  user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, default=_plan_owner_id)
   sets = Column(Integer, nullable=False)
   repetitions = Column(Integer, nullable=False)
   weight = Column(Numeric(10, 2), nullable=True)  # Optional, for weighted exercises
@@ -16,7 +25,13 @@ class WorkoutExercise(Base):
   notes = Column(Text, nullable=True)
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # Plan owner's delta sync position
 
   # Relationships
   workout_plan = relationship("WorkoutPlan", back_populates="exercises")
-  exercise = relationship("Exercise")
\ No newline at end of file
+  exercise = relationship("Exercise")
+
+  # Delta sync: the owner's plan exercises changed after a position
+  __table_args__ = (
+    Index("ix_workout_exercises_user_id_change_seq", "user_id", "change_seq"),
+  )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -12,7 +12,12 @@ class WorkoutPlan(Base):
   description = Column(Text, nullable=True)
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # Owner's delta sync position
 
   # Relationship
   user = relationship("User", backref="workout_plans")
-  exercises = relationship("WorkoutExercise", back_populates="workout_plan", cascade="all, delete-orphan")
\ No newline at end of file
+  exercises = relationship("WorkoutExercise", back_populates="workout_plan", cascade="all, delete-orphan")
+
+  __table_args__ = (
+    Index("ix_workout_plans_user_id_change_seq", "user_id", "change_seq"),
+  )
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, Time, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import backref, relationship
+from app.database import Base
+
+class WorkoutRecurrence(Base):
+  """
+  A repeating schedule for a workout plan, stored once (RRULE-style).
+  Occurrences are expanded on read; only completed, cancelled or moved
+  occurrences get a ScheduledWorkout row (linked by recurrence_id/occurrence_date).
+  """
+  __tablename__ = "workout_recurrences"
+
+  id = Column(Integer, primary_key=True, index=True)
+  user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+  workout_plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False)
+  start_date = Column(Date, nullable=False)
+  scheduled_time = Column(Time, nullable=True)
+  frequency = Column(String(20), nullable=False, default="weekly")  # daily, weekly
+  interval = Column(Integer, nullable=False, default=1)  # Every N days/weeks
+  weekdays = Column(String(20), nullable=True)  # Weekly only, e.g. "MO,WE,FR"; defaults to start_date's day
+  until = Column(Date, nullable=True)  # Last possible date (inclusive)
+  count = Column(Integer, nullable=True)  # Or: number of occurrences
+  notes = Column(Text, nullable=True)
+  created_at = Column(DateTime(timezone=True), server_default=func.now())
+  updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # Owner's delta sync position
+
+  # Relationships
+  user = relationship("User", backref="workout_recurrences")
+  # Removed by the database's ON DELETE CASCADE with their plan
+  workout_plan = relationship("WorkoutPlan", backref=backref("workout_recurrences", passive_deletes=True))
+
+  __table_args__ = (
+    Index("ix_workout_recurrences_user_id_change_seq", "user_id", "change_seq"),
+  )
+
+  @property
+  def weekday_list(self) -> list:
+    return self.weekdays.split(",") if self.weekdays else []
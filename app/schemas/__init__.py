@@ -1,17 +1,32 @@
-from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserOAuthCreate
-from app.schemas.exercise import ExerciseCreate, ExerciseResponse, ExerciseUpdate
+from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserOAuthCreate, PasswordChange
+from app.schemas.exercise import (
+    ExerciseCreate,
+    ExerciseResponse,
+    ExerciseUpdate,
+    ExerciseCatalogItem,
+    ExerciseCatalogLoadResponse
+)
 from app.schemas.workout_plan import (
     WorkoutPlanCreate, 
     WorkoutPlanResponse, 
     WorkoutPlanUpdate,
     WorkoutExerciseCreate,
     WorkoutExerciseResponse,
-    WorkoutExerciseUpdate
+    WorkoutExerciseUpdate,
+    WorkoutExerciseBatchItem,
+    WorkoutExerciseBatchUpdate,
+    WorkoutPlanImportError,
+    WorkoutPlanImportResponse
 )
 from app.schemas.scheduled_workout import (
     ScheduledWorkoutCreate,
     ScheduledWorkoutResponse,
     ScheduledWorkoutUpdate,
-    ScheduledWorkoutComplete
+    ScheduledWorkoutComplete,
+    WorkoutRecurrenceCreate,
+    WorkoutRecurrenceUpdate,
+    WorkoutRecurrenceResponse
 )
-from app.schemas.auth import Token, TokenData, LoginRequest, GoogleAuthRequest
\ No newline at end of file
+from app.schemas.auth import Token, TokenData, LoginRequest, GoogleAuthRequest
+from app.schemas.analytics import TrainingVolumeWeekResponse, PersonalRecordResponse
+from app.schemas.sync import SyncResponse, WorkoutPlanSyncItem, SyncTombstoneResponse
\ No newline at end of file
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from app.models.exercise import ExerciseCategory, MuscleGroup
+
+class TrainingVolumeWeekResponse(BaseModel):
+  week_start: date
+  muscle_group: MuscleGroup
+  category: ExerciseCategory
+  volume: Decimal
+  sets: int
+  repetitions: int
+  workouts: int
+
+  model_config = ConfigDict(from_attributes=True)
+
+class BestSet(BaseModel):
+  weight: float
+  repetitions: int
+  achieved_on: date
+
+class RepRangeRecord(BaseModel):
+  min_repetitions: int
+  max_repetitions: Optional[int] = None  # None: open-ended range
+  weight: float
+  repetitions: int
+  achieved_on: date
+
+class PersonalRecordResponse(BaseModel):
+  exercise_id: int
+  estimated_one_rep_max: float  # Epley
+  estimated_one_rep_max_brzycki: Optional[float] = None
+  estimated_on: date
+  heaviest_weight: float
+  heaviest_weight_on: date
+  best_set: BestSet  # Highest weight x repetitions
+  rep_ranges: List[RepRangeRecord]
+  total_sets: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List
 from app.models.exercise import ExerciseCategory, MuscleGroup
@@ -31,11 +31,27 @@ class ExerciseResponse(ExerciseBase):
 # Pagination response
 class ExerciseListResponse(BaseModel):
     exercises: List[ExerciseResponse]
-    total: int
+    total: Optional[int] = None  # Not computed when paging with a cursor or include_total=false
+    total_is_estimate: bool = False
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
     
     @property
     def has_more(self) -> bool:
         """Check if there are more results"""
-        return self.skip + self.limit < self.total
\ No newline at end of file
+        return self.next_cursor is not None
+
+# Public exercise catalog
+class ExerciseCatalogItem(ExerciseBase):
+    key: Optional[str] = Field(None, min_length=1, max_length=100)  # Natural key; defaults to the lowercased name
+
+class ExerciseCatalogError(BaseModel):
+    row: int  # Line number in the uploaded file
+    error: str
+
+class ExerciseCatalogLoadResponse(BaseModel):
+    loaded: int  # Inserted or changed
+    unchanged: int
+    failed: int
+    errors: List[ExerciseCatalogError] = []
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, date, time
-from typing import Optional
+from typing import Optional, List
 
 class ScheduleWorkoutBase(BaseModel):
   workout_plan_id: int
@@ -18,14 +18,52 @@ class ScheduledWorkoutUpdate(BaseModel):
   notes: Optional[str] = None
 
 class ScheduledWorkoutResponse(ScheduleWorkoutBase):
-  id: int
+  id: Optional[int] = None  # None for occurrences of a recurrence that have no row yet
   user_id: int
   status: str
   completed_at: Optional[datetime] = None
+  recurrence_id: Optional[int] = None
+  occurrence_date: Optional[date] = None
   created_at: datetime
   updated_at: Optional[datetime] = None
 
   model_config = ConfigDict(from_attributes=True)
 
 class ScheduledWorkoutComplete(BaseModel):
-  notes: Optional[str] = None
\ No newline at end of file
+  notes: Optional[str] = None
+
+# Recurring schedules (RRULE-style)
+class WorkoutRecurrenceCreate(BaseModel):
+  workout_plan_id: int
+  start_date: date
+  scheduled_time: Optional[time] = None
+  frequency: str = "weekly"  # daily, weekly
+  interval: int = Field(default=1, ge=1, le=52)
+  weekdays: List[str] = []  # Weekly only: MO, TU, WE, TH, FR, SA, SU
+  until: Optional[date] = None
+  count: Optional[int] = Field(default=None, ge=1, le=1000)
+  notes: Optional[str] = None
+
+class WorkoutRecurrenceUpdate(BaseModel):
+  scheduled_time: Optional[time] = None
+  until: Optional[date] = None
+  count: Optional[int] = Field(default=None, ge=1, le=1000)
+  notes: Optional[str] = None
+
+class WorkoutRecurrenceResponse(BaseModel):
+  id: int
+  user_id: int
+  workout_plan_id: int
+  start_date: date
+  scheduled_time: Optional[time] = None
+  frequency: str
+  interval: int
+  # Stored as "MO,WE,FR"
+  weekdays: List[str] = Field(default=[], validation_alias="weekday_list")
+  until: Optional[date] = None
+  count: Optional[int] = None
+  notes: Optional[str] = None
+  created_at: datetime
+  updated_at: Optional[datetime] = None
+
+  model_config = ConfigDict(from_attributes=True)
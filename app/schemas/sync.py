@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from app.schemas.exercise import ExerciseResponse
+from app.schemas.workout_plan import WorkoutPlanBase, WorkoutExerciseResponse
+from app.schemas.scheduled_workout import ScheduledWorkoutResponse, WorkoutRecurrenceResponse
+
+class WorkoutPlanSyncItem(WorkoutPlanBase):
+  # Plan exercises sync separately, in workout_exercises
+  id: int
+  user_id: int
+  created_at: datetime
+  updated_at: Optional[datetime] = None
+
+class SyncTombstoneResponse(BaseModel):
+  entity_type: str  # exercise, workout_plan, workout_exercise, scheduled_workout, workout_recurrence
+  entity_id: int
+
+class SyncResponse(BaseModel):
+  sync_token: str  # Pass back as ?token= to get the changes after this response
+  has_more: bool  # More changes are waiting; call again right away with sync_token
+  exercises: List[ExerciseResponse] = []
+  workout_plans: List[WorkoutPlanSyncItem] = []
+  workout_exercises: List[WorkoutExerciseResponse] = []
+  scheduled_workouts: List[ScheduledWorkoutResponse] = []
+  workout_recurrences: List[WorkoutRecurrenceResponse] = []
+  deleted: List[SyncTombstoneResponse] = []
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 
@@ -24,4 +24,8 @@ class UserResponse(UserBase):
 
 class UserUpdate(BaseModel):
   full_name: Optional[str] = None
-  email: Optional[EmailStr] = None
\ No newline at end of file
+  email: Optional[EmailStr] = None
+
+class PasswordChange(BaseModel):
+  current_password: str
+  new_password: str = Field(min_length=8)
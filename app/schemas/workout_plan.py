@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List
 from decimal import Decimal
@@ -8,7 +8,7 @@ class WorkoutExerciseBase(BaseModel):
   exercise_id: int
   sets: int
   repetitions: int
-  weight: Optional[str] = None
+  weight: Optional[Decimal] = None
   order_index: int
   notes: Optional[str] = None
 
@@ -22,6 +22,13 @@ class WorkoutExerciseUpdate(BaseModel):
   order_index: Optional[int] = None
   notes:  Optional[str] = None
 
+# Batch edit: one entry per exercise already in the plan, only the given fields change
+class WorkoutExerciseBatchItem(WorkoutExerciseUpdate):
+  exercise_id: int
+
+class WorkoutExerciseBatchUpdate(BaseModel):
+  exercises: List[WorkoutExerciseBatchItem] = Field(min_length=1, max_length=200)
+
 class WorkoutExerciseResponse(WorkoutExerciseBase):
   id: int
   workout_plan_id: int
@@ -47,7 +54,18 @@ class WorkoutPlanResponse(WorkoutPlanBase):
   user_id: int
   created_at: datetime
   updated_at: Optional[datetime] = None
-  exercise: List[WorkoutExerciseResponse] = None
+  # Read from the WorkoutPlan.exercises relationship
+  exercise: List[WorkoutExerciseResponse] = Field(default=None, validation_alias="exercises")
 
   model_config = ConfigDict(from_attributes=True)
 
+
+# Bulk import schemas
+class WorkoutPlanImportError(BaseModel):
+  row: int  # Line number of the plan in the uploaded file
+  error: str
+
+class WorkoutPlanImportResponse(BaseModel):
+  imported: int
+  failed: int
+  errors: List[WorkoutPlanImportError] = []
@@ -0,0 +1,338 @@
+import argparse
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal
+from app.models.exercise import Exercise, ExerciseCategory, MuscleGroup
+from app.models.workout_exercise import WorkoutExercise
+from app.models.scheduled_workout import ScheduledWorkout
+from app.models.training_volume import TrainingVolumeWeek, ScheduledWorkoutVolume
+
+ROLLUP_KEY = ("user_id", "week_start", "muscle_group", "category")
+ROLLUP_COUNTERS = ("volume", "sets", "repetitions", "workouts")
+
+# Rollup rows written per INSERT during a rebuild
+REBUILD_BATCH_SIZE = 1000
+
+# Per-exercise contributions; weight is optional (bodyweight exercises add no volume)
+_VOLUME = func.sum(WorkoutExercise.sets * WorkoutExercise.repetitions * func.coalesce(WorkoutExercise.weight, 0))
+_SETS = func.sum(WorkoutExercise.sets)
+_REPETITIONS = func.sum(WorkoutExercise.sets * WorkoutExercise.repetitions)
+
+
+def week_start(day: date) -> date:
+    """Monday of the day's ISO week"""
+    return day - timedelta(days=day.weekday())
+
+
+def _plan_volume(db: Session, workout_plan_id: int) -> list:
+    """Volume of one workout of a plan, grouped by muscle group and category"""
+    return db.execute(
+        select(Exercise.muscle_group, Exercise.category, _VOLUME, _SETS, _REPETITIONS)
+        .join(Exercise, Exercise.id == WorkoutExercise.exercise_id)
+        .where(WorkoutExercise.workout_plan_id == workout_plan_id)
+        .group_by(Exercise.muscle_group, Exercise.category)
+    ).all()
+
+
+def snapshot_workout_volume(db: Session, scheduled_workout_id: int, workout_plan_id: int) -> None:
+    """
+    Record what completing the scheduled workout adds to the rollup: its
+    plan's volume as it is now. Doesn't commit.
+    """
+    table = ScheduledWorkoutVolume.__table__
+    clear_workout_volume(db, scheduled_workout_id)
+    rows = [
+        {
+            "scheduled_workout_id": scheduled_workout_id,
+            "muscle_group": muscle_group,
+            "category": category,
+            "volume": Decimal(volume or 0),
+            "sets": sets or 0,
+            "repetitions": repetitions or 0,
+        }
+        for muscle_group, category, volume, sets, repetitions in _plan_volume(db, workout_plan_id)
+    ]
+    if rows:
+        db.execute(insert(table), rows)
+
+
+def clear_workout_volume(db: Session, scheduled_workout_id: int) -> None:
+    """Drop a scheduled workout's volume snapshot (once it no longer counts)"""
+    table = ScheduledWorkoutVolume.__table__
+    db.execute(delete(table).where(table.c.scheduled_workout_id == scheduled_workout_id))
+
+
+def _snapshot_missing_volumes(db: Session, user_id: Optional[int]) -> None:
+    """Snapshot completed workouts that have none (inserted directly, or completed before snapshots)"""
+    snapshot = ScheduledWorkoutVolume.__table__
+    query = (
+        select(
+            ScheduledWorkout.id,
+            Exercise.muscle_group,
+            Exercise.category,
+            _VOLUME,
+            _SETS,
+            _REPETITIONS
+        )
+        .join(WorkoutExercise, WorkoutExercise.workout_plan_id == ScheduledWorkout.workout_plan_id)
+        .join(Exercise, Exercise.id == WorkoutExercise.exercise_id)
+        .where(
+            ScheduledWorkout.status == "completed",
+            ~select(snapshot.c.scheduled_workout_id)
+            .where(snapshot.c.scheduled_workout_id == ScheduledWorkout.id)
+            .exists()
+        )
+        .group_by(ScheduledWorkout.id, Exercise.muscle_group, Exercise.category)
+    )
+    if user_id is not None:
+        query = query.where(ScheduledWorkout.user_id == user_id)
+
+    db.execute(insert(snapshot).from_select(
+        ["scheduled_workout_id", "muscle_group", "category", "volume", "sets", "repetitions"],
+        query
+    ))
+
+
+def _add_to_rollup(db: Session, rows: List[dict]) -> None:
+    """Add counter deltas to rollup rows, creating missing rows"""
+    table = TrainingVolumeWeek.__table__
+    dialect_name = db.get_bind().dialect.name
+
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={column: table.c[column] + stmt.excluded[column] for column in ROLLUP_COUNTERS}
+        ))
+        return
+
+    for row in rows:
+        result = db.execute(
+            update(table)
+            .where(*(table.c[column] == row[column] for column in ROLLUP_KEY))
+            .values({column: table.c[column] + row[column] for column in ROLLUP_COUNTERS})
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(row))
+
+
+def apply_workout_volume(
+    db: Session,
+    user_id: int,
+    scheduled_workout_id: int,
+    scheduled_date: date,
+    sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) one completed workout's volume snapshot
+    (see snapshot_workout_volume) in the weekly rollup of scheduled_date.
+    Doesn't commit; call it in the same transaction as the status change so
+    the rollup can't drift from the scheduled workouts.
+    """
+    contributions = db.execute(
+        select(
+            ScheduledWorkoutVolume.muscle_group,
+            ScheduledWorkoutVolume.category,
+            ScheduledWorkoutVolume.volume,
+            ScheduledWorkoutVolume.sets,
+            ScheduledWorkoutVolume.repetitions
+        ).where(ScheduledWorkoutVolume.scheduled_workout_id == scheduled_workout_id)
+    ).all()
+    if not contributions:
+        return
+
+    week = week_start(scheduled_date)
+    _add_to_rollup(db, [
+        {
+            "user_id": user_id,
+            "week_start": week,
+            "muscle_group": muscle_group,
+            "category": category,
+            "volume": sign * Decimal(volume or 0),
+            "sets": sign * (sets or 0),
+            "repetitions": sign * (repetitions or 0),
+            "workouts": sign,
+        }
+        for muscle_group, category, volume, sets, repetitions in contributions
+    ])
+
+    if sign < 0:
+        db.execute(
+            delete(TrainingVolumeWeek).where(
+                TrainingVolumeWeek.user_id == user_id,
+                TrainingVolumeWeek.week_start == week,
+                TrainingVolumeWeek.workouts <= 0
+            )
+        )
+
+
+def remove_plan_volume(db: Session, user_id: int, workout_plan_id: int) -> None:
+    """
+    Take every completed workout of a plan out of the rollup, before the
+    plan is deleted and its scheduled workouts (and their snapshots) cascade
+    with it. Doesn't commit.
+    """
+    completed = db.execute(
+        select(ScheduledWorkout.id, ScheduledWorkout.scheduled_date).where(
+            ScheduledWorkout.workout_plan_id == workout_plan_id,
+            ScheduledWorkout.status == "completed"
+        )
+    ).all()
+    for scheduled_workout_id, scheduled_date in completed:
+        apply_workout_volume(db, user_id, scheduled_workout_id, scheduled_date, sign=-1)
+
+
+def get_training_volume(
+    db: Session,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    muscle_group: Optional[MuscleGroup] = None,
+    category: Optional[ExerciseCategory] = None
+) -> List[TrainingVolumeWeek]:
+    """
+    Get the user's weekly volume rows for the weeks overlapping the date range,
+    ordered by week, muscle group and category
+    """
+    query = db.query(TrainingVolumeWeek).filter(
+        TrainingVolumeWeek.user_id == user_id,
+        TrainingVolumeWeek.week_start >= week_start(date_from),
+        TrainingVolumeWeek.week_start <= date_to
+    )
+
+    if muscle_group:
+        query = query.filter(TrainingVolumeWeek.muscle_group == muscle_group)
+    if category:
+        query = query.filter(TrainingVolumeWeek.category == category)
+
+    return query.order_by(
+        TrainingVolumeWeek.week_start,
+        TrainingVolumeWeek.muscle_group,
+        TrainingVolumeWeek.category
+    ).all()
+
+
+def _daily_volume(db: Session, user_id: Optional[int]) -> Iterable:
+    """
+    Completed-workout volume snapshots per (user, day, muscle group, category),
+    streamed in (user, day) order. Days are folded into weeks in Python so the
+    query stays portable (no dialect-specific week truncation).
+    """
+    query = (
+        select(
+            ScheduledWorkout.user_id,
+            ScheduledWorkout.scheduled_date,
+            ScheduledWorkoutVolume.muscle_group,
+            ScheduledWorkoutVolume.category,
+            func.sum(ScheduledWorkoutVolume.volume),
+            func.sum(ScheduledWorkoutVolume.sets),
+            func.sum(ScheduledWorkoutVolume.repetitions),
+            func.count(ScheduledWorkout.id.distinct())
+        )
+        .join(ScheduledWorkoutVolume, ScheduledWorkoutVolume.scheduled_workout_id == ScheduledWorkout.id)
+        .where(ScheduledWorkout.status == "completed")
+        .group_by(
+            ScheduledWorkout.user_id,
+            ScheduledWorkout.scheduled_date,
+            ScheduledWorkoutVolume.muscle_group,
+            ScheduledWorkoutVolume.category
+        )
+        .order_by(ScheduledWorkout.user_id, ScheduledWorkout.scheduled_date)
+    )
+    if user_id is not None:
+        query = query.where(ScheduledWorkout.user_id == user_id)
+
+    return db.execute(query.execution_options(yield_per=REBUILD_BATCH_SIZE))
+
+
+def rebuild_training_volume(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute the rollup from completed scheduled workouts' volume snapshots,
+    for one user or everyone (snapshotting completed workouts that have none).
+    Replaces the existing rows in a single transaction.
+    Returns the number of rollup rows written.
+    """
+    _snapshot_missing_volumes(db, user_id)
+
+    clear = delete(TrainingVolumeWeek)
+    if user_id is not None:
+        clear = clear.where(TrainingVolumeWeek.user_id == user_id)
+    db.execute(clear)
+
+    table = TrainingVolumeWeek.__table__
+    written = 0
+    current_week = None
+    week_rows: dict = {}
+
+    def flush_week():
+        nonlocal written
+        if week_rows:
+            db.execute(insert(table), list(week_rows.values()))
+            written += len(week_rows)
+            week_rows.clear()
+
+    for row_user_id, day, muscle_group, category, volume, sets, repetitions, workouts in _daily_volume(db, user_id):
+        week = (row_user_id, week_start(day))
+        if week != current_week:
+            # Rows arrive in (user, day) order, so a week never reappears
+            if len(week_rows) >= REBUILD_BATCH_SIZE:
+                flush_week()
+            current_week = week
+        key = (*week, muscle_group, category)
+        entry = week_rows.get(key)
+        if entry is None:
+            entry = week_rows[key] = {
+                "user_id": row_user_id,
+                "week_start": week[1],
+                "muscle_group": muscle_group,
+                "category": category,
+                "volume": Decimal(0),
+                "sets": 0,
+                "repetitions": 0,
+                "workouts": 0,
+            }
+        entry["volume"] += Decimal(volume or 0)
+        entry["sets"] += sets or 0
+        entry["repetitions"] += repetitions or 0
+        entry["workouts"] += workouts
+
+    flush_week()
+    db.commit()
+    return written
+
+
+# --- Async variants ---
+
+async def get_training_volume_async(
+    db: AsyncSession,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    muscle_group: Optional[MuscleGroup] = None,
+    category: Optional[ExerciseCategory] = None
+) -> List[TrainingVolumeWeek]:
+    """Async version of get_training_volume"""
+    return await db.run_sync(get_training_volume, user_id, date_from, date_to, muscle_group, category)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the weekly training volume rollup")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        written = rebuild_training_volume(db, args.user_id)
+    finally:
+        db.close()
+    print(f"Wrote {written} training volume rows")
+
+
+if __name__ == "__main__":
+    main()
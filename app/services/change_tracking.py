@@ -0,0 +1,156 @@
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+from app.models.exercise import Exercise
+from app.models.workout_plan import WorkoutPlan
+from app.models.workout_exercise import WorkoutExercise
+from app.models.scheduled_workout import ScheduledWorkout
+from app.models.workout_recurrence import WorkoutRecurrence
+from app.models.sync import SyncCounter, SyncTombstone
+
+PUBLIC_SCOPE = "public"
+
+ENTITY_TYPES = {
+    Exercise: "exercise",
+    WorkoutPlan: "workout_plan",
+    WorkoutExercise: "workout_exercise",
+    ScheduledWorkout: "scheduled_workout",
+    WorkoutRecurrence: "workout_recurrence",
+}
+SYNCED_MODELS = tuple(ENTITY_TYPES)
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+# --- Change sequence ---
+
+def allocate_change_seq(connection: Connection, scope: str, count: int = 1) -> int:
+    """
+    Reserve `count` consecutive values in a scope's change sequence; returns the first.
+    The counter row stays locked until the transaction ends, so values become
+    visible in the order they were allocated.
+    """
+    table = SyncCounter.__table__
+    dialect_name = connection.dialect.name
+
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(scope=scope, value=count)
+        last = connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.scope],
+                set_={"value": table.c.value + count}
+            ).returning(table.c.value)
+        ).scalar_one()
+        return last - count + 1
+
+    result = connection.execute(
+        update(table).where(table.c.scope == scope).values(value=table.c.value + count)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(scope=scope, value=count))
+        return 1
+    last = connection.execute(select(table.c.value).where(table.c.scope == scope)).scalar_one()
+    return last - count + 1
+
+
+def _owner_id(session: Session, obj) -> Optional[int]:
+    if isinstance(obj, Exercise):
+        return obj.created_by
+    if isinstance(obj, WorkoutExercise) and obj.user_id is None:
+        # New entry: user_id is filled in from the plan on insert
+        plan = obj.workout_plan or session.get(WorkoutPlan, obj.workout_plan_id)
+        return plan.user_id if plan is not None else None
+    return obj.user_id
+
+
+def _was_public(obj: Exercise) -> bool:
+    return True in attributes.get_history(obj, "is_public").deleted
+
+
+def _record_changes(session: Session, flush_context, instances) -> None:
+    """
+    before_flush hook: stamp new/changed synced rows with the next values of
+    their owner's (and, for public exercises, the public) change sequence,
+    and write tombstones for deleted ones.
+    """
+    changed = [obj for obj in session.new if isinstance(obj, SYNCED_MODELS)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, SYNCED_MODELS) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, SYNCED_MODELS)]
+    if not changed and not deleted:
+        return
+
+    # Per scope: attribute setters and tombstone rows waiting for a sequence value
+    pending = defaultdict(list)
+
+    with session.no_autoflush:
+        for obj in changed:
+            owner_id = _owner_id(session, obj)
+            if owner_id is not None:
+                pending[user_scope(owner_id)].append((obj, "change_seq"))
+            if isinstance(obj, Exercise):
+                if obj.is_public:
+                    pending[PUBLIC_SCOPE].append((obj, "public_change_seq"))
+                elif _was_public(obj):
+                    # No longer visible to other users
+                    pending[PUBLIC_SCOPE].append(
+                        {"owner_id": owner_id, "entity_type": "exercise", "entity_id": obj.id}
+                    )
+
+        # One tombstone per row and scope, whether the session deletes it or
+        # it goes by cascade with another deleted row in the same flush
+        tombstoned = set()
+
+        def tombstone(owner_id: Optional[int], entity_type: str, entity_id: int, scope: Optional[str] = None) -> None:
+            scope = scope or user_scope(owner_id)
+            if (scope, entity_type, entity_id) in tombstoned:
+                return
+            tombstoned.add((scope, entity_type, entity_id))
+            pending[scope].append({"owner_id": owner_id, "entity_type": entity_type, "entity_id": entity_id})
+
+        for obj in deleted:
+            owner_id = _owner_id(session, obj)
+            entity_type = ENTITY_TYPES[type(obj)]
+            if owner_id is not None:
+                tombstone(owner_id, entity_type, obj.id)
+            if isinstance(obj, Exercise) and (obj.is_public or _was_public(obj)):
+                tombstone(owner_id, entity_type, obj.id, PUBLIC_SCOPE)
+            if isinstance(obj, WorkoutPlan):
+                # Removed by the database's ON DELETE CASCADE, not by the session
+                for model in (ScheduledWorkout, WorkoutRecurrence):
+                    for cascaded_id in session.scalars(select(model.id).where(model.workout_plan_id == obj.id)):
+                        tombstone(obj.user_id, ENTITY_TYPES[model], cascaded_id)
+            if isinstance(obj, Exercise):
+                # Plan entries using it (in anyone's plans) go with it, also by cascade
+                for plan_exercise_id, plan_owner_id in session.execute(
+                    select(WorkoutExercise.id, WorkoutExercise.user_id).where(WorkoutExercise.exercise_id == obj.id)
+                ):
+                    tombstone(plan_owner_id, "workout_exercise", plan_exercise_id)
+
+    connection = session.connection()
+    tombstones = []
+    for scope, entries in pending.items():
+        seq = allocate_change_seq(connection, scope, len(entries))
+        for entry in entries:
+            if isinstance(entry, dict):
+                tombstones.append({**entry, "scope": scope, "change_seq": seq})
+            else:
+                obj, attribute = entry
+                setattr(obj, attribute, seq)
+            seq += 1
+    if tombstones:
+        connection.execute(insert(SyncTombstone.__table__), tombstones)
+
+
+def install_change_tracking() -> None:
+    """Stamp synced rows and record deletes on every ORM flush in the process"""
+    if not event.contains(Session, "before_flush", _record_changes):
+        event.listen(Session, "before_flush", _record_changes)
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import csv
+import io
+from typing import AsyncIterator, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import cast, column, func, insert, or_, select, table, text, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import await_only
+from app.database import AsyncSessionLocal
+from app.models.exercise import Exercise
+from app.schemas.exercise import ExerciseCatalogItem, ExerciseCatalogError
+from app.core.cache import collection_versions
+from app.services.change_tracking import PUBLIC_SCOPE, allocate_change_seq
+from app.services.exercise_service import PUBLIC_EXERCISES
+from app.services.plan_import_service import ParsedRecord, _format_validation_error, iter_jsonl_records
+
+# Catalog rows validated and upserted per transaction; each chunk holds its
+# row locks only for its own COPY + upsert
+CATALOG_CHUNK_SIZE = 5000
+
+# Columns a catalog row sets, in staging table order
+CATALOG_COLUMNS = ("catalog_key", "name", "description", "category", "muscle_group", "public_change_seq")
+
+STAGING_TABLE = "exercise_catalog_staging"
+STAGING = table(STAGING_TABLE, *(column(name) for name in CATALOG_COLUMNS))
+STAGING_DDL = f"""
+    CREATE TEMPORARY TABLE {STAGING_TABLE} (
+        catalog_key varchar(100) NOT NULL,
+        name varchar(255) NOT NULL,
+        description text,
+        category text NOT NULL,
+        muscle_group text NOT NULL,
+        public_change_seq bigint NOT NULL
+    ) ON COMMIT DROP
+"""
+
+
+async def iter_csv_catalog_records(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRecord]:
+    """
+    One exercise per CSV row. Columns: key, name, description, category,
+    muscle_group (key is optional). Quoted fields can't span lines.
+    """
+    header: Optional[List[str]] = None
+    row = 0
+
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            if "name" not in header:
+                yield row, "CSV header must include name"
+                return
+            continue
+        yield row, {field: value or None for field, value in zip(header, values)}
+
+
+def _catalog_rows(items: List[ExerciseCatalogItem], first_seq: int) -> List[dict]:
+    """Rows keyed by catalog_key; a key repeated in the chunk keeps its last row"""
+    rows = {}
+    for item in items:
+        key = item.key or item.name.strip().lower()
+        rows[key] = {
+            "catalog_key": key,
+            "name": item.name,
+            "description": item.description,
+            # Enum columns store member names
+            "category": item.category.name,
+            "muscle_group": item.muscle_group.name,
+        }
+    for seq, row in enumerate(rows.values(), start=first_seq):
+        row["public_change_seq"] = seq
+    return list(rows.values())
+
+
+def _changed(target, source) -> object:
+    """Only rewrite catalog rows whose content changed, so refreshes don't churn sync"""
+    return or_(*(
+        getattr(target, name).is_distinct_from(source[name])
+        for name in ("name", "description", "category", "muscle_group")
+    ), target.is_public.is_distinct_from(true()))
+
+
+def _upsert_set(source) -> dict:
+    return {
+        **{name: source[name] for name in CATALOG_COLUMNS if name != "catalog_key"},
+        "is_public": true(),
+        "updated_at": func.now(),
+    }
+
+
+def _copy_to_staging(db: Session, rows: List[dict]) -> bool:
+    """
+    COPY rows into the staging table with the driver's COPY FROM STDIN support.
+    Returns False if the driver has none.
+    """
+    connection = db.connection()
+    driver_connection = connection.connection.driver_connection
+    records = [tuple(row[name] for name in CATALOG_COLUMNS) for row in rows]
+
+    if connection.dialect.driver == "asyncpg":
+        # run_sync executes in a greenlet that can wait on the event loop
+        await_only(driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=list(CATALOG_COLUMNS)
+        ))
+        return True
+
+    if connection.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        buffer.seek(0)
+        with driver_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(CATALOG_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        return True
+
+    return False
+
+
+def _upsert_postgresql(db: Session, rows: List[dict]) -> Optional[int]:
+    """COPY into a transaction-scoped staging table, then one set-based upsert"""
+    db.execute(text(STAGING_DDL))
+    if not _copy_to_staging(db, rows):
+        return None
+
+    exercises = Exercise.__table__
+    stmt = postgresql.insert(exercises).from_select(
+        [*CATALOG_COLUMNS, "is_public"],
+        select(
+            STAGING.c.catalog_key,
+            STAGING.c.name,
+            STAGING.c.description,
+            cast(STAGING.c.category, exercises.c.category.type),
+            cast(STAGING.c.muscle_group, exercises.c.muscle_group.type),
+            STAGING.c.public_change_seq,
+            true(),
+        )
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[exercises.c.catalog_key],
+        set_=_upsert_set(stmt.excluded),
+        where=_changed(exercises.c, stmt.excluded)
+    )
+    return db.execute(stmt).rowcount
+
+
+def _upsert_rows(db: Session, rows: List[dict]) -> int:
+    """executemany fallback: an upsert per row on SQLite, update-then-insert elsewhere"""
+    exercises = Exercise.__table__
+    rows = [{**row, "is_public": True} for row in rows]
+
+    if db.get_bind().dialect.name == "sqlite":
+        stmt = sqlite.insert(exercises)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[exercises.c.catalog_key],
+            set_=_upsert_set(stmt.excluded),
+            where=_changed(exercises.c, stmt.excluded)
+        )
+        return db.execute(stmt, rows).rowcount
+
+    written = 0
+    for row in rows:
+        result = db.execute(
+            update(exercises)
+            .where(exercises.c.catalog_key == row["catalog_key"], _changed(exercises.c, row))
+            .values({name: value for name, value in row.items() if name != "catalog_key"}, updated_at=func.now())
+        )
+        if result.rowcount:
+            written += 1
+        elif db.scalar(select(exercises.c.id).where(exercises.c.catalog_key == row["catalog_key"])) is None:
+            db.execute(insert(exercises).values(row))
+            written += 1
+    return written
+
+
+def upsert_catalog_chunk(db: Session, items: List[ExerciseCatalogItem]) -> tuple[int, int]:
+    """
+    Insert or update a chunk of catalog exercises (public, no owner) by
+    catalog_key in one transaction. Rows missing from the catalog are kept:
+    users' plans may reference them.
+    Returns tuple of (written_count, unchanged_count)
+    """
+    # Core statements skip the ORM flush, so take public sync positions explicitly
+    first_seq = allocate_change_seq(db.connection(), PUBLIC_SCOPE, len(items))
+    rows = _catalog_rows(items, first_seq)
+
+    written = None
+    if db.get_bind().dialect.name == "postgresql":
+        written = _upsert_postgresql(db, rows)
+    if written is None:
+        written = _upsert_rows(db, rows)
+
+    db.commit()
+    if written:
+        collection_versions.bump(PUBLIC_EXERCISES)
+    return written, len(rows) - written
+
+
+async def load_catalog_async(
+    db: AsyncSession,
+    records: AsyncIterator[ParsedRecord],
+    chunk_size: int = CATALOG_CHUNK_SIZE
+) -> tuple[int, int, List[ExerciseCatalogError]]:
+    """
+    Validate streamed catalog records and upsert them chunk by chunk.
+    Returns tuple of (written_count, unchanged_count, errors)
+    """
+    errors: List[ExerciseCatalogError] = []
+    written = unchanged = 0
+    chunk: List[ExerciseCatalogItem] = []
+
+    async def flush(batch: List[ExerciseCatalogItem]) -> None:
+        nonlocal written, unchanged
+        chunk_written, chunk_unchanged = await db.run_sync(upsert_catalog_chunk, batch)
+        written += chunk_written
+        unchanged += chunk_unchanged
+
+    async for row, record in records:
+        if isinstance(record, str):
+            errors.append(ExerciseCatalogError(row=row, error=record))
+            continue
+        try:
+            chunk.append(ExerciseCatalogItem.model_validate(record))
+        except ValidationError as exc:
+            errors.append(ExerciseCatalogError(row=row, error=_format_validation_error(exc)))
+            continue
+
+        if len(chunk) >= chunk_size:
+            await flush(chunk)
+            chunk = []
+
+    if chunk:
+        await flush(chunk)
+
+    errors.sort(key=lambda error: error.row)
+    return written, unchanged, errors
+
+
+# --- Command line ---
+
+async def _iter_file_lines(path: str) -> AsyncIterator[str]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+async def _load_file(path: str, chunk_size: int) -> tuple[int, int, List[ExerciseCatalogError]]:
+    lines = _iter_file_lines(path)
+    records = iter_csv_catalog_records(lines) if path.endswith(".csv") else iter_jsonl_records(lines)
+    async with AsyncSessionLocal() as db:
+        return await load_catalog_async(db, records, chunk_size)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load the public exercise catalog from a CSV or JSONL file")
+    parser.add_argument("path", help="Catalog file; .csv is read as CSV, anything else as JSONL")
+    parser.add_argument("--chunk-size", type=int, default=CATALOG_CHUNK_SIZE, help="Rows per transaction")
+    args = parser.parse_args(argv)
+
+    written, unchanged, errors = asyncio.run(_load_file(args.path, args.chunk_size))
+    for error in errors:
+        print(f"row {error.row}: {error.error}")
+    print(f"Loaded {written} exercises ({unchanged} unchanged, {len(errors)} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+from typing import List, Optional
+from sqlalchemy import or_, func, literal_column, table, column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Query
+from app.models.exercise import Exercise
+
+# Full-text search over exercise name + description.
+#
+# PostgreSQL: generated `exercises.search_vector` tsvector column with a GIN
+#   index (name weighted above description), ranked with ts_rank.
+# SQLite: external-content FTS5 table `exercises_fts` kept in sync by
+#   triggers, ranked with bm25 (the built-in `rank` column).
+# Both are created by the exercise full-text search migration; for databases
+# built with Base.metadata.create_all call create_search_index().
+
+SEARCH_VECTOR = literal_column("exercises.search_vector", type_=TSVECTOR)
+EXERCISES_FTS = table("exercises_fts", column("rowid"), column("rank"))
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS exercises_fts USING fts5(
+        name, description, content='exercises', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_ai AFTER INSERT ON exercises BEGIN
+        INSERT INTO exercises_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_ad AFTER DELETE ON exercises BEGIN
+        INSERT INTO exercises_fts(exercises_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_au AFTER UPDATE ON exercises BEGIN
+        INSERT INTO exercises_fts(exercises_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO exercises_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO exercises_fts(exercises_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE exercises ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_exercises_search_vector ON exercises USING gin (search_vector)",
+]
+
+
+def create_search_index(connection) -> None:
+    """Create the search column/table for the connection's dialect (idempotent)"""
+    statements = {
+        "postgresql": POSTGRES_SEARCH_DDL,
+        "sqlite": SQLITE_SEARCH_DDL,
+    }.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _search_terms(search: str) -> List[str]:
+    """Split user input into plain word tokens (drops search-syntax operators)"""
+    return re.findall(r"\w+", search)
+
+
+def apply_exercise_search(query: Query, search: str, dialect_name: str) -> tuple[Query, Optional[object]]:
+    """
+    Filter an Exercise query by a search string, matching word prefixes.
+    Returns tuple of (query, rank_order) where rank_order orders best matches
+    first, or None when the dialect has no search index and ILIKE is used.
+    """
+    terms = _search_terms(search)
+
+    if terms and dialect_name == "postgresql":
+        ts_query = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        query = query.filter(SEARCH_VECTOR.op("@@")(ts_query))
+        return query, func.ts_rank(SEARCH_VECTOR, ts_query).desc()
+
+    if terms and dialect_name == "sqlite":
+        match = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        query = query.join(EXERCISES_FTS, EXERCISES_FTS.c.rowid == Exercise.id).filter(
+            literal_column("exercises_fts").op("MATCH")(match)
+        )
+        return query, EXERCISES_FTS.c.rank.asc()
+
+    search_filter = or_(
+        Exercise.name.ilike(f"%{search}%"),
+        Exercise.description.ilike(f"%{search}%")
+    )
+    return query.filter(search_filter), None
@@ -1,8 +1,61 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+import json
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, text
 from typing import Optional, List
 from app.models.exercise import Exercise, ExerciseCategory, MuscleGroup
-from app.schemas.exercise import ExerciseCreate, ExerciseUpdate
+from app.schemas.exercise import ExerciseCreate, ExerciseUpdate, ExerciseResponse
+from app.core.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    keyset_filter,
+    keyset_order_by,
+    next_cursor
+)
+from app.services.exercise_search import apply_exercise_search
+from app.core.cache import get_exercise_count_cache, collection_versions
+
+PUBLIC_EXERCISES = ("exercises", "public")
+
+# Columns ExerciseResponse needs, for list pages served without ORM instances
+EXERCISE_LIST_FIELDS = tuple(ExerciseResponse.model_fields)
+EXERCISE_LIST_COLUMNS = tuple(getattr(Exercise, field) for field in EXERCISE_LIST_FIELDS)
+
+# Row versions selected after the list columns, so a page's ETag can be
+# derived without rendering it
+EXERCISE_VERSION_COLUMNS = (Exercise.change_seq, Exercise.public_change_seq)
+
+
+def _bump_exercise_versions(user_id: int, public: bool) -> None:
+    """Invalidate cached exercise counts for the owner (and everyone, if public)"""
+    collection_versions.bump(("exercises", user_id))
+    if public:
+        collection_versions.bump(PUBLIC_EXERCISES)
+
+
+def _estimate_catalog_count(db: Session, current_user_id: int) -> Optional[int]:
+    """
+    Planner row estimate for the unfiltered catalog (own + public exercises).
+    Only PostgreSQL keeps the statistics; returns None elsewhere.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    plan = db.execute(
+        text("EXPLAIN (FORMAT JSON) SELECT 1 FROM exercises WHERE created_by = :user_id OR is_public"),
+        {"user_id": current_user_id}
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count_exercises(db: Session, query: Query, cache_key: tuple) -> int:
+    """Exact count, cached per filter set until the relevant exercises change"""
+    total_count = get_exercise_count_cache().get(cache_key)
+    if total_count is None:
+        total_count = query.count()
+        get_exercise_count_cache().set(cache_key, total_count)
+    return total_count
 
 
 def get_exercise_by_id(db: Session, exercise_id: int) -> Optional[Exercise]:
@@ -20,14 +73,36 @@ def get_exercises(
     muscle_group: Optional[MuscleGroup] = None,
     is_public: Optional[bool] = None,
     search: Optional[str] = None,
-    sort_by: str = "created_at",
-    sort_order: str = "desc"
-) -> tuple[List[Exercise], int]:
+    sort_by: Optional[str] = None,
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+    columns_only: bool = False
+) -> tuple[List[Exercise], Optional[int], Optional[str]]:
     """
     Get exercises with filters and pagination.
-    Returns tuple of (exercises, total_count)
+
+    Without a cursor, pages with offset/limit and counts the matching rows.
+    With a cursor (from a previous page's next_cursor), seeks past the last
+    seen (sort column, id) pair instead, skipping both the offset and the count.
+
+    Counts are cached per filter set and skipped entirely with
+    include_total=False. estimate_total=True uses the planner's estimate
+    for the unfiltered catalog on PostgreSQL instead of counting.
+
+    sort_by defaults to "relevance" when searching and "created_at" otherwise.
+    Relevance-ranked results are paged with skip only.
+
+    columns_only=True selects just EXERCISE_LIST_COLUMNS followed by
+    EXERCISE_VERSION_COLUMNS and returns Row objects instead of Exercise
+    instances (no identity map or ORM state).
+    Returns tuple of (exercises, total_count, next_cursor)
     """
-    query = db.query(Exercise)
+    if columns_only:
+        query = db.query(*EXERCISE_LIST_COLUMNS, *EXERCISE_VERSION_COLUMNS)
+    else:
+        query = db.query(Exercise)
     
     # Default: Show user's exercises + public exercises
     if only_mine:
@@ -50,28 +125,66 @@ def get_exercises(
     if is_public is not None:
         query = query.filter(Exercise.is_public == is_public)
     
+    rank_order = None
     if search:
-        search_filter = or_(
-            Exercise.name.ilike(f"%{search}%"),
-            Exercise.description.ilike(f"%{search}%")
+        query, rank_order = apply_exercise_search(query, search, db.get_bind().dialect.name)
+
+    def count_total() -> Optional[int]:
+        if not include_total:
+            return None
+        unfiltered = not (only_mine or category or muscle_group or is_public is not None or search)
+        if estimate_total and unfiltered:
+            estimate = _estimate_catalog_count(db, current_user_id)
+            if estimate is not None:
+                return estimate
+        cache_key = (
+            current_user_id,
+            collection_versions.get(("exercises", current_user_id)),
+            collection_versions.get(PUBLIC_EXERCISES),
+            only_mine, category, muscle_group, is_public, search
         )
-        query = query.filter(search_filter)
-    
-    # Get total count before pagination
-    total_count = query.count()
-    
-    # Apply sorting
-    if hasattr(Exercise, sort_by):
-        sort_column = getattr(Exercise, sort_by)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
+        return _count_exercises(db, query, cache_key)
+
+    if sort_by is None:
+        sort_by = "relevance" if search else "created_at"
+
+    if sort_by == "relevance":
+        if cursor:
+            raise InvalidCursorError("Cursor pagination isn't available when sorting by relevance")
+        total_count = count_total()
+        if rank_order is not None:
+            query = query.order_by(rank_order, Exercise.id)
         else:
-            query = query.order_by(sort_column.asc())
-    
-    # Apply pagination
-    exercises = query.offset(skip).limit(limit).all()
-    
-    return exercises, total_count
+            query = query.order_by(Exercise.id)
+        exercises = query.offset(skip).limit(limit).all()
+        return exercises, total_count, None
+
+    # Apply sorting (id breaks ties so pages are stable)
+    if not hasattr(Exercise, sort_by):
+        sort_by = "id"
+    sort_column = getattr(Exercise, sort_by)
+    descending = sort_order.lower() == "desc"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        query = query.filter(keyset_filter(
+            sort_column, Exercise.id, value, last_id, descending, db.get_bind().dialect.name
+        ))
+        total_count = None
+    else:
+        # Get total count before pagination
+        total_count = count_total()
+
+    # ORDER BY has to be applied before OFFSET/LIMIT
+    query = query.order_by(*keyset_order_by(sort_column, Exercise.id, descending))
+    if not cursor:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    exercises, cursor_out = next_cursor(rows, limit, sort_by, sort_order)
+
+    return exercises, total_count, cursor_out
 
 
 def create_exercise(db: Session, exercise: ExerciseCreate, user_id: int) -> Exercise:
@@ -83,6 +196,7 @@ def create_exercise(db: Session, exercise: ExerciseCreate, user_id: int) -> Exer
     db.add(db_exercise)
     db.commit()
     db.refresh(db_exercise)
+    _bump_exercise_versions(user_id, db_exercise.is_public)
     return db_exercise
 
 
@@ -101,12 +215,14 @@ def update_exercise(
     if not db_exercise:
         return None
     
+    was_public = db_exercise.is_public
     update_data = exercise_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_exercise, field, value)
     
     db.commit()
     db.refresh(db_exercise)
+    _bump_exercise_versions(user_id, was_public or db_exercise.is_public)
     return db_exercise
 
 
@@ -120,6 +236,46 @@ def delete_exercise(db: Session, exercise_id: int, user_id: int) -> bool:
     if not db_exercise:
         return False
     
+    was_public = db_exercise.is_public
     db.delete(db_exercise)
     db.commit()
-    return True
\ No newline at end of file
+    _bump_exercise_versions(user_id, was_public)
+    return True
+
+
+# --- Async variants ---
+# These run the functions above through AsyncSession.run_sync, so the same
+# queries go through the async driver without blocking the event loop.
+
+async def get_exercise_by_id_async(db: AsyncSession, exercise_id: int) -> Optional[Exercise]:
+    """Async version of get_exercise_by_id"""
+    return await db.run_sync(get_exercise_by_id, exercise_id)
+
+
+async def get_exercises_async(
+    db: AsyncSession,
+    current_user_id: int,
+    **filters
+) -> tuple[List[Exercise], Optional[int], Optional[str]]:
+    """Async version of get_exercises (accepts the same keyword filters)"""
+    return await db.run_sync(get_exercises, current_user_id, **filters)
+
+
+async def create_exercise_async(db: AsyncSession, exercise: ExerciseCreate, user_id: int) -> Exercise:
+    """Async version of create_exercise"""
+    return await db.run_sync(create_exercise, exercise, user_id)
+
+
+async def update_exercise_async(
+    db: AsyncSession,
+    exercise_id: int,
+    exercise_update: ExerciseUpdate,
+    user_id: int
+) -> Optional[Exercise]:
+    """Async version of update_exercise"""
+    return await db.run_sync(update_exercise, exercise_id, exercise_update, user_id)
+
+
+async def delete_exercise_async(db: AsyncSession, exercise_id: int, user_id: int) -> bool:
+    """Async version of delete_exercise"""
+    return await db.run_sync(delete_exercise, exercise_id, user_id)
@@ -0,0 +1,105 @@
+import enum
+import json
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncIterator
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.exercise import Exercise
+from app.models.workout_plan import WorkoutPlan
+from app.models.workout_exercise import WorkoutExercise
+from app.models.scheduled_workout import ScheduledWorkout
+from app.models.workout_recurrence import WorkoutRecurrence
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+# Bytes of NDJSON buffered before a chunk is sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Never exported
+USER_EXCLUDED_COLUMNS = {"password_hash"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Can't serialize {type(value).__name__}")
+
+
+def _line(record_type: str, mapping) -> bytes:
+    record = {"type": record_type, **mapping}
+    return (json.dumps(record, default=_json_default) + "\n").encode("utf-8")
+
+
+def _export_queries(user_id: int) -> list:
+    """(record type, Core select) pairs, each streamed in primary key order"""
+    plans = WorkoutPlan.__table__
+    plan_items = WorkoutExercise.__table__
+    return [
+        ("exercise", select(Exercise.__table__)
+            .where(Exercise.__table__.c.created_by == user_id)
+            .order_by(Exercise.__table__.c.id)),
+        ("workout_plan", select(plans)
+            .where(plans.c.user_id == user_id)
+            .order_by(plans.c.id)),
+        ("workout_exercise", select(plan_items)
+            .join(plans, plans.c.id == plan_items.c.workout_plan_id)
+            .where(plans.c.user_id == user_id)
+            .order_by(plan_items.c.workout_plan_id, plan_items.c.order_index, plan_items.c.id)),
+        ("workout_recurrence", select(WorkoutRecurrence.__table__)
+            .where(WorkoutRecurrence.__table__.c.user_id == user_id)
+            .order_by(WorkoutRecurrence.__table__.c.id)),
+        ("scheduled_workout", select(ScheduledWorkout.__table__)
+            .where(ScheduledWorkout.__table__.c.user_id == user_id)
+            .order_by(ScheduledWorkout.__table__.c.scheduled_date, ScheduledWorkout.__table__.c.id)),
+    ]
+
+
+async def iter_account_export(user_id: int) -> AsyncIterator[bytes]:
+    """
+    NDJSON lines for everything the user owns: the profile first, then
+    exercises, workout plans, plan exercises, recurrences and scheduled workouts.
+
+    Uses its own session (the request's is closed once streaming starts) and
+    server-side cursors, so memory doesn't grow with the account's history.
+    """
+    async with AsyncSessionLocal() as db:
+        users = User.__table__
+        profile = (await db.execute(select(users).where(users.c.id == user_id))).mappings().first()
+        if profile is None:
+            return
+        yield _line("user", {
+            key: value for key, value in profile.items() if key not in USER_EXCLUDED_COLUMNS
+        })
+
+        for record_type, query in _export_queries(user_id):
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for row in result.mappings():
+                yield _line(record_type, row)
+
+
+async def stream_account_export(user_id: int, compress: bool = False) -> AsyncIterator[bytes]:
+    """Batch export lines into chunks, gzip-compressing them incrementally if asked"""
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    buffer = bytearray()
+
+    async for line in iter_account_export(user_id):
+        buffer += line
+        if len(buffer) >= EXPORT_CHUNK_BYTES:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
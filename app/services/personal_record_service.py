@@ -0,0 +1,279 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.workout_exercise import WorkoutExercise
+from app.models.scheduled_workout import ScheduledWorkout, ScheduledWorkoutSet
+from app.models.sync import SyncCounter, SyncTombstone
+from app.core.cache import get_personal_record_cache
+from app.services.change_tracking import user_scope
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Rep-range PR buckets: (min, max) repetitions, None = open-ended
+REP_RANGES = ((1, 1), (2, 3), (4, 6), (7, 10), (11, 15), (16, None))
+_REP_RANGE_STARTS = tuple(float(low) for low, _ in REP_RANGES)
+
+# Brzycki's formula diverges as repetitions approach 37
+BRZYCKI_MAX_REPETITIONS = 36
+
+
+class _UserRecords:
+    """
+    A user's cached records, valid as of `version`: the user's change
+    sequence (sync_counters) when they were computed. Also keeps which
+    exercises each completed workout contributed, so a workout that changes
+    later tells which records to recompute.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.records: dict = {}
+        self.workout_exercises: Dict[int, set] = {}
+
+
+def snapshot_workout_sets(db: Session, scheduled_workout_id: int, workout_plan_id: int) -> None:
+    """
+    Record what completing the scheduled workout performed: its plan's
+    exercise rows as they are now. Doesn't commit.
+    """
+    clear_workout_sets(db, scheduled_workout_id)
+    db.execute(insert(ScheduledWorkoutSet).from_select(
+        ["scheduled_workout_id", "exercise_id", "sets", "repetitions", "weight"],
+        select(
+            literal(scheduled_workout_id),
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.sets,
+            WorkoutExercise.repetitions,
+            WorkoutExercise.weight
+        ).where(WorkoutExercise.workout_plan_id == workout_plan_id)
+    ))
+
+
+def clear_workout_sets(db: Session, scheduled_workout_id: int) -> None:
+    """Drop a scheduled workout's set snapshot (once it no longer counts)"""
+    db.execute(delete(ScheduledWorkoutSet).where(ScheduledWorkoutSet.scheduled_workout_id == scheduled_workout_id))
+
+
+def _group_best(groups: "np.ndarray", values: "np.ndarray", days: "np.ndarray") -> "np.ndarray":
+    """
+    Row index of the highest value in each group, earliest day on ties.
+    Groups come back in ascending order.
+    """
+    import numpy as np
+
+    order = np.lexsort((-days, values, groups))
+    sorted_groups = groups[order]
+    last_in_group = np.ones(len(order), dtype=bool)
+    last_in_group[:-1] = sorted_groups[1:] != sorted_groups[:-1]
+    return order[last_in_group]
+
+
+def compute_personal_records(
+    db: Session,
+    user_id: int,
+    exercise_ids: Optional[Iterable[int]] = None
+) -> dict:
+    """
+    Compute personal records from the user's completed scheduled workouts
+    (the set snapshot each one took of its plan when it was completed).
+
+    One query, then NumPy over the whole history: no per-set Python loop.
+    Limit to `exercise_ids` to recompute only some exercises.
+    Returns {exercise_id: record dict}.
+    """
+    query = (
+        select(
+            ScheduledWorkoutSet.exercise_id,
+            ScheduledWorkout.scheduled_date,
+            ScheduledWorkoutSet.repetitions,
+            ScheduledWorkoutSet.weight,
+            ScheduledWorkoutSet.sets
+        )
+        .join(ScheduledWorkout, ScheduledWorkout.id == ScheduledWorkoutSet.scheduled_workout_id)
+        .where(
+            ScheduledWorkout.user_id == user_id,
+            ScheduledWorkout.status == "completed",
+            ScheduledWorkoutSet.weight > 0,
+            ScheduledWorkoutSet.repetitions > 0
+        )
+    )
+    if exercise_ids is not None:
+        exercise_ids = list(exercise_ids)
+        if not exercise_ids:
+            return {}
+        query = query.where(ScheduledWorkoutSet.exercise_id.in_(exercise_ids))
+
+    rows = db.execute(query).all()
+    if not rows:
+        return {}
+
+    # Imported on first use: numpy is the slowest import on the app's startup path
+    import numpy as np
+
+    exercise_col, day_col, reps_col, weight_col, sets_col = zip(*rows)
+    exercise = np.array(exercise_col, dtype=np.int64)
+    days = np.array(day_col, dtype="datetime64[D]").astype(np.int64)
+    reps = np.array(reps_col, dtype=np.float64)
+    weight = np.array(weight_col, dtype=np.float64)
+    sets = np.array(sets_col, dtype=np.float64)
+
+    # Estimated 1RM per row; a true single is its own 1RM
+    epley = np.where(reps == 1, weight, weight * (1.0 + reps / 30.0))
+    with np.errstate(divide="ignore"):
+        brzycki = np.where(
+            reps <= BRZYCKI_MAX_REPETITIONS, weight * 36.0 / (37.0 - reps), -np.inf
+        )
+
+    best_epley = _group_best(exercise, epley, days)
+    best_brzycki = _group_best(exercise, brzycki, days)
+    heaviest = _group_best(exercise, weight, days)
+    best_set = _group_best(exercise, weight * reps, days)
+
+    # Same ascending exercise order as the _group_best results
+    exercise_values, position = np.unique(exercise, return_inverse=True)
+    total_sets = np.bincount(position, weights=sets)
+
+    bucket = np.searchsorted(_REP_RANGE_STARTS, reps, side="right") - 1
+    range_keys = position * len(REP_RANGES) + bucket
+    best_in_range = _group_best(range_keys, weight, days)
+
+    records = {}
+    for index, exercise_id in enumerate(exercise_values.tolist()):
+        e, b, h, s = (int(best_epley[index]), int(best_brzycki[index]),
+                      int(heaviest[index]), int(best_set[index]))
+        records[exercise_id] = {
+            "exercise_id": exercise_id,
+            "estimated_one_rep_max": round(float(epley[e]), 2),
+            "estimated_one_rep_max_brzycki": (
+                round(float(brzycki[b]), 2) if np.isfinite(brzycki[b]) else None
+            ),
+            "estimated_on": day_col[e],
+            "heaviest_weight": round(float(weight[h]), 2),
+            "heaviest_weight_on": day_col[h],
+            "best_set": {
+                "weight": round(float(weight[s]), 2),
+                "repetitions": int(reps[s]),
+                "achieved_on": day_col[s],
+            },
+            "rep_ranges": [],
+            "total_sets": int(total_sets[index]),
+        }
+
+    for row in best_in_range.tolist():
+        low, high = REP_RANGES[int(bucket[row])]
+        records[int(exercise[row])]["rep_ranges"].append({
+            "min_repetitions": low,
+            "max_repetitions": high,
+            "weight": round(float(weight[row]), 2),
+            "repetitions": int(reps[row]),
+            "achieved_on": day_col[row],
+        })
+
+    return records
+
+
+def _history_version(db: Session, user_id: int) -> int:
+    """The user's current change sequence: it moves with every write to their data"""
+    return db.scalar(select(SyncCounter.value).where(SyncCounter.scope == user_scope(user_id))) or 0
+
+
+def _completed_workout_exercises(
+    db: Session,
+    user_id: int,
+    scheduled_workout_ids: Optional[Iterable[int]] = None
+) -> Dict[int, set]:
+    """Exercises in each completed workout's set snapshot: {scheduled_workout_id: exercise ids}"""
+    query = (
+        select(ScheduledWorkoutSet.scheduled_workout_id, ScheduledWorkoutSet.exercise_id)
+        .join(ScheduledWorkout, ScheduledWorkout.id == ScheduledWorkoutSet.scheduled_workout_id)
+        .where(ScheduledWorkout.user_id == user_id, ScheduledWorkout.status == "completed")
+    )
+    if scheduled_workout_ids is not None:
+        query = query.where(ScheduledWorkout.id.in_(scheduled_workout_ids))
+
+    workout_exercises: Dict[int, set] = {}
+    for scheduled_workout_id, exercise_id in db.execute(query):
+        workout_exercises.setdefault(scheduled_workout_id, set()).add(exercise_id)
+    return workout_exercises
+
+
+def _refresh(db: Session, user_id: int, entry: _UserRecords, version: int) -> _UserRecords:
+    """
+    Cached records brought from entry.version up to `version`: only the
+    exercises of scheduled workouts changed or deleted since, and of deleted
+    exercises, are recomputed. Returns a new entry; `entry` may be in use
+    by other requests.
+    """
+    changed = set(db.scalars(
+        select(ScheduledWorkout.id).where(
+            ScheduledWorkout.user_id == user_id,
+            ScheduledWorkout.change_seq > entry.version
+        )
+    ))
+    touched = set()
+    for entity_type, entity_id in db.execute(
+        select(SyncTombstone.entity_type, SyncTombstone.entity_id).where(
+            SyncTombstone.scope == user_scope(user_id),
+            SyncTombstone.change_seq > entry.version,
+            SyncTombstone.entity_type.in_(("scheduled_workout", "exercise"))
+        )
+    ):
+        if entity_type == "scheduled_workout":
+            changed.add(entity_id)
+        else:
+            touched.add(entity_id)
+
+    refreshed = _UserRecords(version)
+    refreshed.records = entry.records
+    refreshed.workout_exercises = dict(entry.workout_exercises)
+
+    # What the changed workouts contributed before, and what they contribute now
+    for scheduled_workout_id in changed:
+        touched |= refreshed.workout_exercises.pop(scheduled_workout_id, set())
+    if changed:
+        current = _completed_workout_exercises(db, user_id, changed)
+        for exercise_ids in current.values():
+            touched |= exercise_ids
+        refreshed.workout_exercises.update(current)
+
+    if touched:
+        refreshed.records = {
+            exercise_id: record for exercise_id, record in entry.records.items()
+            if exercise_id not in touched
+        }
+        refreshed.records.update(compute_personal_records(db, user_id, touched))
+    return refreshed
+
+
+def get_personal_records(db: Session, user_id: int) -> List[dict]:
+    """
+    Get the user's personal records, ordered by exercise ID.
+
+    Cached per user with the change sequence they were computed at. Each
+    read compares it with the database's: if the user's data changed since
+    (in any process), only the exercises of workouts that changed are
+    recomputed and merged in; everything else is served from the cache.
+    """
+    # Read before computing, so writes committed meanwhile show up next time
+    version = _history_version(db, user_id)
+    entry = get_personal_record_cache().get(user_id)
+
+    if entry is None:
+        entry = _UserRecords(version)
+        entry.records = compute_personal_records(db, user_id)
+        entry.workout_exercises = _completed_workout_exercises(db, user_id)
+        get_personal_record_cache().set(user_id, entry)
+    elif entry.version != version:
+        entry = _refresh(db, user_id, entry, version)
+        get_personal_record_cache().set(user_id, entry)
+
+    return [entry.records[exercise_id] for exercise_id in sorted(entry.records)]
+
+
+# --- Async variants ---
+
+async def get_personal_records_async(db: AsyncSession, user_id: int) -> List[dict]:
+    """Async version of get_personal_records"""
+    return await db.run_sync(get_personal_records, user_id)
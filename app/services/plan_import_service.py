@@ -0,0 +1,245 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Union
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.exercise import Exercise
+from app.models.workout_plan import WorkoutPlan
+from app.models.workout_exercise import WorkoutExercise
+from app.schemas.workout_plan import WorkoutPlanCreate, WorkoutPlanImportError
+from app.services.workout_service import bump_plan_version
+from app.services.change_tracking import allocate_change_seq, user_scope
+
+# Plans validated and written per transaction
+IMPORT_CHUNK_SIZE = 500
+
+CSV_EXERCISE_FIELDS = ("exercise_id", "sets", "repetitions", "weight", "order_index", "notes")
+
+# A parsed record: (row_number, plan_dict) or (row_number, error_message)
+ParsedRecord = tuple[int, Union[dict, str]]
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_jsonl_records(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRecord]:
+    """One plan per line, in the same shape as the single-plan POST body"""
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield row, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield row, "Each line must be a JSON object"
+            continue
+        yield row, record
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRecord]:
+    """
+    One exercise per CSV row; consecutive rows with the same plan_name form a plan.
+    Columns: plan_name, plan_description, exercise_id, sets, repetitions,
+    weight, order_index, notes. Leave exercise_id empty for a plan without
+    exercises. Quoted fields can't span lines.
+    """
+    header: Optional[List[str]] = None
+    plan: Optional[dict] = None
+    plan_row = 0
+    row = 0
+
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            if "plan_name" not in header:
+                yield row, "CSV header must include plan_name"
+                return
+            continue
+
+        fields = dict(zip(header, values))
+        name = fields.get("plan_name", "").strip()
+        if plan is None or name != plan["name"]:
+            if plan is not None:
+                yield plan_row, plan
+            plan = {"name": name, "description": fields.get("plan_description") or None, "exercise": []}
+            plan_row = row
+
+        if fields.get("exercise_id"):
+            plan["exercise"].append({
+                field: (fields.get(field) or None) for field in CSV_EXERCISE_FIELDS
+            })
+
+    if plan is not None:
+        yield plan_row, plan
+
+
+def _write_plans(db: Session, user_id: int, plans: List[tuple[int, WorkoutPlanCreate]]) -> None:
+    """Insert plans and their exercises with two bulk INSERTs and commit"""
+    # Bulk INSERTs skip the ORM flush, so take delta sync positions explicitly
+    row_count = len(plans) + sum(len(plan.exercise) for _, plan in plans)
+    first_seq = allocate_change_seq(db.connection(), user_scope(user_id), row_count)
+
+    plan_ids = db.execute(
+        insert(WorkoutPlan).returning(WorkoutPlan.id, sort_by_parameter_order=True),
+        [
+            {"user_id": user_id, "name": plan.name, "description": plan.description, "change_seq": first_seq + i}
+            for i, (_, plan) in enumerate(plans)
+        ]
+    ).scalars().all()
+
+    exercise_rows = [
+        {"workout_plan_id": plan_id, "user_id": user_id, **item.model_dump()}
+        for plan_id, (_, plan) in zip(plan_ids, plans)
+        for item in plan.exercise
+    ]
+    for i, exercise_row in enumerate(exercise_rows, start=first_seq + len(plans)):
+        exercise_row["change_seq"] = i
+    if exercise_rows:
+        db.execute(insert(WorkoutExercise), exercise_rows)
+
+    db.commit()
+
+
+def _write_or_bisect(
+    db: Session,
+    user_id: int,
+    plans: List[tuple[int, WorkoutPlanCreate]],
+    errors: List[WorkoutPlanImportError]
+) -> int:
+    """
+    Write plans in one transaction. If the database rejects it, retry each
+    half on its own, down to single plans, so only the offending rows fail.
+    Returns the number of plans written
+    """
+    try:
+        _write_plans(db, user_id, plans)
+        return len(plans)
+    except SQLAlchemyError as exc:
+        db.rollback()
+        if len(plans) == 1:
+            reason = getattr(exc, "orig", None) or exc
+            errors.append(WorkoutPlanImportError(
+                row=plans[0][0],
+                error=f"Rejected by the database: {reason.__class__.__name__}: {reason}"
+            ))
+            return 0
+
+    middle = len(plans) // 2
+    return (
+        _write_or_bisect(db, user_id, plans[:middle], errors)
+        + _write_or_bisect(db, user_id, plans[middle:], errors)
+    )
+
+
+def insert_plan_chunk(
+    db: Session,
+    user_id: int,
+    plans: List[tuple[int, WorkoutPlanCreate]]
+) -> tuple[int, List[WorkoutPlanImportError]]:
+    """
+    Write a chunk of validated plans in one transaction with two bulk INSERTs.
+    Plans referencing exercises the user can't see are rejected individually.
+    If the database rejects the chunk, it is split and retried until only
+    the offending plans are left, each reported with its own error.
+    Returns tuple of (inserted_count, errors)
+    """
+    errors: List[WorkoutPlanImportError] = []
+
+    exercise_ids = {item.exercise_id for _, plan in plans for item in plan.exercise}
+    visible_ids = set()
+    if exercise_ids:
+        visible_ids = set(db.execute(
+            select(Exercise.id).where(
+                Exercise.id.in_(exercise_ids),
+                or_(Exercise.created_by == user_id, Exercise.is_public == True)
+            )
+        ).scalars())
+
+    accepted = []
+    for row, plan in plans:
+        missing = sorted({item.exercise_id for item in plan.exercise} - visible_ids)
+        if missing:
+            errors.append(WorkoutPlanImportError(
+                row=row,
+                error=f"Unknown exercise ids: {', '.join(map(str, missing))}"
+            ))
+        else:
+            accepted.append((row, plan))
+
+    if not accepted:
+        return 0, errors
+
+    inserted = _write_or_bisect(db, user_id, accepted, errors)
+    if inserted:
+        bump_plan_version(user_id)
+    return inserted, errors
+
+
+async def import_workout_plans_async(
+    db: AsyncSession,
+    user_id: int,
+    records: AsyncIterator[ParsedRecord],
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> tuple[int, List[WorkoutPlanImportError]]:
+    """
+    Validate streamed plan records and insert them chunk by chunk.
+    Returns tuple of (imported_count, errors)
+    """
+    errors: List[WorkoutPlanImportError] = []
+    imported = 0
+    chunk: List[tuple[int, WorkoutPlanCreate]] = []
+
+    async def flush(batch: List[tuple[int, WorkoutPlanCreate]]) -> int:
+        inserted, chunk_errors = await db.run_sync(insert_plan_chunk, user_id, batch)
+        errors.extend(chunk_errors)
+        return inserted
+
+    async for row, record in records:
+        if isinstance(record, str):
+            errors.append(WorkoutPlanImportError(row=row, error=record))
+            continue
+        try:
+            chunk.append((row, WorkoutPlanCreate.model_validate(record)))
+        except ValidationError as exc:
+            errors.append(WorkoutPlanImportError(row=row, error=_format_validation_error(exc)))
+            continue
+
+        if len(chunk) >= chunk_size:
+            imported += await flush(chunk)
+            chunk = []
+
+    if chunk:
+        imported += await flush(chunk)
+
+    errors.sort(key=lambda error: error.row)
+    return imported, errors
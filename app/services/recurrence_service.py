@@ -0,0 +1,369 @@
+from datetime import date, time, timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterator, Optional, List
+from app.models.scheduled_workout import ScheduledWorkout
+from app.models.workout_recurrence import WorkoutRecurrence
+from app.schemas.scheduled_workout import (
+    ScheduledWorkoutUpdate,
+    ScheduledWorkoutComplete,
+    WorkoutRecurrenceCreate,
+    WorkoutRecurrenceUpdate
+)
+from app.services.schedule_service import (
+    get_scheduled_workouts,
+    update_scheduled_workout,
+    complete_scheduled_workout
+)
+
+RECURRENCE_FREQUENCIES = ("daily", "weekly")
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+# --- Expansion ---
+
+def _rule_weekdays(recurrence: WorkoutRecurrence) -> List[int]:
+    if recurrence.weekdays:
+        return sorted(WEEKDAY_CODES.index(code) for code in recurrence.weekdays.split(","))
+    return [recurrence.start_date.weekday()]
+
+
+def iter_occurrences(
+    recurrence: WorkoutRecurrence,
+    window_start: date,
+    window_end: date
+) -> Iterator[date]:
+    """
+    Yield the rule's occurrence dates within [window_start, window_end], in order.
+
+    Open-ended and until-bounded rules skip straight to the window; count-bounded
+    rules are walked from start_date (at most `count` occurrences) so the count
+    is applied to the whole series, not just the window.
+    """
+    last = window_end if recurrence.until is None else min(window_end, recurrence.until)
+    first = recurrence.start_date if recurrence.count is not None else max(window_start, recurrence.start_date)
+    emitted = 0
+
+    if recurrence.frequency == "daily":
+        step = recurrence.interval
+        periods = -(-(first - recurrence.start_date).days // step)  # Round up to the next occurrence
+        day = recurrence.start_date + timedelta(days=periods * step)
+        while day <= last:
+            if recurrence.count is not None:
+                if emitted >= recurrence.count:
+                    return
+                emitted += 1
+            if day >= window_start:
+                yield day
+            day += timedelta(days=step)
+        return
+
+    weekdays = _rule_weekdays(recurrence)
+    series_monday = recurrence.start_date - timedelta(days=recurrence.start_date.weekday())
+    weeks = (first - series_monday).days // 7
+    week = series_monday + timedelta(weeks=weeks - weeks % recurrence.interval)
+    while week <= last:
+        for weekday in weekdays:
+            day = week + timedelta(days=weekday)
+            if day < recurrence.start_date:
+                continue
+            if day > last:
+                return
+            if recurrence.count is not None:
+                if emitted >= recurrence.count:
+                    return
+                emitted += 1
+            if day >= window_start:
+                yield day
+        week += timedelta(weeks=recurrence.interval)
+
+
+def is_occurrence(recurrence: WorkoutRecurrence, day: date) -> bool:
+    """Whether the rule generates `day`"""
+    return next(iter_occurrences(recurrence, day, day), None) == day
+
+
+def _occurrence_fields(recurrence: WorkoutRecurrence, day: date) -> dict:
+    return {
+        "user_id": recurrence.user_id,
+        "workout_plan_id": recurrence.workout_plan_id,
+        "scheduled_date": day,
+        "scheduled_time": recurrence.scheduled_time,
+        "status": "scheduled",
+        "notes": recurrence.notes,
+        "recurrence_id": recurrence.id,
+        "occurrence_date": day,
+    }
+
+
+def _virtual_occurrence(recurrence: WorkoutRecurrence, day: date) -> ScheduledWorkout:
+    """Unsaved ScheduledWorkout standing in for an occurrence without a row"""
+    return ScheduledWorkout(**_occurrence_fields(recurrence, day), created_at=recurrence.created_at)
+
+
+def _calendar_sort_key(scheduled: ScheduledWorkout) -> tuple:
+    return (
+        scheduled.scheduled_date,
+        scheduled.scheduled_time is not None,
+        scheduled.scheduled_time or time.min,
+        scheduled.id or 0
+    )
+
+
+def get_calendar(
+    db: Session,
+    current_user_id: int,
+    date_from: date,
+    date_to: date,
+    status: Optional[str] = None
+) -> List[ScheduledWorkout]:
+    """
+    Get the user's scheduled workouts between two dates (inclusive): stored rows
+    plus occurrences of their recurrences expanded for the window only.
+    Occurrences that already have a row (completed, cancelled or moved)
+    are represented by that row.
+    """
+    scheduled = get_scheduled_workouts(db, current_user_id, date_from, date_to, status)
+    if status not in (None, "scheduled"):
+        return scheduled
+
+    recurrences = db.query(WorkoutRecurrence).filter(
+        WorkoutRecurrence.user_id == current_user_id,
+        WorkoutRecurrence.start_date <= date_to,
+        or_(WorkoutRecurrence.until.is_(None), WorkoutRecurrence.until >= date_from)
+    ).all()
+    if not recurrences:
+        return scheduled
+
+    materialized = {
+        (recurrence_id, occurrence_date)
+        for recurrence_id, occurrence_date in db.query(
+            ScheduledWorkout.recurrence_id, ScheduledWorkout.occurrence_date
+        ).filter(
+            ScheduledWorkout.recurrence_id.in_([recurrence.id for recurrence in recurrences]),
+            ScheduledWorkout.occurrence_date >= date_from,
+            ScheduledWorkout.occurrence_date <= date_to
+        )
+    }
+
+    virtual = [
+        _virtual_occurrence(recurrence, day)
+        for recurrence in recurrences
+        for day in iter_occurrences(recurrence, date_from, date_to)
+        if (recurrence.id, day) not in materialized
+    ]
+    return sorted(scheduled + virtual, key=_calendar_sort_key)
+
+
+# --- Recurrence CRUD ---
+
+def get_recurrence(db: Session, recurrence_id: int, user_id: int) -> Optional[WorkoutRecurrence]:
+    """Get a recurrence (only if user owns it)"""
+    return db.query(WorkoutRecurrence).filter(
+        WorkoutRecurrence.id == recurrence_id,
+        WorkoutRecurrence.user_id == user_id
+    ).first()
+
+
+def get_recurrences(db: Session, user_id: int) -> List[WorkoutRecurrence]:
+    """Get all of the user's recurrences, oldest first"""
+    return db.query(WorkoutRecurrence).filter(
+        WorkoutRecurrence.user_id == user_id
+    ).order_by(WorkoutRecurrence.start_date, WorkoutRecurrence.id).all()
+
+
+def create_recurrence(
+    db: Session,
+    recurrence: WorkoutRecurrenceCreate,
+    user_id: int
+) -> WorkoutRecurrence:
+    """Store a recurring schedule (a single row, whatever its length)"""
+    data = recurrence.model_dump()
+    data["weekdays"] = ",".join(code for code in WEEKDAY_CODES if code in data["weekdays"]) or None
+    db_recurrence = WorkoutRecurrence(**data, user_id=user_id)
+    db.add(db_recurrence)
+    db.commit()
+    db.refresh(db_recurrence)
+    return db_recurrence
+
+
+def update_recurrence(
+    db: Session,
+    recurrence_id: int,
+    recurrence_update: WorkoutRecurrenceUpdate,
+    user_id: int
+) -> Optional[WorkoutRecurrence]:
+    """Change a recurrence's end, time or notes (only if user owns it)"""
+    db_recurrence = get_recurrence(db, recurrence_id, user_id)
+
+    if not db_recurrence:
+        return None
+
+    update_data = recurrence_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_recurrence, field, value)
+
+    db.commit()
+    db.refresh(db_recurrence)
+    return db_recurrence
+
+
+def delete_recurrence(db: Session, recurrence_id: int, user_id: int) -> bool:
+    """
+    Delete a recurrence (only if user owns it) along with its pending exceptions.
+    Completed occurrences stay in the history, detached from the rule.
+    """
+    db_recurrence = get_recurrence(db, recurrence_id, user_id)
+
+    if not db_recurrence:
+        return False
+
+    # Row by row rather than bulk, so delta sync sees the changes and deletions
+    occurrences = db.query(ScheduledWorkout).filter(ScheduledWorkout.recurrence_id == recurrence_id).all()
+    for occurrence in occurrences:
+        if occurrence.status == "completed":
+            occurrence.recurrence_id = None
+        else:
+            db.delete(occurrence)
+
+    db.delete(db_recurrence)
+    db.commit()
+    return True
+
+
+# --- Occurrence exceptions ---
+
+def _materialize_occurrence(
+    db: Session,
+    recurrence_id: int,
+    occurrence_date: date,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """
+    Get the row for an occurrence, creating (flushing, not committing) it on first
+    change. Returns None if the recurrence isn't the user's or doesn't generate the date.
+    """
+    existing = db.query(ScheduledWorkout).filter(
+        ScheduledWorkout.recurrence_id == recurrence_id,
+        ScheduledWorkout.occurrence_date == occurrence_date,
+        ScheduledWorkout.user_id == user_id
+    ).first()
+    if existing:
+        return existing
+
+    recurrence = get_recurrence(db, recurrence_id, user_id)
+    if not recurrence or not is_occurrence(recurrence, occurrence_date):
+        return None
+
+    db_scheduled = ScheduledWorkout(**_occurrence_fields(recurrence, occurrence_date))
+    db.add(db_scheduled)
+    db.flush()
+    return db_scheduled
+
+
+def update_occurrence(
+    db: Session,
+    recurrence_id: int,
+    occurrence_date: date,
+    scheduled_update: ScheduledWorkoutUpdate,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Reschedule, cancel or annotate one occurrence of a recurrence"""
+    db_scheduled = _materialize_occurrence(db, recurrence_id, occurrence_date, user_id)
+    if not db_scheduled:
+        return None
+    return update_scheduled_workout(db, db_scheduled.id, scheduled_update, user_id)
+
+
+def complete_occurrence(
+    db: Session,
+    recurrence_id: int,
+    occurrence_date: date,
+    complete_data: ScheduledWorkoutComplete,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Mark one occurrence of a recurrence as completed"""
+    db_scheduled = _materialize_occurrence(db, recurrence_id, occurrence_date, user_id)
+    if not db_scheduled:
+        return None
+    return complete_scheduled_workout(db, db_scheduled.id, complete_data, user_id)
+
+
+# --- Async variants ---
+# These run the functions above through AsyncSession.run_sync, so the same
+# queries go through the async driver without blocking the event loop.
+
+async def get_calendar_async(
+    db: AsyncSession,
+    current_user_id: int,
+    date_from: date,
+    date_to: date,
+    status: Optional[str] = None
+) -> List[ScheduledWorkout]:
+    """Async version of get_calendar"""
+    return await db.run_sync(get_calendar, current_user_id, date_from, date_to, status)
+
+
+async def get_recurrence_async(
+    db: AsyncSession,
+    recurrence_id: int,
+    user_id: int
+) -> Optional[WorkoutRecurrence]:
+    """Async version of get_recurrence"""
+    return await db.run_sync(get_recurrence, recurrence_id, user_id)
+
+
+async def get_recurrences_async(db: AsyncSession, user_id: int) -> List[WorkoutRecurrence]:
+    """Async version of get_recurrences"""
+    return await db.run_sync(get_recurrences, user_id)
+
+
+async def create_recurrence_async(
+    db: AsyncSession,
+    recurrence: WorkoutRecurrenceCreate,
+    user_id: int
+) -> WorkoutRecurrence:
+    """Async version of create_recurrence"""
+    return await db.run_sync(create_recurrence, recurrence, user_id)
+
+
+async def update_recurrence_async(
+    db: AsyncSession,
+    recurrence_id: int,
+    recurrence_update: WorkoutRecurrenceUpdate,
+    user_id: int
+) -> Optional[WorkoutRecurrence]:
+    """Async version of update_recurrence"""
+    return await db.run_sync(update_recurrence, recurrence_id, recurrence_update, user_id)
+
+
+async def delete_recurrence_async(db: AsyncSession, recurrence_id: int, user_id: int) -> bool:
+    """Async version of delete_recurrence"""
+    return await db.run_sync(delete_recurrence, recurrence_id, user_id)
+
+
+async def update_occurrence_async(
+    db: AsyncSession,
+    recurrence_id: int,
+    occurrence_date: date,
+    scheduled_update: ScheduledWorkoutUpdate,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Async version of update_occurrence"""
+    return await db.run_sync(
+        update_occurrence, recurrence_id, occurrence_date, scheduled_update, user_id
+    )
+
+
+async def complete_occurrence_async(
+    db: AsyncSession,
+    recurrence_id: int,
+    occurrence_date: date,
+    complete_data: ScheduledWorkoutComplete,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Async version of complete_occurrence"""
+    return await db.run_sync(
+        complete_occurrence, recurrence_id, occurrence_date, complete_data, user_id
+    )
@@ -0,0 +1,213 @@
+from datetime import date, datetime, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from app.models.scheduled_workout import ScheduledWorkout
+from app.schemas.scheduled_workout import (
+    ScheduledWorkoutCreate,
+    ScheduledWorkoutUpdate,
+    ScheduledWorkoutComplete
+)
+from app.services.analytics_service import apply_workout_volume, clear_workout_volume, snapshot_workout_volume
+from app.services.personal_record_service import clear_workout_sets, snapshot_workout_sets
+
+SCHEDULE_STATUSES = ("scheduled", "completed", "cancelled")
+
+
+def get_scheduled_workout_by_id(db: Session, scheduled_id: int) -> Optional[ScheduledWorkout]:
+    """Get a single scheduled workout by ID"""
+    return db.query(ScheduledWorkout).filter(ScheduledWorkout.id == scheduled_id).first()
+
+
+def get_scheduled_workouts(
+    db: Session,
+    current_user_id: int,
+    date_from: date,
+    date_to: date,
+    status: Optional[str] = None
+) -> List[ScheduledWorkout]:
+    """
+    Get the user's scheduled workouts between two dates (inclusive),
+    ordered by date and time. Served by the (user_id, scheduled_date) index.
+    """
+    query = db.query(ScheduledWorkout).filter(
+        ScheduledWorkout.user_id == current_user_id,
+        ScheduledWorkout.scheduled_date >= date_from,
+        ScheduledWorkout.scheduled_date <= date_to
+    )
+
+    if status:
+        query = query.filter(ScheduledWorkout.status == status)
+
+    return query.order_by(
+        ScheduledWorkout.scheduled_date,
+        ScheduledWorkout.scheduled_time,
+        ScheduledWorkout.id
+    ).all()
+
+
+def create_scheduled_workout(
+    db: Session,
+    scheduled: ScheduledWorkoutCreate,
+    user_id: int
+) -> ScheduledWorkout:
+    """Schedule a workout plan on a date"""
+    db_scheduled = ScheduledWorkout(**scheduled.model_dump(), user_id=user_id)
+    db.add(db_scheduled)
+    db.commit()
+    db.refresh(db_scheduled)
+    return db_scheduled
+
+
+def _get_owned_scheduled_workout(
+    db: Session,
+    scheduled_id: int,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    return db.query(ScheduledWorkout).filter(
+        ScheduledWorkout.id == scheduled_id,
+        ScheduledWorkout.user_id == user_id
+    ).first()
+
+
+def update_scheduled_workout(
+    db: Session,
+    scheduled_id: int,
+    scheduled_update: ScheduledWorkoutUpdate,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Update a scheduled workout (only if user owns it)"""
+    db_scheduled = _get_owned_scheduled_workout(db, scheduled_id, user_id)
+
+    if not db_scheduled:
+        return None
+
+    was_completed = db_scheduled.status == "completed"
+    old_date = db_scheduled.scheduled_date
+
+    update_data = scheduled_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_scheduled, field, value)
+
+    # Keep the volume rollup in step with completed workouts. A completed
+    # workout's snapshot is what it added, so it's also what comes off.
+    is_completed = db_scheduled.status == "completed"
+    if was_completed != is_completed or (is_completed and db_scheduled.scheduled_date != old_date):
+        if was_completed:
+            apply_workout_volume(db, user_id, db_scheduled.id, old_date, sign=-1)
+        if is_completed:
+            if not was_completed:
+                snapshot_workout_volume(db, db_scheduled.id, db_scheduled.workout_plan_id)
+                snapshot_workout_sets(db, db_scheduled.id, db_scheduled.workout_plan_id)
+                if db_scheduled.completed_at is None:
+                    db_scheduled.completed_at = datetime.now(timezone.utc)
+            apply_workout_volume(db, user_id, db_scheduled.id, db_scheduled.scheduled_date)
+        else:
+            clear_workout_volume(db, db_scheduled.id)
+            clear_workout_sets(db, db_scheduled.id)
+            db_scheduled.completed_at = None
+
+    db.commit()
+    db.refresh(db_scheduled)
+    return db_scheduled
+
+
+def complete_scheduled_workout(
+    db: Session,
+    scheduled_id: int,
+    complete_data: ScheduledWorkoutComplete,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Mark a scheduled workout as completed (only if user owns it) and add its volume to the weekly rollup"""
+    db_scheduled = _get_owned_scheduled_workout(db, scheduled_id, user_id)
+
+    if not db_scheduled:
+        return None
+
+    if db_scheduled.status != "completed":
+        snapshot_workout_volume(db, db_scheduled.id, db_scheduled.workout_plan_id)
+        snapshot_workout_sets(db, db_scheduled.id, db_scheduled.workout_plan_id)
+        apply_workout_volume(db, user_id, db_scheduled.id, db_scheduled.scheduled_date)
+
+    db_scheduled.status = "completed"
+    db_scheduled.completed_at = datetime.now(timezone.utc)
+    if complete_data.notes is not None:
+        db_scheduled.notes = complete_data.notes
+
+    db.commit()
+    db.refresh(db_scheduled)
+    return db_scheduled
+
+
+def delete_scheduled_workout(db: Session, scheduled_id: int, user_id: int) -> bool:
+    """Delete a scheduled workout (only if user owns it)"""
+    db_scheduled = _get_owned_scheduled_workout(db, scheduled_id, user_id)
+
+    if not db_scheduled:
+        return False
+
+    if db_scheduled.status == "completed":
+        apply_workout_volume(db, user_id, db_scheduled.id, db_scheduled.scheduled_date, sign=-1)
+        clear_workout_volume(db, db_scheduled.id)
+        clear_workout_sets(db, db_scheduled.id)
+
+    db.delete(db_scheduled)
+    db.commit()
+    return True
+
+
+# --- Async variants ---
+# These run the functions above through AsyncSession.run_sync, so the same
+# queries go through the async driver without blocking the event loop.
+
+async def get_scheduled_workout_by_id_async(
+    db: AsyncSession,
+    scheduled_id: int
+) -> Optional[ScheduledWorkout]:
+    """Async version of get_scheduled_workout_by_id"""
+    return await db.run_sync(get_scheduled_workout_by_id, scheduled_id)
+
+
+async def get_scheduled_workouts_async(
+    db: AsyncSession,
+    current_user_id: int,
+    date_from: date,
+    date_to: date,
+    status: Optional[str] = None
+) -> List[ScheduledWorkout]:
+    """Async version of get_scheduled_workouts"""
+    return await db.run_sync(get_scheduled_workouts, current_user_id, date_from, date_to, status)
+
+
+async def create_scheduled_workout_async(
+    db: AsyncSession,
+    scheduled: ScheduledWorkoutCreate,
+    user_id: int
+) -> ScheduledWorkout:
+    """Async version of create_scheduled_workout"""
+    return await db.run_sync(create_scheduled_workout, scheduled, user_id)
+
+
+async def update_scheduled_workout_async(
+    db: AsyncSession,
+    scheduled_id: int,
+    scheduled_update: ScheduledWorkoutUpdate,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Async version of update_scheduled_workout"""
+    return await db.run_sync(update_scheduled_workout, scheduled_id, scheduled_update, user_id)
+
+
+async def complete_scheduled_workout_async(
+    db: AsyncSession,
+    scheduled_id: int,
+    complete_data: ScheduledWorkoutComplete,
+    user_id: int
+) -> Optional[ScheduledWorkout]:
+    """Async version of complete_scheduled_workout"""
+    return await db.run_sync(complete_scheduled_workout, scheduled_id, complete_data, user_id)
+
+
+async def delete_scheduled_workout_async(db: AsyncSession, scheduled_id: int, user_id: int) -> bool:
+    """Async version of delete_scheduled_workout"""
+    return await db.run_sync(delete_scheduled_workout, scheduled_id, user_id)
@@ -0,0 +1,175 @@
+import base64
+import json
+from typing import Optional
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.exercise import Exercise
+from app.models.workout_plan import WorkoutPlan
+from app.models.workout_exercise import WorkoutExercise
+from app.models.scheduled_workout import ScheduledWorkout
+from app.models.workout_recurrence import WorkoutRecurrence
+from app.models.sync import SyncTombstone
+from app.schemas.scheduled_workout import ScheduledWorkoutResponse, WorkoutRecurrenceResponse
+from app.services.change_tracking import PUBLIC_SCOPE, user_scope
+from app.services.exercise_service import EXERCISE_LIST_COLUMNS
+from app.services.workout_service import PLAN_LIST_COLUMNS, PLAN_EXERCISE_COLUMNS
+
+# Changes returned per entity type and call; clients keep calling while has_more
+SYNC_PAGE_SIZE = 500
+
+SCHEDULED_WORKOUT_COLUMNS = tuple(
+    getattr(ScheduledWorkout, field) for field in ScheduledWorkoutResponse.model_fields
+)
+RECURRENCE_COLUMNS = tuple(
+    getattr(WorkoutRecurrence, field) for field in WorkoutRecurrenceResponse.model_fields
+)
+
+
+class InvalidSyncTokenError(ValueError):
+    """Raised when a sync token cannot be decoded"""
+
+
+# --- Sync tokens ---
+
+def encode_sync_token(user_seq: int, public_seq: int) -> str:
+    raw = json.dumps({"u": user_seq, "p": public_seq}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+    """
+    Decode a token produced by encode_sync_token.
+    Returns tuple of (user_seq, public_seq); both None without a token (full sync)
+    """
+    if not token:
+        return None, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(payload["u"]), int(payload["p"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidSyncTokenError("Malformed sync token") from exc
+
+
+# --- Delta queries ---
+
+def _fetch(db: Session, query, seq_column, after: Optional[int], limit: int) -> list:
+    """Rows changed after a position as dicts (with their position in "sync_seq"), fetching limit + 1"""
+    query = query.add_columns(seq_column.label("sync_seq"))
+    if after is not None:
+        query = query.where(seq_column > after)
+    rows = db.execute(query.order_by(seq_column).limit(limit + 1))
+    return [row._asdict() for row in rows]
+
+
+def _page(changes: dict, after: Optional[int], limit: int) -> tuple[int, bool]:
+    """
+    Trim one sequence's per-type results to a consistent page, in place.
+    Values are unique per table within a sequence, so stopping every type at
+    the lowest truncated position loses nothing.
+    Returns tuple of (next_position, has_more)
+    """
+    truncated = [rows[limit - 1]["sync_seq"] for rows in changes.values() if len(rows) > limit]
+    if truncated:
+        position = min(truncated)
+        for key, rows in changes.items():
+            changes[key] = [row for row in rows if row["sync_seq"] <= position]
+        return position, True
+
+    position = max((rows[-1]["sync_seq"] for rows in changes.values() if rows), default=after)
+    return (position if position is not None else 0), False
+
+
+def get_changes(
+    db: Session,
+    user_id: int,
+    sync_token: Optional[str] = None,
+    limit: int = SYNC_PAGE_SIZE
+) -> dict:
+    """
+    Everything visible to the user that changed since the sync token: their
+    exercises, plans, plan exercises, scheduled workouts and recurrences, other users' public
+    exercises, and tombstones for deletions. Without a token, returns everything.
+
+    Each query is an index range scan on (owner, change_seq).
+    Returns a dict shaped like SyncResponse
+    """
+    user_after, public_after = decode_sync_token(sync_token)
+    scope = user_scope(user_id)
+
+    user_changes = {
+        "exercises": _fetch(
+            db, select(*EXERCISE_LIST_COLUMNS).where(Exercise.created_by == user_id),
+            Exercise.change_seq, user_after, limit
+        ),
+        "workout_plans": _fetch(
+            db, select(*PLAN_LIST_COLUMNS).where(WorkoutPlan.user_id == user_id),
+            WorkoutPlan.change_seq, user_after, limit
+        ),
+        "workout_exercises": _fetch(
+            db, select(*PLAN_EXERCISE_COLUMNS).where(WorkoutExercise.user_id == user_id),
+            WorkoutExercise.change_seq, user_after, limit
+        ),
+        "scheduled_workouts": _fetch(
+            db, select(*SCHEDULED_WORKOUT_COLUMNS).where(ScheduledWorkout.user_id == user_id),
+            ScheduledWorkout.change_seq, user_after, limit
+        ),
+        "workout_recurrences": _fetch(
+            db, select(*RECURRENCE_COLUMNS).where(WorkoutRecurrence.user_id == user_id),
+            WorkoutRecurrence.change_seq, user_after, limit
+        ),
+        "deleted": _fetch(
+            db, select(SyncTombstone.entity_type, SyncTombstone.entity_id)
+            .where(SyncTombstone.scope == scope),
+            SyncTombstone.change_seq, user_after, limit
+        ),
+    }
+    user_position, user_more = _page(user_changes, user_after, limit)
+
+    public_changes = {
+        "exercises": _fetch(
+            db, select(*EXERCISE_LIST_COLUMNS).where(
+                Exercise.is_public == True,
+                or_(Exercise.created_by != user_id, Exercise.created_by.is_(None))
+            ),
+            Exercise.public_change_seq, public_after, limit
+        ),
+        # The owner still has their exercise after it's made private
+        "deleted": _fetch(
+            db, select(SyncTombstone.entity_type, SyncTombstone.entity_id).where(
+                SyncTombstone.scope == PUBLIC_SCOPE,
+                or_(SyncTombstone.owner_id != user_id, SyncTombstone.owner_id.is_(None))
+            ),
+            SyncTombstone.change_seq, public_after, limit
+        ),
+    }
+    public_position, public_more = _page(public_changes, public_after, limit)
+
+    changes = {
+        key: user_changes[key] + public_changes.get(key, []) for key in user_changes
+    }
+    for rows in changes.values():
+        for row in rows:
+            del row["sync_seq"]
+    for row in changes["workout_recurrences"]:
+        # Stored as "MO,WE,FR"
+        row["weekdays"] = row["weekdays"].split(",") if row["weekdays"] else []
+
+    return {
+        **changes,
+        "sync_token": encode_sync_token(user_position, public_position),
+        "has_more": user_more or public_more,
+    }
+
+
+# --- Async variants ---
+
+async def get_changes_async(
+    db: AsyncSession,
+    user_id: int,
+    sync_token: Optional[str] = None,
+    limit: int = SYNC_PAGE_SIZE
+) -> dict:
+    """Async version of get_changes"""
+    return await db.run_sync(get_changes, user_id, sync_token, limit)
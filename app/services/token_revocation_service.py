@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+from app.core.security import REFRESH_TOKEN_EXPIRES_DAYS
+from app.core.token_revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+# Rows re-read below the highest id seen: ids are allocated at insert but
+# committed in any order, so a slower transaction can land just under it
+REFRESH_ID_OVERLAP = 1000
+
+
+def token_lifetime() -> timedelta:
+    """Every token issued before a cutoff has expired once this has passed"""
+    return max(timedelta(days=REFRESH_TOKEN_EXPIRES_DAYS), timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+
+
+def revoke_token(
+    db: Session,
+    jti: str,
+    subject: str,
+    expires_at: datetime,
+    reason: str
+) -> bool:
+    """
+    Revoke one refresh token by jti.
+    Returns False if it was already revoked (e.g. a rotated token presented again).
+    """
+    revoked_at = datetime.now(timezone.utc)
+    db.add(RevokedToken(jti=jti, subject=subject, reason=reason, revoked_at=revoked_at, expires_at=expires_at))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    revocation_list.add(jti, subject, revoked_at, expires_at)
+    return True
+
+
+def add_token_cutoff(db: Session, subject: str, reason: str) -> Tuple[datetime, datetime]:
+    """
+    Add the row revoking every token issued to the subject so far, in the
+    caller's transaction. Doesn't commit: once the caller has, it passes the
+    returned (revoked_at, expires_at) to revocation_list.add.
+    """
+    revoked_at = datetime.now(timezone.utc)
+    expires_at = revoked_at + token_lifetime()
+    db.add(RevokedToken(jti=None, subject=subject, reason=reason, revoked_at=revoked_at, expires_at=expires_at))
+    return revoked_at, expires_at
+
+
+def revoke_all_tokens(db: Session, subject: str, reason: str) -> None:
+    """Revoke every access and refresh token issued to the subject so far"""
+    revoked_at, expires_at = add_token_cutoff(db, subject, reason)
+    db.commit()
+    revocation_list.add(None, subject, revoked_at, expires_at)
+
+
+def refresh_revocations(db: Session) -> int:
+    """
+    Pull revocations made since the last refresh (by any worker) into the
+    in-memory list. Returns the number of rows read.
+    """
+    rows = db.execute(
+        select(
+            RevokedToken.id,
+            RevokedToken.jti,
+            RevokedToken.subject,
+            RevokedToken.revoked_at,
+            RevokedToken.expires_at
+        ).where(
+            RevokedToken.id > revocation_list.last_id - REFRESH_ID_OVERLAP,
+            RevokedToken.expires_at > datetime.now(timezone.utc)
+        ).order_by(RevokedToken.id)
+    )
+    return revocation_list.apply(rows)
+
+
+def purge_expired_revocations(db: Session) -> int:
+    """Delete revocations whose tokens have expired anyway; returns the number removed"""
+    result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+    db.commit()
+    return result.rowcount
+
+
+# --- Async variants ---
+
+async def revoke_token_async(
+    db: AsyncSession,
+    jti: str,
+    subject: str,
+    expires_at: datetime,
+    reason: str
+) -> bool:
+    """Async version of revoke_token"""
+    return await db.run_sync(revoke_token, jti, subject, expires_at, reason)
+
+
+async def revoke_all_tokens_async(db: AsyncSession, subject: str, reason: str) -> None:
+    """Async version of revoke_all_tokens"""
+    await db.run_sync(revoke_all_tokens, subject, reason)
+
+
+async def refresh_revocations_async(db: AsyncSession) -> int:
+    """Async version of refresh_revocations"""
+    return await db.run_sync(refresh_revocations)
+
+
+async def run_revocation_refresh(interval: Optional[float] = None) -> None:
+    """
+    Keep the in-memory revocation list current: refresh every `interval`
+    seconds and purge expired rows about once an hour. Runs until cancelled.
+    """
+    interval = interval or settings.TOKEN_REVOCATION_REFRESH_SECONDS
+    purge_every = max(1, int(3600 / interval))
+    ticks = 0
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_revocations_async(db)
+                if ticks % purge_every == 0:
+                    await db.run_sync(purge_expired_revocations)
+        except Exception:
+            logger.exception("Refreshing revoked tokens failed")
+        ticks += 1
+        await asyncio.sleep(interval)
@@ -1,7 +1,16 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+  get_password_hash,
+  verify_password,
+  get_password_hash_async,
+  verify_password_async
+)
+from app.core.cache import get_principal_cache
+from app.core.token_revocation import revocation_list
+from app.services.token_revocation_service import add_token_cutoff
 from typing import Optional
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -12,6 +21,9 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
 
 def create_user(db: Session, user: UserCreate) -> User:
   hashed_password = get_password_hash(user.password)
+  return _add_user(db, user, hashed_password)
+
+def _add_user(db: Session, user: UserCreate, hashed_password: str) -> User:
   db_user = User(
     email = user.email,
     password_hash = hashed_password,
@@ -37,12 +49,32 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
   if not user:
     return None
   
+  previous_email = user.email
   update_data = user_update.model_dump(exclude_unset=True)
   for field, value in update_data.items():
     setattr(user, field, value)
 
   db.commit()
   db.refresh(user)
+  get_principal_cache().invalidate(previous_email)
+  get_principal_cache().invalidate(user.email)
+  return user
+
+def _set_password(db: Session, user_id: int, hashed_password: str) -> Optional[User]:
+  """
+  Store a new password hash and revoke every token issued before it, in one
+  transaction: either both land or neither does.
+  """
+  user = get_user_by_id(db, user_id)
+  if not user:
+    return None
+
+  user.password_hash = hashed_password
+  revoked_at, expires_at = add_token_cutoff(db, user.email, reason="password_change")
+  db.commit()
+  # Only once committed, so a failed change leaves the old tokens working
+  revocation_list.add(None, user.email, revoked_at, expires_at)
+  get_principal_cache().invalidate(user.email)
   return user
 
 def delete_user(db: Session, user_id: int) -> bool:
@@ -50,6 +82,53 @@ def delete_user(db: Session, user_id: int) -> bool:
   if not user:
     return False
   
+  email = user.email
   db.delete(user)
   db.commit()
-  return True
\ No newline at end of file
+  get_principal_cache().invalidate(email)
+  return True
+
+
+# --- Async variants ---
+# Queries run through AsyncSession.run_sync; bcrypt work is CPU-bound, so it
+# goes to the password hashing process pool and never runs inside run_sync.
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+  return await db.run_sync(get_user_by_email, email)
+
+async def get_user_by_id_async(db: AsyncSession, user_id: int) -> Optional[User]:
+  return await db.run_sync(get_user_by_id, user_id)
+
+async def create_user_async(db: AsyncSession, user: UserCreate) -> User:
+  hashed_password = await get_password_hash_async(user.password)
+  return await db.run_sync(_add_user, user, hashed_password)
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+  user = await get_user_by_email_async(db, email)
+  if not user:
+    return None
+  if not user.password_hash:
+    return None
+  if not await verify_password_async(password, user.password_hash):
+    return None
+  return user
+
+async def update_user_async(db: AsyncSession, user_id: int, user_update: UserUpdate) -> Optional[User]:
+  return await db.run_sync(update_user, user_id, user_update)
+
+async def change_password_async(
+  db: AsyncSession,
+  user: User,
+  current_password: str,
+  new_password: str
+) -> bool:
+  """Change the password if current_password matches; returns False otherwise"""
+  if not user.password_hash:
+    return False
+  if not await verify_password_async(current_password, user.password_hash):
+    return False
+  hashed_password = await get_password_hash_async(new_password)
+  return await db.run_sync(_set_password, user.id, hashed_password) is not None
+
+async def delete_user_async(db: AsyncSession, user_id: int) -> bool:
+  return await db.run_sync(delete_user, user_id)
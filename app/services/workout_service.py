@@ -1,18 +1,81 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from app.models.workout_plan import WorkoutPlan
 from app.models.workout_exercise import WorkoutExercise
 from app.schemas.workout_plan import (
     WorkoutPlanCreate,
     WorkoutPlanUpdate,
+    WorkoutPlanResponse,
     WorkoutExerciseCreate,
-    WorkoutExerciseUpdate
+    WorkoutExerciseUpdate,
+    WorkoutExerciseBatchItem,
+    WorkoutExerciseResponse
 )
+from app.core.pagination import decode_cursor, keyset_filter, keyset_order_by, next_cursor
+from app.core.cache import collection_versions
+from app.services.analytics_service import remove_plan_volume
+from app.services.change_tracking import allocate_change_seq, user_scope
+
+# Columns WorkoutPlanResponse needs, for list pages served without ORM instances
+PLAN_LIST_COLUMNS = tuple(
+    getattr(WorkoutPlan, field) for field in WorkoutPlanResponse.model_fields if field != "exercise"
+)
+PLAN_EXERCISE_COLUMNS = tuple(
+    getattr(WorkoutExercise, field) for field in WorkoutExerciseResponse.model_fields
+)
+
+
+def bump_plan_version(user_id: int) -> None:
+    """Invalidate cached ETags for the user's workout plans"""
+    collection_versions.bump(("workout_plans", user_id))
+
+
+def _plan_owner_id(db: Session, plan_id: int) -> Optional[int]:
+    """Owner of a plan; normally already in the session from the ownership check"""
+    plan = db.get(WorkoutPlan, plan_id)
+    return plan.user_id if plan is not None else None
+
+
+def _plan_query(db: Session):
+    """Plan query that loads each page's WorkoutExercise rows in one extra SELECT"""
+    return db.query(WorkoutPlan).options(selectinload(WorkoutPlan.exercises))
+
+
+def _reload_plan(db: Session, plan_id: int) -> WorkoutPlan:
+    """Reload a plan after commit with its exercises, so serializing it doesn't lazy load"""
+    return _plan_query(db).filter(WorkoutPlan.id == plan_id).populate_existing().one()
 
 
-def get_workout_plan_by_id(db: Session, plan_id: int) -> Optional[WorkoutPlan]:
-    """Get a single workout plan by ID"""
-    return db.query(WorkoutPlan).filter(WorkoutPlan.id == plan_id).first()
+def _plan_dicts_with_exercises(db: Session, rows: list) -> List[dict]:
+    """Turn projected plan rows into response dicts, loading their exercises in one SELECT"""
+    plans = [row._asdict() for row in rows]
+    by_id = {}
+    for plan in plans:
+        plan["exercise"] = []
+        by_id[plan["id"]] = plan
+
+    if by_id:
+        exercise_rows = db.execute(
+            select(*PLAN_EXERCISE_COLUMNS)
+            .where(WorkoutExercise.workout_plan_id.in_(by_id))
+            .order_by(WorkoutExercise.workout_plan_id, WorkoutExercise.order_index, WorkoutExercise.id)
+        )
+        for row in exercise_rows:
+            by_id[row.workout_plan_id]["exercise"].append(row._asdict())
+
+    return plans
+
+
+def get_workout_plan_by_id(
+    db: Session,
+    plan_id: int,
+    load_exercises: bool = True
+) -> Optional[WorkoutPlan]:
+    """Get a single workout plan by ID, with its exercises unless load_exercises is False"""
+    query = _plan_query(db) if load_exercises else db.query(WorkoutPlan)
+    return query.filter(WorkoutPlan.id == plan_id).first()
 
 
 def get_workout_plans(
@@ -22,28 +85,52 @@ def get_workout_plans(
     limit: int = 100,
     search: Optional[str] = None,
     sort_by: str = "created_at",
-    sort_order: str = "desc"
-) -> tuple[List[WorkoutPlan], int]:
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    columns_only: bool = False
+) -> tuple[List[WorkoutPlan], Optional[int], Optional[str]]:
     """
     Get workout plans for the current user with pagination.
-    Returns tuple of (plans, total_count)
+    With a cursor, seeks past the last seen (sort column, id) pair
+    instead of using skip, and the total count is not computed.
+
+    columns_only=True returns plain dicts shaped like WorkoutPlanResponse
+    (plan and exercise columns only, no ORM instances).
+    Returns tuple of (plans, total_count, next_cursor)
     """
-    query = db.query(WorkoutPlan).filter(WorkoutPlan.user_id == current_user_id)
+    if columns_only:
+        query = db.query(*PLAN_LIST_COLUMNS)
+    else:
+        query = _plan_query(db)
+    query = query.filter(WorkoutPlan.user_id == current_user_id)
 
     if search:
         query = query.filter(WorkoutPlan.name.ilike(f"%{search}%"))
 
-    total_count = query.count()
+    if not hasattr(WorkoutPlan, sort_by):
+        sort_by = "id"
+    sort_column = getattr(WorkoutPlan, sort_by)
+    descending = sort_order.lower() == "desc"
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        query = query.filter(keyset_filter(
+            sort_column, WorkoutPlan.id, value, last_id, descending, db.get_bind().dialect.name
+        ))
+        total_count = None
+    else:
+        total_count = query.count()
 
-    if hasattr(WorkoutPlan, sort_by):
-        sort_column = getattr(WorkoutPlan, sort_by)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+    # ORDER BY has to be applied before OFFSET/LIMIT
+    query = query.order_by(*keyset_order_by(sort_column, WorkoutPlan.id, descending))
+    if not cursor:
+        query = query.offset(skip)
 
-    plans = query.offset(skip).limit(limit).all()
-    return plans, total_count
+    rows = query.limit(limit + 1).all()
+    plans, cursor_out = next_cursor(rows, limit, sort_by, sort_order)
+    if columns_only:
+        plans = _plan_dicts_with_exercises(db, plans)
+    return plans, total_count, cursor_out
 
 
 def create_workout_plan(
@@ -62,13 +149,14 @@ def create_workout_plan(
     for exercise in exercises_data:
         db_exercise = WorkoutExercise(
             workout_plan_id=db_plan.id,
+            user_id=user_id,
             **exercise.model_dump()
         )
         db.add(db_exercise)
 
     db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    bump_plan_version(user_id)
+    return _reload_plan(db, db_plan.id)
 
 
 def update_workout_plan(
@@ -91,12 +179,12 @@ def update_workout_plan(
         setattr(db_plan, field, value)
 
     db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    bump_plan_version(user_id)
+    return _reload_plan(db, db_plan.id)
 
 
 def delete_workout_plan(db: Session, plan_id: int, user_id: int) -> bool:
-    """Delete a workout plan (only if user owns it)"""
+    """Delete a workout plan (only if user owns it) and its completed workouts' volume"""
     db_plan = db.query(WorkoutPlan).filter(
         WorkoutPlan.id == plan_id,
         WorkoutPlan.user_id == user_id
@@ -105,8 +193,11 @@ def delete_workout_plan(db: Session, plan_id: int, user_id: int) -> bool:
     if not db_plan:
         return False
 
+    # Its completed workouts go with it, so their volume comes off the rollup
+    remove_plan_volume(db, user_id, plan_id)
     db.delete(db_plan)
     db.commit()
+    bump_plan_version(user_id)
     return True
 
 
@@ -130,12 +221,16 @@ def add_exercise_to_plan(
     exercise_data: WorkoutExerciseCreate
 ) -> WorkoutExercise:
     """Add an exercise to a workout plan"""
+    owner_id = _plan_owner_id(db, plan_id)
     db_workout_exercise = WorkoutExercise(
         workout_plan_id=plan_id,
+        user_id=owner_id,
         **exercise_data.model_dump()
     )
     db.add(db_workout_exercise)
     db.commit()
+    if owner_id is not None:
+        bump_plan_version(owner_id)
     db.refresh(db_workout_exercise)
     return db_workout_exercise
 
@@ -156,7 +251,10 @@ def update_exercise_in_plan(
     for field, value in update_data.items():
         setattr(db_workout_exercise, field, value)
 
+    owner_id = _plan_owner_id(db, plan_id)
     db.commit()
+    if owner_id is not None:
+        bump_plan_version(owner_id)
     db.refresh(db_workout_exercise)
     return db_workout_exercise
 
@@ -173,5 +271,170 @@ def remove_exercise_from_plan(
         return False
 
     db.delete(db_workout_exercise)
+    owner_id = _plan_owner_id(db, plan_id)
     db.commit()
+    if owner_id is not None:
+        bump_plan_version(owner_id)
     return True
+
+
+def batch_update_exercises_in_plan(
+    db: Session,
+    plan_id: int,
+    items: List[WorkoutExerciseBatchItem],
+    user_id: int
+) -> tuple[Optional[List[WorkoutExercise]], List[int]]:
+    """
+    Apply many WorkoutExercise edits (order, sets, reps, weight, notes) in one
+    transaction with a single UPDATE: each column is SET through a CASE on
+    exercise_id, so untouched columns keep their value.
+    The caller checks plan ownership.
+
+    Returns tuple of (plan exercises ordered by order_index, missing_exercise_ids).
+    If any exercise isn't in the plan nothing is changed and the list is None.
+    """
+    changes = {item.exercise_id: item.model_dump(exclude_unset=True, exclude={"exercise_id"}) for item in items}
+    exercise_ids = list(changes)
+
+    values = {}
+    for field in WorkoutExerciseUpdate.model_fields:
+        column = getattr(WorkoutExercise, field)
+        field_changes = {
+            exercise_id: data[field] for exercise_id, data in changes.items() if field in data
+        }
+        if field_changes:
+            values[field] = case(field_changes, value=WorkoutExercise.exercise_id, else_=column)
+
+    if values:
+        # Bulk UPDATEs skip the ORM flush, so take delta sync positions explicitly
+        first_seq = allocate_change_seq(db.connection(), user_scope(user_id), len(exercise_ids))
+        values["change_seq"] = case(
+            {exercise_id: first_seq + i for i, exercise_id in enumerate(exercise_ids)},
+            value=WorkoutExercise.exercise_id
+        )
+        result = db.execute(
+            update(WorkoutExercise)
+            .where(
+                WorkoutExercise.workout_plan_id == plan_id,
+                WorkoutExercise.exercise_id.in_(exercise_ids)
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        matched = result.rowcount
+    else:
+        matched = db.query(WorkoutExercise).filter(
+            WorkoutExercise.workout_plan_id == plan_id,
+            WorkoutExercise.exercise_id.in_(exercise_ids)
+        ).count()
+
+    if matched != len(exercise_ids):
+        db.rollback()
+        present = set(db.scalars(
+            select(WorkoutExercise.exercise_id).where(
+                WorkoutExercise.workout_plan_id == plan_id,
+                WorkoutExercise.exercise_id.in_(exercise_ids)
+            )
+        ))
+        return None, [exercise_id for exercise_id in exercise_ids if exercise_id not in present]
+
+    db.commit()
+    bump_plan_version(user_id)
+
+    exercises = db.query(WorkoutExercise).filter(
+        WorkoutExercise.workout_plan_id == plan_id
+    ).order_by(WorkoutExercise.order_index, WorkoutExercise.id).populate_existing().all()
+    return exercises, []
+
+
+# --- Async variants ---
+# These run the functions above through AsyncSession.run_sync, so the same
+# queries go through the async driver without blocking the event loop.
+
+async def get_workout_plan_by_id_async(
+    db: AsyncSession,
+    plan_id: int,
+    load_exercises: bool = True
+) -> Optional[WorkoutPlan]:
+    """Async version of get_workout_plan_by_id"""
+    return await db.run_sync(get_workout_plan_by_id, plan_id, load_exercises)
+
+
+async def get_workout_plans_async(
+    db: AsyncSession,
+    current_user_id: int,
+    **filters
+) -> tuple[List[WorkoutPlan], Optional[int], Optional[str]]:
+    """Async version of get_workout_plans (accepts the same keyword filters)"""
+    return await db.run_sync(get_workout_plans, current_user_id, **filters)
+
+
+async def create_workout_plan_async(
+    db: AsyncSession,
+    plan: WorkoutPlanCreate,
+    user_id: int
+) -> WorkoutPlan:
+    """Async version of create_workout_plan"""
+    return await db.run_sync(create_workout_plan, plan, user_id)
+
+
+async def update_workout_plan_async(
+    db: AsyncSession,
+    plan_id: int,
+    plan_update: WorkoutPlanUpdate,
+    user_id: int
+) -> Optional[WorkoutPlan]:
+    """Async version of update_workout_plan"""
+    return await db.run_sync(update_workout_plan, plan_id, plan_update, user_id)
+
+
+async def delete_workout_plan_async(db: AsyncSession, plan_id: int, user_id: int) -> bool:
+    """Async version of delete_workout_plan"""
+    return await db.run_sync(delete_workout_plan, plan_id, user_id)
+
+
+async def get_workout_exercise_async(
+    db: AsyncSession,
+    plan_id: int,
+    exercise_id: int
+) -> Optional[WorkoutExercise]:
+    """Async version of get_workout_exercise"""
+    return await db.run_sync(get_workout_exercise, plan_id, exercise_id)
+
+
+async def add_exercise_to_plan_async(
+    db: AsyncSession,
+    plan_id: int,
+    exercise_data: WorkoutExerciseCreate
+) -> WorkoutExercise:
+    """Async version of add_exercise_to_plan"""
+    return await db.run_sync(add_exercise_to_plan, plan_id, exercise_data)
+
+
+async def update_exercise_in_plan_async(
+    db: AsyncSession,
+    plan_id: int,
+    exercise_id: int,
+    exercise_update: WorkoutExerciseUpdate
+) -> Optional[WorkoutExercise]:
+    """Async version of update_exercise_in_plan"""
+    return await db.run_sync(update_exercise_in_plan, plan_id, exercise_id, exercise_update)
+
+
+async def remove_exercise_from_plan_async(
+    db: AsyncSession,
+    plan_id: int,
+    exercise_id: int
+) -> bool:
+    """Async version of remove_exercise_from_plan"""
+    return await db.run_sync(remove_exercise_from_plan, plan_id, exercise_id)
+
+
+async def batch_update_exercises_in_plan_async(
+    db: AsyncSession,
+    plan_id: int,
+    items: List[WorkoutExerciseBatchItem],
+    user_id: int
+) -> tuple[Optional[List[WorkoutExercise]], List[int]]:
+    """Async version of batch_update_exercises_in_plan"""
+    return await db.run_sync(batch_update_exercises_in_plan, plan_id, items, user_id)
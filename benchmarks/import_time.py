@@ -0,0 +1,77 @@
+"""
+Cold start benchmark: how long `import app.main` takes in a fresh interpreter,
+and which modules account for it (from python -X importtime).
+
+    python -m benchmarks.import_time [--module app.main] [--top 20]
+        [--runs 5] [--budget-ms 2500]
+
+Reports the fastest of --runs (each in a new process) and exits with status 1
+when it is over --budget-ms, so it can gate CI. The default budget is about
+1.3x the slowest best-of-5 seen here (1300-1900 ms); pass 0 to disable it. Engines, bcrypt, jose and numpy
+load on first use, so they should not show up here.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import `module` in a new interpreter; returns (total microseconds,
+    cumulative microseconds per top-level imported package).
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr}")
+
+    total = 0
+    packages: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        # Only imports made directly by the interpreter (depth 0) add up to the total
+        if len(indent) == 1:
+            total += int(cumulative)
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative))
+    return total, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20, help="Packages to list, slowest first")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2500, help="Fail if the import takes longer (0: no budget)")
+    args = parser.parse_args()
+
+    runs: List[Tuple[int, Dict[str, int]]] = [measure(args.module) for _ in range(args.runs)]
+    total, packages = min(runs, key=lambda run: run[0])
+
+    print(f"import {args.module}: {total / 1000:.1f} ms (best of {args.runs})")
+    for package, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {package}")
+
+    if args.budget_ms and total / 1000 > args.budget_ms:
+        print(f"Over budget: {total / 1000:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+End-to-end load test: seeds a synthetic dataset and drives the real app with
+concurrent virtual users, reporting per-route latency percentiles and
+throughput as JSON.
+
+    python -m benchmarks.load_test [--concurrency 20] [--duration 30]
+        [--database-url sqlite:///./loadtest.db] [--base-url http://127.0.0.1:8000]
+        [--users 20] [--reseed] [--output results.json]
+
+By default requests go through httpx's ASGI transport, in this process.
+Pass --base-url to load a running server instead (e.g. uvicorn app.main:app
+--workers 4); it must use the same database, which is seeded from here.
+
+Databases without tables are built with Base.metadata.create_all (plus the
+search index), so a local PostgreSQL only needs to exist. Seeded accounts are
+reused on later runs; --reseed drops and recreates every table first, so point
+it at a dedicated database.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as time_of_day, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+USER_EMAIL = "loadtest-{}@example.com"
+USER_PASSWORD = "loadtest-password"
+
+# (route name, weight) of the request mix each virtual user draws from
+ROUTE_MIX = (
+    ("list_exercises", 25),
+    ("search_exercises", 10),
+    ("get_exercise", 10),
+    ("list_workout_plans", 15),
+    ("get_workout_plan", 15),
+    ("calendar", 10),
+    ("training_volume", 5),
+    ("personal_records", 5),
+    ("sync", 5),
+)
+
+SEARCH_TERMS = ("press", "squat", "row", "curl", "stretch", "run")
+MOVEMENTS = ("Bench Press", "Back Squat", "Barbell Row", "Biceps Curl", "Hamstring Stretch",
+             "Treadmill Run", "Overhead Press", "Deadlift", "Plank", "Lunge")
+
+
+# --- Dataset ---
+
+def _create_schema(engine, reset: bool) -> None:
+    from app.database import Base
+    from app.services.exercise_search import create_search_index
+
+    if reset:
+        with engine.begin() as connection:
+            # The FTS table and its triggers aren't in the metadata
+            if connection.dialect.name == "sqlite":
+                connection.exec_driver_sql("DROP TABLE IF EXISTS exercises_fts")
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_search_index(connection)
+
+
+def _seed_user(db, index: int, password_hash: str, args, rng: random.Random) -> None:
+    from app.models import User, Exercise, WorkoutPlan, WorkoutExercise, ScheduledWorkout
+    from app.models.exercise import ExerciseCategory, MuscleGroup
+
+    user = User(email=USER_EMAIL.format(index), password_hash=password_hash, full_name=f"Load Test {index}")
+    db.add(user)
+    db.flush()
+
+    categories, groups = list(ExerciseCategory), list(MuscleGroup)
+    exercises = [
+        Exercise(
+            name=f"{rng.choice(MOVEMENTS)} {index}-{i}",
+            description="Keep a neutral spine, control the eccentric and breathe out on the effort.",
+            category=rng.choice(categories),
+            muscle_group=rng.choice(groups),
+            created_by=user.id,
+            is_public=rng.random() < args.public_ratio,
+        )
+        for i in range(args.exercises_per_user)
+    ]
+    db.add_all(exercises)
+    db.flush()
+
+    plans = []
+    for i in range(args.plans_per_user):
+        plan = WorkoutPlan(user_id=user.id, name=f"Plan {i}", description="Synthetic load test plan")
+        plan.exercises = [
+            WorkoutExercise(
+                exercise_id=exercise.id,
+                sets=rng.randint(2, 5),
+                repetitions=rng.randint(5, 12),
+                weight=Decimal(rng.randrange(20, 200, 5)),
+                order_index=j,
+            )
+            for j, exercise in enumerate(rng.sample(exercises, min(args.exercises_per_plan, len(exercises))))
+        ]
+        plans.append(plan)
+    db.add_all(plans)
+    db.flush()
+
+    # A past with completed workouts (analytics) and a future still to do
+    today = date.today()
+    for i in range(args.scheduled_per_user):
+        scheduled_date = today + timedelta(days=rng.randint(-84, 28))
+        completed = scheduled_date < today and rng.random() < 0.8
+        db.add(ScheduledWorkout(
+            user_id=user.id,
+            workout_plan_id=rng.choice(plans).id,
+            scheduled_date=scheduled_date,
+            scheduled_time=time_of_day(rng.choice((6, 12, 18))),
+            status="completed" if completed else "scheduled",
+            completed_at=datetime.combine(scheduled_date, time_of_day(19), timezone.utc) if completed else None,
+        ))
+
+
+def seed(args) -> None:
+    """Create the schema and seeded accounts, unless they already exist"""
+    from sqlalchemy import inspect, select
+    from sqlalchemy.orm import Session
+    from app.database import engine
+    from app.models import User
+    from app.core.security import get_password_hash
+    from app.services.analytics_service import rebuild_training_volume
+    from app.services.change_tracking import install_change_tracking
+
+    if args.reseed or not inspect(engine).has_table("users"):
+        _create_schema(engine, reset=args.reseed)
+
+    # Seeded rows get real sync positions, as if they'd come through the API
+    install_change_tracking()
+
+    with Session(engine) as db:
+        existing = set(db.scalars(select(User.email).where(User.email.like(USER_EMAIL.format("%")))))
+
+        rng = random.Random(args.seed)
+        password_hash = get_password_hash(USER_PASSWORD)  # bcrypt once, shared by all accounts
+        created = 0
+        for index in range(args.users):
+            if USER_EMAIL.format(index) in existing:
+                continue
+            _seed_user(db, index, password_hash, args, rng)
+            created += 1
+        db.commit()
+
+        if created:
+            rebuild_training_volume(db)
+            db.commit()
+        print(f"seeded {created} users ({len(existing)} already present)", file=sys.stderr)
+
+
+def load_targets(users: int) -> List[dict]:
+    """Per account: the ids its requests are built from"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from app.database import engine
+    from app.models import User, Exercise, WorkoutPlan
+
+    targets = []
+    with Session(engine) as db:
+        for index in range(users):
+            email = USER_EMAIL.format(index)
+            user_id = db.scalar(select(User.id).where(User.email == email))
+            targets.append({
+                "email": email,
+                "exercise_ids": db.scalars(select(Exercise.id).where(Exercise.created_by == user_id)).all(),
+                "plan_ids": db.scalars(select(WorkoutPlan.id).where(WorkoutPlan.user_id == user_id)).all(),
+            })
+    return targets
+
+
+# --- Load ---
+
+def _request_for(route: str, target: dict, rng: random.Random) -> tuple:
+    """(method, path, params) for one request of the route"""
+    today = date.today()
+    if route == "list_exercises":
+        return "GET", "/api/v1/exercises", {"limit": 50}
+    if route == "search_exercises":
+        return "GET", "/api/v1/exercises", {"search": rng.choice(SEARCH_TERMS), "limit": 20}
+    if route == "get_exercise":
+        return "GET", f"/api/v1/exercises/{rng.choice(target['exercise_ids'])}", None
+    if route == "list_workout_plans":
+        return "GET", "/api/v1/workout-plans", {"limit": 20}
+    if route == "get_workout_plan":
+        return "GET", f"/api/v1/workout-plans/{rng.choice(target['plan_ids'])}", None
+    if route == "calendar":
+        first = today.replace(day=1)
+        return "GET", "/api/v1/scheduled-workouts", {"from": first.isoformat(), "to": (first + timedelta(days=41)).isoformat()}
+    if route == "training_volume":
+        return "GET", "/api/v1/analytics/volume", None
+    if route == "personal_records":
+        return "GET", "/api/v1/analytics/personal-records", None
+    if route == "sync":
+        return "GET", "/api/v1/sync", None
+    raise ValueError(f"Unknown route {route}")
+
+
+async def _login(client, target: dict, samples: Dict[str, list], errors: Dict[str, int]) -> Optional[str]:
+    start = time.perf_counter()
+    response = await client.post("/api/v1/auth/login", data={"username": target["email"], "password": USER_PASSWORD})
+    samples["login"].append(time.perf_counter() - start)
+    if response.status_code != 200:
+        errors["login"] += 1
+        return None
+    return response.json()["access_token"]
+
+
+async def _virtual_user(client, target: dict, deadline: float, routes: list, weights: list,
+                        seed: int, samples: Dict[str, list], errors: Dict[str, int]) -> None:
+    rng = random.Random(seed)
+    token = await _login(client, target, samples, errors)
+    if token is None:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    while time.perf_counter() < deadline:
+        route = rng.choices(routes, weights)[0]
+        method, path, params = _request_for(route, target, rng)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, headers=headers)
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        samples[route].append(time.perf_counter() - start)
+        if failed:
+            errors[route] += 1
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def _summary(values: list, error_count: int, elapsed: float) -> dict:
+    values = sorted(values)
+    return {
+        "requests": len(values),
+        "errors": error_count,
+        "throughput_rps": round(len(values) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(_percentile(values, 0.50) * 1000, 3),
+            "p95": round(_percentile(values, 0.95) * 1000, 3),
+            "p99": round(_percentile(values, 0.99) * 1000, 3),
+            "mean": round(sum(values) / len(values) * 1000, 3),
+            "max": round(values[-1] * 1000, 3),
+        },
+    }
+
+
+async def run(args, targets: List[dict]) -> dict:
+    import httpx
+
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://loadtest"
+
+    mix = [(route, weight) for route, weight in ROUTE_MIX if not args.routes or route in args.routes]
+    routes, weights = [route for route, _ in mix], [weight for _, weight in mix]
+    samples, errors = defaultdict(list), defaultdict(int)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            _virtual_user(client, targets[i % len(targets)], deadline, routes, weights, args.seed + i, samples, errors)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    all_samples = [value for values in samples.values() for value in values]
+    return {
+        "config": {
+            "target": args.base_url or "asgi",
+            "database": args.database_url.split("@")[-1],  # Leave out credentials
+            "concurrency": args.concurrency,
+            "duration_seconds": round(elapsed, 3),
+            "users": args.users,
+        },
+        "routes": {route: _summary(values, errors[route], elapsed) for route, values in sorted(samples.items())},
+        "total": _summary(all_samples, sum(errors.values()), elapsed) if all_samples else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", "sqlite:///./loadtest.db"))
+    parser.add_argument("--base-url", default=None, help="Load a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users sending requests at once")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to send requests for")
+    parser.add_argument("--routes", nargs="*", choices=[route for route, _ in ROUTE_MIX],
+                        help="Only these routes (login always runs once per virtual user)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--exercises-per-user", type=int, default=40)
+    parser.add_argument("--public-ratio", type=float, default=0.25)
+    parser.add_argument("--plans-per-user", type=int, default=10)
+    parser.add_argument("--exercises-per-plan", type=int, default=6)
+    parser.add_argument("--scheduled-per-user", type=int, default=60)
+    parser.add_argument("--reseed", action="store_true", help="Delete and recreate the seeded accounts")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the dataset and request mix")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # Settings are read on first import of the app, so configure before that
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "loadtest")
+    # Every virtual user logs in from the same address
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    seed(args)
+    report = asyncio.run(run(args, load_targets(args.users)))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Per-page serialization benchmark for the exercise and workout plan list endpoints.
+
+Compares the previous path (ORM instances validated through the response_model,
+then encoded with the stdlib json encoder, as FastAPI does) with the lean path
+(column-projected rows encoded with ORJSONResponse). Both include the query.
+
+    python -m benchmarks.serialization [--page-size 100] [--iterations 200]
+
+Runs against an in-memory SQLite database, so absolute numbers are only
+comparable between the two paths, not with a production PostgreSQL.
+"""
+import argparse
+import json
+import os
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models import User, Exercise, WorkoutPlan, WorkoutExercise
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.schemas.exercise import ExerciseListResponse
+from app.schemas.workout_plan import WorkoutPlanResponse
+from app.services.exercise_service import EXERCISE_LIST_FIELDS, get_exercises
+from app.services.workout_service import get_workout_plans
+from app.core.responses import ORJSONResponse
+
+EXERCISES_PER_PLAN = 8
+
+
+def _seed(db: Session, page_size: int) -> int:
+    user = User(email="bench@example.com", full_name="Benchmark")
+    db.add(user)
+    db.flush()
+
+    categories, groups = list(ExerciseCategory), list(MuscleGroup)
+    exercises = [
+        Exercise(
+            name=f"Exercise {i}",
+            description="A reasonably long description of how to perform the movement safely. " * 2,
+            category=categories[i % len(categories)],
+            muscle_group=groups[i % len(groups)],
+            created_by=user.id,
+            is_public=i % 3 == 0,
+        )
+        for i in range(page_size * 2)
+    ]
+    db.add_all(exercises)
+    db.flush()
+
+    for i in range(page_size * 2):
+        plan = WorkoutPlan(user_id=user.id, name=f"Plan {i}", description="Push / pull / legs")
+        plan.exercises = [
+            WorkoutExercise(
+                exercise_id=exercises[(i + j) % len(exercises)].id,
+                sets=4,
+                repetitions=8,
+                weight=Decimal("62.50"),
+                order_index=j,
+            )
+            for j in range(EXERCISES_PER_PLAN)
+        ]
+        db.add(plan)
+    db.commit()
+    return user.id
+
+
+def _stdlib_render(content) -> bytes:
+    # What fastapi.responses.JSONResponse does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _time_per_page(fn: Callable[[], bytes], iterations: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run(page_size: int, iterations: int) -> List[tuple]:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    user_id = _seed(db, page_size)
+
+    exercise_list = TypeAdapter(ExerciseListResponse)
+    plan_list = TypeAdapter(List[WorkoutPlanResponse])
+
+    def exercises_before() -> bytes:
+        db.expunge_all()
+        rows, total, cursor = get_exercises(db, user_id, limit=page_size, include_total=False)
+        page = ExerciseListResponse(exercises=rows, total=total, skip=0, limit=page_size, next_cursor=cursor)
+        return _stdlib_render(exercise_list.dump_python(page, mode="json"))
+
+    def exercises_after() -> bytes:
+        rows, total, cursor = get_exercises(db, user_id, limit=page_size, include_total=False, columns_only=True)
+        return ORJSONResponse({
+            "exercises": [dict(zip(EXERCISE_LIST_FIELDS, row)) for row in rows], "total": total, "total_is_estimate": False,
+            "skip": 0, "limit": page_size, "next_cursor": cursor,
+        }).body
+
+    def plans_before() -> bytes:
+        db.expunge_all()
+        plans, _, _ = get_workout_plans(db, user_id, limit=page_size)
+        validated = plan_list.validate_python(plans, from_attributes=True)
+        return _stdlib_render(plan_list.dump_python(validated, mode="json"))
+
+    def plans_after() -> bytes:
+        plans, _, _ = get_workout_plans(db, user_id, limit=page_size, columns_only=True)
+        return ORJSONResponse(plans).body
+
+    results = [
+        ("exercises", _time_per_page(exercises_before, iterations), _time_per_page(exercises_after, iterations)),
+        ("workout plans", _time_per_page(plans_before, iterations), _time_per_page(plans_after, iterations)),
+    ]
+    db.close()
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<16}{'before ms/page':>16}{'after ms/page':>16}{'speedup':>10}")
+    for name, before, after in run(args.page_size, args.iterations):
+        print(f"{name:<16}{before:>16.3f}{after:>16.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
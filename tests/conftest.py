@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+# Settings are read on first use, so the environment only has to be in place
+# before the first request or engine
+_DATABASE_DIR = tempfile.mkdtemp(prefix="workout-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATABASE_DIR}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.database import Base, get_engine
+from app.main import create_app
+from app.core import cache
+from app.services.exercise_search import create_search_index
+
+TEST_PASSWORD = "test-password"
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_search_index(connection)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    # One app (and event loop) for the session: async pools stay on one loop
+    with TestClient(create_app()) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_database(request):
+    """Empty every table and the per-process caches after each test that used the database"""
+    yield
+    if "engine" not in request.fixturenames:
+        return
+    with request.getfixturevalue("engine").begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    for get_cache in (
+        cache.get_principal_cache,
+        cache.get_exercise_count_cache,
+        cache.get_etag_cache,
+        cache.get_recent_writers,
+        cache.get_personal_record_cache
+    ):
+        get_cache().clear()
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as session:
+        yield session
+
+
+def register(client: TestClient, email: str = None, password: str = TEST_PASSWORD) -> dict:
+    """Register and log in a user; returns the login response body plus email"""
+    email = email or f"user{next(_emails)}@example.com"
+    response = client.post("/api/v1/auth/register", json={"email": email, "password": password, "full_name": "Test User"})
+    assert response.status_code == 201, response.text
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {**response.json(), "email": email}
+
+
+@pytest.fixture
+def user(client) -> dict:
+    return register(client)
+
+
+@pytest.fixture
+def auth_headers(user) -> dict:
+    return {"Authorization": f"Bearer {user['access_token']}"}
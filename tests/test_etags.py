@@ -0,0 +1,119 @@
+from app.api.v1 import exercises
+from app.core.cache import get_etag_cache
+from app.models import Exercise, User, WorkoutExercise, WorkoutPlan
+from app.models.exercise import ExerciseCategory, MuscleGroup
+
+
+def _seed_plan(db, email: str) -> tuple[int, int]:
+    """A plan with one exercise; returns (plan_id, exercise_id)"""
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    exercise = Exercise(name="Squat", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.LEGS, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(
+        name="Legs",
+        user_id=user_id,
+        exercises=[WorkoutExercise(exercise_id=exercise.id, sets=3, repetitions=5, order_index=0)]
+    )
+    db.add(plan)
+    db.commit()
+    return plan.id, exercise.id
+
+
+def _conditional_get(client, path: str, headers: dict, etag: str, **params):
+    return client.get(path, params=params, headers={**headers, "If-None-Match": etag})
+
+
+def test_plan_etag_revalidates_until_changed(client, db, user, auth_headers):
+    plan_id, _ = _seed_plan(db, user["email"])
+    path = f"/api/v1/workout-plans/{plan_id}"
+
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+    assert _conditional_get(client, path, auth_headers, etag).status_code == 304
+
+
+def test_plan_exercise_edit_then_conditional_get_returns_new_body(client, db, user, auth_headers):
+    plan_id, exercise_id = _seed_plan(db, user["email"])
+    path = f"/api/v1/workout-plans/{plan_id}"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+
+    # Same second as the read: the timestamps alone don't change
+    response = client.put(f"{path}/exercises/{exercise_id}", json={"sets": 5}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    response = _conditional_get(client, path, auth_headers, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["exercise"][0]["sets"] == 5
+
+
+def test_plan_batch_edit_then_conditional_get_returns_new_body(client, db, user, auth_headers):
+    plan_id, exercise_id = _seed_plan(db, user["email"])
+    path = f"/api/v1/workout-plans/{plan_id}"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+
+    # The batch edit is a bulk UPDATE, so nothing goes through the ORM
+    response = client.patch(
+        f"{path}/exercises",
+        json={"exercises": [{"exercise_id": exercise_id, "sets": 6}]},
+        headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["exercise"][0]["sets"] == 6
+
+
+def test_plan_update_then_conditional_get_returns_new_body(client, db, user, auth_headers):
+    plan_id, _ = _seed_plan(db, user["email"])
+    path = f"/api/v1/workout-plans/{plan_id}"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+
+    assert client.put(path, json={"name": "Leg day"}, headers=auth_headers).status_code == 200
+
+    response = _conditional_get(client, path, auth_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Leg day"
+
+
+def test_exercise_update_then_conditional_get_returns_new_body(client, db, user, auth_headers):
+    _, exercise_id = _seed_plan(db, user["email"])
+    path = f"/api/v1/exercises/{exercise_id}"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+    assert _conditional_get(client, path, auth_headers, etag).status_code == 304
+
+    assert client.put(path, json={"description": "Barbell"}, headers=auth_headers).status_code == 200
+
+    response = _conditional_get(client, path, auth_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["description"] == "Barbell"
+
+
+def test_exercise_list_update_then_conditional_get_returns_new_body(client, db, user, auth_headers):
+    _, exercise_id = _seed_plan(db, user["email"])
+    path = "/api/v1/exercises"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+    assert _conditional_get(client, path, auth_headers, etag).status_code == 304
+
+    assert client.put(f"{path}/{exercise_id}", json={"description": "Barbell"}, headers=auth_headers).status_code == 200
+
+    response = _conditional_get(client, path, auth_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["exercises"][0]["description"] == "Barbell"
+
+
+def test_exercise_list_match_is_answered_without_rendering(client, db, user, auth_headers, monkeypatch):
+    _seed_plan(db, user["email"])
+    path = "/api/v1/exercises"
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+
+    # Past the per-process cache, the ETag comes from the queried row versions
+    get_etag_cache().clear()
+
+    def render(*args, **kwargs):
+        raise AssertionError("a matching request must not render the page")
+
+    monkeypatch.setattr(exercises, "ORJSONResponse", render)
+    assert _conditional_get(client, path, auth_headers, etag).status_code == 304
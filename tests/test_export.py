@@ -0,0 +1,56 @@
+import gzip
+import json
+from datetime import date
+import pytest
+from app.models import Exercise, ScheduledWorkout, User, WorkoutExercise, WorkoutPlan, WorkoutRecurrence
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from tests.conftest import register
+
+RECORD_TYPES = {"user", "exercise", "workout_plan", "workout_exercise", "workout_recurrence", "scheduled_workout"}
+
+
+def _seed_account(db, email: str) -> int:
+    """One row of every exported type for the user; returns the user id"""
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    exercise = Exercise(name="Squat", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.LEGS, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(
+        name="Legs",
+        user_id=user_id,
+        exercises=[WorkoutExercise(exercise_id=exercise.id, sets=3, repetitions=5, order_index=0)]
+    )
+    db.add(plan)
+    db.flush()
+    db.add_all([
+        WorkoutRecurrence(user_id=user_id, workout_plan_id=plan.id, start_date=date(2026, 1, 5), count=4),
+        ScheduledWorkout(user_id=user_id, workout_plan_id=plan.id, scheduled_date=date(2026, 1, 6)),
+    ])
+    db.commit()
+    return user_id
+
+
+def _records(content: bytes) -> list:
+    return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_export_holds_every_record_type_and_only_the_users_rows(client, db, user, auth_headers, compress):
+    user_id = _seed_account(db, user["email"])
+    other = register(client)
+    other_id = _seed_account(db, other["email"])
+
+    response = client.get("/api/v1/users/me/export", params={"gzip": compress}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == ("application/gzip" if compress else "application/x-ndjson")
+    content = gzip.decompress(response.content) if compress else response.content
+    records = _records(content)
+
+    # One of each: the other account's rows are left out
+    assert sorted(record["type"] for record in records) == sorted(RECORD_TYPES)
+    assert all("password_hash" not in record for record in records)
+
+    profile, = [record for record in records if record["type"] == "user"]
+    assert profile["id"] == user_id and profile["email"] == user["email"]
+    owners = {record.get("user_id", record.get("created_by")) for record in records if record["type"] != "user"}
+    assert owners == {user_id} and other_id not in owners
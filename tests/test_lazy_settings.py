@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imports every app module but app.main (which builds the app) with no
+# environment, then reports whether settings were read
+IMPORT_ALL = """
+import importlib, pkgutil, app
+from app.config import get_settings
+for module in pkgutil.walk_packages(app.__path__, "app."):
+    if module.name != "app.main":
+        importlib.import_module(module.name)
+print(get_settings.cache_info().currsize)
+"""
+
+
+def test_importing_app_modules_reads_no_settings():
+    env = {key: value for key, value in os.environ.items() if key not in ("DATABASE_URL", "SECRET_KEY")}
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_ALL], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "0"
@@ -0,0 +1,103 @@
+from app.models import Exercise, WorkoutPlan, User
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.services.workout_service import get_workout_plans
+
+
+def _user_id(db, email: str) -> int:
+    return db.query(User.id).filter(User.email == email).scalar()
+
+
+def test_exercise_first_page_then_cursor_page(client, db, user, auth_headers):
+    user_id = _user_id(db, user["email"])
+    db.add_all([
+        Exercise(
+            name=f"Exercise {i}",
+            category=ExerciseCategory.STRENGTH,
+            muscle_group=MuscleGroup.CHEST,
+            created_by=user_id
+        )
+        for i in range(5)
+    ])
+    db.commit()
+
+    first = client.get("/api/v1/exercises", params={"limit": 3, "only_mine": True}, headers=auth_headers)
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert body["total"] == 5
+    assert len(body["exercises"]) == 3
+    assert body["next_cursor"]
+
+    second = client.get(
+        "/api/v1/exercises",
+        params={"limit": 3, "only_mine": True, "cursor": body["next_cursor"]},
+        headers=auth_headers
+    )
+    assert second.status_code == 200, second.text
+    rest = second.json()
+    assert rest["total"] is None
+    assert rest["next_cursor"] is None
+    ids = [exercise["id"] for exercise in body["exercises"] + rest["exercises"]]
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_workout_plan_first_page_then_cursor_page(db, user):
+    user_id = _user_id(db, user["email"])
+    db.add_all([WorkoutPlan(name=f"Plan {i}", user_id=user_id) for i in range(5)])
+    db.commit()
+
+    first, total, cursor = get_workout_plans(db, user_id, limit=3)
+    assert total == 5
+    assert len(first) == 3
+    assert cursor
+
+    rest, total, cursor = get_workout_plans(db, user_id, limit=3, cursor=cursor)
+    assert total is None
+    assert cursor is None
+    ids = [plan.id for plan in first + rest]
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_skip_still_offsets_the_first_page(db, user):
+    user_id = _user_id(db, user["email"])
+    db.add_all([WorkoutPlan(name=f"Plan {i}", user_id=user_id) for i in range(4)])
+    db.commit()
+
+    everything, _, _ = get_workout_plans(db, user_id, sort_order="asc")
+    skipped, _, _ = get_workout_plans(db, user_id, skip=2, sort_order="asc")
+    assert [plan.id for plan in skipped] == [plan.id for plan in everything[2:]]
+
+
+def _page_through(client, headers: dict, params: dict) -> list:
+    names, cursor = [], None
+    while True:
+        response = client.get("/api/v1/exercises", params={**params, "cursor": cursor}, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        names += [exercise["name"] for exercise in body["exercises"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return names
+
+
+def test_cursor_pages_keep_rows_with_null_sort_keys(client, db, user, auth_headers):
+    user_id = _user_id(db, user["email"])
+    descriptions = ["b", None, "a", None, "c", None, "a"]
+    db.add_all([
+        Exercise(
+            name=f"Exercise {i}",
+            description=description,
+            category=ExerciseCategory.STRENGTH,
+            muscle_group=MuscleGroup.CHEST,
+            created_by=user_id
+        )
+        for i, description in enumerate(descriptions)
+    ])
+    db.commit()
+
+    for sort_order in ("asc", "desc"):
+        params = {"limit": 2, "only_mine": True, "sort_by": "description", "sort_order": sort_order}
+        names = _page_through(client, auth_headers, params)
+        assert sorted(names) == sorted(f"Exercise {i}" for i in range(len(descriptions)))
+        # NULLs come last either way
+        assert names[-3:] == sorted(names[-3:], reverse=sort_order == "desc")
+        assert {descriptions[int(name.split()[1])] for name in names[-3:]} == {None}
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from app.core import cache
+from app.models import Exercise, User, WorkoutExercise, WorkoutPlan
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.schemas.scheduled_workout import ScheduledWorkoutUpdate
+from app.services.schedule_service import update_scheduled_workout
+
+WORKOUT_DAY = date.today() - timedelta(days=7)
+
+
+def _seed(client, db, email: str, headers: dict) -> tuple[int, int, int, int]:
+    """A plan (3 x 5 at 100) with one completed workout; returns (user_id, plan_id, exercise_id, scheduled_id)"""
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    exercise = Exercise(name="Bench", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.CHEST, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(
+        name="Push",
+        user_id=user_id,
+        exercises=[WorkoutExercise(exercise_id=exercise.id, sets=3, repetitions=5, weight=Decimal(100), order_index=0)]
+    )
+    db.add(plan)
+    db.commit()
+
+    scheduled_id = _complete_new_workout(client, plan.id, headers)
+    return user_id, plan.id, exercise.id, scheduled_id
+
+
+def _complete_new_workout(client, plan_id: int, headers: dict) -> int:
+    response = client.post(
+        "/api/v1/scheduled-workouts",
+        json={"workout_plan_id": plan_id, "scheduled_date": WORKOUT_DAY.isoformat()},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    scheduled_id = response.json()["id"]
+    response = client.post(f"/api/v1/scheduled-workouts/{scheduled_id}/complete", json={}, headers=headers)
+    assert response.status_code == 200, response.text
+    return scheduled_id
+
+
+def _heaviest(client, headers: dict) -> list:
+    response = client.get("/api/v1/analytics/personal-records", headers=headers)
+    assert response.status_code == 200, response.text
+    return [Decimal(str(record["heaviest_weight"])) for record in response.json()]
+
+
+def test_plan_edits_do_not_rewrite_records(client, db, user, auth_headers):
+    _, plan_id, exercise_id, _ = _seed(client, db, user["email"], auth_headers)
+    assert _heaviest(client, auth_headers) == [Decimal(100)]
+
+    response = client.put(
+        f"/api/v1/workout-plans/{plan_id}/exercises/{exercise_id}",
+        json={"weight": "140"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    # The completed workout was done at 100; only workouts completed from now on lift 140
+    assert _heaviest(client, auth_headers) == [Decimal(100)]
+
+    _complete_new_workout(client, plan_id, auth_headers)
+    assert _heaviest(client, auth_headers) == [Decimal(140)]
+
+
+def test_records_follow_writes_made_outside_this_process(client, db, user, auth_headers):
+    user_id, _, _, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    assert _heaviest(client, auth_headers) == [Decimal(100)]
+    cached = cache.get_personal_record_cache().get(user_id)
+    assert cached is not None
+
+    # Written straight to the database, as another worker would: nothing here invalidates the cache
+    update_scheduled_workout(db, scheduled_id, ScheduledWorkoutUpdate(status="scheduled"), user_id)
+    assert cache.get_personal_record_cache().get(user_id) is cached
+
+    assert _heaviest(client, auth_headers) == []
@@ -0,0 +1,37 @@
+import json
+import pytest
+from sqlalchemy import text
+from app.models import User, WorkoutPlan
+
+
+@pytest.fixture
+def rejected_plan_name(engine):
+    """A trigger that makes the database itself reject one plan name"""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TRIGGER reject_plan BEFORE INSERT ON workout_plans "
+            "WHEN NEW.name = 'Rejected' BEGIN SELECT RAISE(ABORT, 'plan name not allowed'); END"
+        ))
+    yield "Rejected"
+    with engine.begin() as connection:
+        connection.execute(text("DROP TRIGGER reject_plan"))
+
+
+def test_database_error_fails_only_the_offending_rows(client, db, user, auth_headers, rejected_plan_name):
+    names = ["Plan 1", "Plan 2", rejected_plan_name, "Plan 4", "Plan 5", rejected_plan_name, "Plan 7"]
+    body = "\n".join(json.dumps({"name": name}) for name in names)
+
+    response = client.post(
+        "/api/v1/workout-plans/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["imported"] == 5
+    assert [error["row"] for error in result["errors"]] == [3, 6]
+    assert all("plan name not allowed" in error["error"] for error in result["errors"])
+
+    user_id = db.query(User.id).filter(User.email == user["email"]).scalar()
+    imported = db.query(WorkoutPlan.name).filter(WorkoutPlan.user_id == user_id).order_by(WorkoutPlan.id)
+    assert [name for name, in imported] == [name for name in names if name != rejected_plan_name]
@@ -0,0 +1,36 @@
+import sqlite3
+import threading
+import time
+from app.core.pool_metrics import InstrumentedQueuePool
+
+
+def _slow_connect():
+    time.sleep(0.01)
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_slow_connects_are_not_waits():
+    pool = InstrumentedQueuePool(_slow_connect, pool_size=2, max_overflow=1)
+    connections = [pool.connect() for _ in range(3)]
+    for connection in connections:
+        connection.close()
+    pool.connect().close()
+
+    metrics = pool.metrics.snapshot()
+    assert metrics["checkouts"] == 4
+    assert metrics["connects"] == 3
+    assert metrics["avg_connect_ms"] >= 10
+    assert metrics["waits"] == 0
+
+
+def test_checkout_from_a_saturated_pool_is_a_wait():
+    pool = InstrumentedQueuePool(_slow_connect, pool_size=1, max_overflow=0, timeout=5)
+    held = pool.connect()
+    threading.Timer(0.05, held.close).start()
+
+    pool.connect().close()
+
+    metrics = pool.metrics.snapshot()
+    assert metrics["waits"] == 1
+    assert metrics["connects"] == 1
+    assert metrics["max_checkout_ms"] >= 40
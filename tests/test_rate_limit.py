@@ -0,0 +1,90 @@
+import pytest
+from app.config import get_settings
+from app.core.password_pool import get_password_pool
+from app.core.rate_limit import (
+    DatabaseRateLimitBackend,
+    MemoryRateLimitBackend,
+    Rate,
+    RateLimitBackend,
+    get_rate_limiter
+)
+from tests.conftest import TEST_PASSWORD
+
+
+class RecordingBackend(RateLimitBackend):
+    """Allows every request and keeps the keys it was asked about"""
+
+    def __init__(self):
+        self.keys = []
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        self.keys.append(key)
+        return 0.0
+
+
+@pytest.fixture
+def rate_limit_keys(monkeypatch) -> list:
+    backend = RecordingBackend()
+    monkeypatch.setattr(get_rate_limiter(), "backend", backend)
+    monkeypatch.setattr(get_rate_limiter(), "enabled", True)
+    return backend.keys
+
+
+def test_register_is_limited_per_ip_and_per_email(client, rate_limit_keys):
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"email": "New.User@Example.com", "password": "test-password", "full_name": "New User"}
+    )
+    assert response.status_code == 201, response.text
+    ip_key, email_key = rate_limit_keys
+    assert ip_key.startswith("register:ip:")
+    assert email_key == "register:email:new.user@example.com"
+
+
+def test_login_is_limited_per_ip_and_per_email(client, user, rate_limit_keys):
+    client.post("/api/v1/auth/login", data={"username": user["email"], "password": "wrong"})
+    ip_key, email_key = rate_limit_keys
+    assert ip_key.startswith("login:ip:")
+    assert email_key == f"login:email:{user['email']}"
+
+
+@pytest.fixture
+def tight_email_limit(monkeypatch):
+    monkeypatch.setattr(get_settings(), "AUTH_RATE_LIMIT_PER_EMAIL", 2)
+    # Long enough that the test never straddles a window boundary
+    monkeypatch.setattr(get_settings(), "AUTH_RATE_LIMIT_WINDOW_SECONDS", 3600)
+    monkeypatch.setattr(get_rate_limiter(), "enabled", True)
+
+
+@pytest.mark.parametrize("make_backend", [
+    lambda: MemoryRateLimitBackend(max_keys=100),
+    DatabaseRateLimitBackend,
+], ids=["memory", "database"])
+def test_exhausted_limit_is_429_with_retry_after(client, user, monkeypatch, tight_email_limit, make_backend):
+    monkeypatch.setattr(get_rate_limiter(), "backend", make_backend())
+
+    for _ in range(2):
+        response = client.post("/api/v1/auth/login", data={"username": user["email"], "password": "wrong"})
+        assert response.status_code == 401, response.text
+
+    response = client.post("/api/v1/auth/login", data={"username": user["email"], "password": "wrong"})
+    assert response.status_code == 429, response.text
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_deep_hashing_queue_is_503_with_retry_after(client, user, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PASSWORD_HASH_MAX_QUEUE", 0)
+    # One hash already waiting for a worker
+    monkeypatch.setattr(get_password_pool(), "waiting", 1)
+
+    response = client.post("/api/v1/auth/login", data={"username": user["email"], "password": TEST_PASSWORD})
+    assert response.status_code == 503, response.text
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_backends_must_implement_hit():
+    class Incomplete(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
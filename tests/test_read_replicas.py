@@ -0,0 +1,118 @@
+import tempfile
+import pytest
+from sqlalchemy import create_engine, insert, select
+from app.config import get_settings
+from app.core import cache
+from app.core.read_your_writes import LAST_WRITE_COOKIE
+from app.database import Base, get_replica_engines, get_replicas
+from app.models import User, WorkoutPlan
+from tests.conftest import register
+
+
+@pytest.fixture
+def replica(engine, client, monkeypatch):
+    """
+    A second database configured as the read replica. Nothing replicates to
+    it, so which rows a response holds tells which database served it.
+    """
+    url = f"sqlite:///{tempfile.mkdtemp(prefix='workout-replica-')}/replica.db"
+    replica_engine = create_engine(url)
+    Base.metadata.create_all(replica_engine)
+
+    monkeypatch.setattr(get_settings(), "DATABASE_REPLICA_URLS", url)
+    # The client is shared by the whole session: start without last-write cookies
+    client.cookies.clear()
+    get_replica_engines.cache_clear()
+    get_replicas.cache_clear()
+    yield replica_engine
+
+    for async_engine in get_replica_engines():
+        client.portal.call(async_engine.dispose)
+    get_replica_engines.cache_clear()
+    get_replicas.cache_clear()
+    replica_engine.dispose()
+
+
+def _replicate_user(db, replica_engine, email: str) -> int:
+    """Copy the user's row to the replica, as replication would; returns the id"""
+    user = db.scalar(select(User).where(User.email == email))
+    with replica_engine.begin() as connection:
+        connection.execute(insert(User.__table__).values(
+            {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        ))
+    return user.id
+
+
+def _plan_names(client, headers: dict) -> list:
+    response = client.get("/api/v1/workout-plans", headers=headers)
+    assert response.status_code == 200, response.text
+    return [plan["name"] for plan in response.json()]
+
+
+def test_reads_go_to_the_replica(client, db, replica, user, auth_headers):
+    user_id = _replicate_user(db, replica, user["email"])
+    with replica.begin() as connection:
+        connection.execute(insert(WorkoutPlan.__table__).values(name="On the replica", user_id=user_id))
+
+    assert _plan_names(client, auth_headers) == ["On the replica"]
+
+
+def test_user_missing_on_the_replica_is_read_from_the_primary(client, replica, user, auth_headers):
+    # Registered moments ago, not replicated yet
+    assert _plan_names(client, auth_headers) == []
+    assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 200
+
+
+def test_reads_stay_on_the_primary_after_a_write(client, db, replica, user, auth_headers):
+    _replicate_user(db, replica, user["email"])
+    response = client.post("/api/v1/workout-plans", json={"name": "Just written"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+
+    # Read-your-writes: the replica doesn't have the plan yet, the primary does
+    assert cache.get_recent_writers().get(user["email"]) is not None
+    assert _plan_names(client, auth_headers) == ["Just written"]
+
+    # Once the sticky window has passed, reads go back to the replica
+    cache.get_recent_writers().clear()
+    client.cookies.clear()
+    assert _plan_names(client, auth_headers) == []
+
+
+def test_last_write_cookie_keeps_reads_on_the_primary_on_any_worker(client, db, replica, user, auth_headers):
+    _replicate_user(db, replica, user["email"])
+    response = client.post("/api/v1/workout-plans", json={"name": "Just written"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+    assert LAST_WRITE_COOKIE in response.cookies
+
+    # Another worker: it never saw the write, only the client's cookie tells
+    cache.get_recent_writers().clear()
+    assert _plan_names(client, auth_headers) == ["Just written"]
+
+
+def test_last_write_cookie_only_counts_for_its_user(client, db, replica, user, auth_headers):
+    _replicate_user(db, replica, user["email"])
+    other = register(client)
+    other_id = _replicate_user(db, replica, other["email"])
+    with replica.begin() as connection:
+        connection.execute(insert(WorkoutPlan.__table__).values(name="On the replica", user_id=other_id))
+
+    client.post("/api/v1/workout-plans", json={"name": "Just written"}, headers=auth_headers)
+    cache.get_recent_writers().clear()
+
+    # Same cookie jar, other user: their reads still go to the replica
+    other_headers = {"Authorization": f"Bearer {other['access_token']}"}
+    assert _plan_names(client, other_headers) == ["On the replica"]
+
+
+def test_stickiness_is_per_user(client, db, replica, user, auth_headers):
+    _replicate_user(db, replica, user["email"])
+    client.post("/api/v1/workout-plans", json={"name": "Just written"}, headers=auth_headers)
+
+    other = register(client)
+    other_id = _replicate_user(db, replica, other["email"])
+    with replica.begin() as connection:
+        connection.execute(insert(WorkoutPlan.__table__).values(name="On the replica", user_id=other_id))
+
+    other_headers = {"Authorization": f"Bearer {other['access_token']}"}
+    assert _plan_names(client, other_headers) == ["On the replica"]
+    assert _plan_names(client, auth_headers) == ["Just written"]
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.request_timing import (
+    QueryBudgetExceeded,
+    RequestTimingMiddleware,
+    TimedRoute,
+    assert_query_budget,
+    install_sql_timing,
+    query_budget,
+    response_query_count
+)
+
+
+def _run_queries(db, count: int) -> None:
+    for _ in range(count):
+        db.execute(text("SELECT 1"))
+
+
+def test_query_budget_counts_statements(db):
+    install_sql_timing()
+    with query_budget(3) as timing:
+        _run_queries(db, 3)
+    assert timing.db_queries == 3
+
+
+def test_query_budget_fails_when_exceeded(db):
+    install_sql_timing()
+    with pytest.raises(QueryBudgetExceeded, match="4 queries executed, budget is 3"):
+        with query_budget(3):
+            _run_queries(db, 4)
+
+
+def test_assert_query_budget_reads_server_timing(client, auth_headers):
+    response = client.get("/api/v1/workout-plans", headers=auth_headers)
+    assert response.status_code == 200
+    count = response_query_count(response)
+    assert count > 0
+
+    assert_query_budget(response, count)
+    with pytest.raises(QueryBudgetExceeded, match="GET /api/v1/workout-plans"):
+        assert_query_budget(response, count - 1)
+
+
+def test_included_routes_wrap_endpoints_once():
+    router = APIRouter(route_class=TimedRoute)
+    calls = []
+
+    @router.get("/ping")
+    async def ping():
+        calls.append(1)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    app.include_router(router, prefix="/api")
+
+    route = next(route for route in app.routes if isinstance(route, APIRoute) and route.path == "/api/ping")
+    # One timing wrapper around the original function
+    assert route.endpoint.__wrapped__ is ping
+
+    response = TestClient(app).get("/api/ping")
+    assert response.status_code == 200
+    assert calls == [1]
+    assert "serialize;dur=" in response.headers["server-timing"]
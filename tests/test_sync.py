@@ -0,0 +1,113 @@
+from sqlalchemy import select
+from app.models import Exercise, SyncTombstone, User, WorkoutExercise, WorkoutPlan
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.services.sync_service import get_changes
+
+
+def _sync(client, headers: dict, token: str = None) -> dict:
+    response = client.get("/api/v1/sync", params={"token": token} if token else {}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _create_plan(client, headers: dict, exercise_ids: list) -> dict:
+    response = client.post(
+        "/api/v1/workout-plans",
+        json={
+            "name": "Full body",
+            "exercise": [
+                {"exercise_id": exercise_id, "sets": 3, "repetitions": 10, "order_index": i}
+                for i, exercise_id in enumerate(exercise_ids)
+            ]
+        },
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _create_exercise(client, headers: dict, name: str) -> int:
+    response = client.post(
+        "/api/v1/exercises",
+        json={"name": name, "category": "strength", "muscle_group": "legs"},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _deleted(changes: dict) -> list:
+    return sorted((row["entity_type"], row["entity_id"]) for row in changes["deleted"])
+
+
+def test_plan_exercises_carry_the_plan_owner(client, db, user, auth_headers):
+    exercise_id = _create_exercise(client, auth_headers, "Squat")
+    plan = _create_plan(client, auth_headers, [exercise_id])
+    other_id = _create_exercise(client, auth_headers, "Lunge")
+    response = client.post(
+        f"/api/v1/workout-plans/{plan['id']}/exercises",
+        json={"exercise_id": other_id, "sets": 3, "repetitions": 8, "order_index": 1},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+
+    user_id = db.scalar(select(User.id).where(User.email == user["email"]))
+    owners = db.scalars(select(WorkoutExercise.user_id).where(WorkoutExercise.workout_plan_id == plan["id"])).all()
+    assert owners == [user_id, user_id]
+
+
+def test_plan_exercise_owner_defaults_from_the_plan(db, user):
+    user_id = db.scalar(select(User.id).where(User.email == user["email"]))
+    exercise = Exercise(name="Row", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.BACK, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(name="Back", user_id=user_id)
+    db.add(plan)
+    db.flush()
+    db.add(WorkoutExercise(workout_plan_id=plan.id, exercise_id=exercise.id, sets=3, repetitions=10, order_index=0))
+    db.commit()
+
+    assert db.scalar(select(WorkoutExercise.user_id)) == user_id
+    assert len(get_changes(db, user_id)["workout_exercises"]) == 1
+
+
+def test_recurrences_sync_and_leave_tombstones(client, user, auth_headers):
+    plan = _create_plan(client, auth_headers, [_create_exercise(client, auth_headers, "Squat")])
+    token = _sync(client, auth_headers)["sync_token"]
+
+    response = client.post(
+        "/api/v1/scheduled-workouts/recurrences",
+        json={"workout_plan_id": plan["id"], "start_date": "2026-01-05", "weekdays": ["MO", "TH"]},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    recurrence_id = response.json()["id"]
+
+    changes = _sync(client, auth_headers, token)
+    assert [(row["id"], row["weekdays"]) for row in changes["workout_recurrences"]] == [(recurrence_id, ["MO", "TH"])]
+
+    # Deleting the plan takes its recurrence with it
+    assert client.delete(f"/api/v1/workout-plans/{plan['id']}", headers=auth_headers).status_code == 204
+    changes = _sync(client, auth_headers, changes["sync_token"])
+    assert ("workout_recurrence", recurrence_id) in _deleted(changes)
+
+
+def test_deletes_write_one_tombstone_per_row(client, db, user, auth_headers):
+    exercise_id = _create_exercise(client, auth_headers, "Squat")
+    plan = _create_plan(client, auth_headers, [exercise_id])
+    plan_exercise_id = plan["exercise"][0]["id"]
+    token = _sync(client, auth_headers)["sync_token"]
+
+    # The plan entry goes with the exercise; deleting the plan later doesn't tombstone it again
+    assert client.delete(f"/api/v1/exercises/{exercise_id}", headers=auth_headers).status_code == 204
+    assert client.delete(f"/api/v1/workout-plans/{plan['id']}", headers=auth_headers).status_code == 204
+
+    assert _deleted(_sync(client, auth_headers, token)) == [
+        ("exercise", exercise_id),
+        ("workout_exercise", plan_exercise_id),
+        ("workout_plan", plan["id"]),
+    ]
+    entries = db.scalars(
+        select(SyncTombstone.entity_id).where(SyncTombstone.entity_type == "workout_exercise")
+    ).all()
+    assert entries == [plan_exercise_id]
@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.core.token_revocation import RevocationList, revocation_list
+from app.models import User
+from app.services.user_service import _set_password
+from tests.conftest import TEST_PASSWORD
+
+
+def _refresh(client, refresh_token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def _start_of_a_second() -> None:
+    """Sleep to just after a second boundary, so what follows runs within one second"""
+    time.sleep(1 - time.time() % 1)
+
+
+def test_reuse_revokes_tokens_issued_earlier_in_the_same_second(client, user):
+    _start_of_a_second()
+    rotated = _refresh(client, user["refresh_token"])
+    assert rotated.status_code == 200, rotated.text
+
+    # The first token again: reuse, every token issued so far is revoked
+    assert _refresh(client, user["refresh_token"]).status_code == 401
+
+    stolen = rotated.json()
+    assert _refresh(client, stolen["refresh_token"]).status_code == 401
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {stolen['access_token']}"})
+    assert response.status_code == 401
+
+
+def test_tokens_issued_after_a_reuse_in_the_same_second_work(client, user):
+    _start_of_a_second()
+    _refresh(client, user["refresh_token"])
+    assert _refresh(client, user["refresh_token"]).status_code == 401
+
+    response = client.post("/api/v1/auth/login", data={"username": user["email"], "password": TEST_PASSWORD})
+    assert response.status_code == 200, response.text
+    refreshed = _refresh(client, response.json()["refresh_token"])
+    assert refreshed.status_code == 200, refreshed.text
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {refreshed.json()['access_token']}"})
+    assert response.status_code == 200
+
+
+def test_cutoff_compares_fractional_issued_at():
+    revocations = RevocationList()
+    revoked_at = datetime(2026, 10, 17, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    revocations.add(None, "user@example.com", revoked_at, revoked_at + timedelta(days=7))
+
+    cutoff = revoked_at.timestamp()
+    assert revocations.is_revoked(None, "user@example.com", cutoff - 0.25)
+    assert not revocations.is_revoked(None, "user@example.com", cutoff + 0.25)
+    assert not revocations.is_revoked(None, "other@example.com", cutoff - 0.25)
+
+
+@pytest.fixture
+def rejected_revocation(engine):
+    """A trigger that makes the database reject new revoked_tokens rows"""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TRIGGER reject_revocation BEFORE INSERT ON revoked_tokens "
+            "BEGIN SELECT RAISE(ABORT, 'revocation rejected'); END"
+        ))
+    yield
+    with engine.begin() as connection:
+        connection.execute(text("DROP TRIGGER reject_revocation"))
+
+
+def test_password_change_and_revocation_commit_together(db, user, rejected_revocation):
+    db_user = db.query(User).filter(User.email == user["email"]).one()
+    old_hash = db_user.password_hash
+
+    with pytest.raises(DBAPIError):
+        _set_password(db, db_user.id, "not-a-real-hash")
+    db.rollback()
+
+    db.refresh(db_user)
+    assert db_user.password_hash == old_hash
+    assert not revocation_list.is_revoked(None, user["email"], time.time() - 60)
@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from app.models import Exercise, ScheduledWorkout, TrainingVolumeWeek, User, WorkoutExercise, WorkoutPlan
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.services.analytics_service import rebuild_training_volume
+
+WORKOUT_DAY = date.today() - timedelta(days=14)
+
+
+def _seed(client, db, email: str, headers: dict) -> tuple[int, int, int]:
+    """A plan (3 x 5 at 100) scheduled two weeks ago; returns (plan_id, exercise_id, scheduled_id)"""
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    exercise = Exercise(name="Squat", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.LEGS, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(
+        name="Legs",
+        user_id=user_id,
+        exercises=[WorkoutExercise(exercise_id=exercise.id, sets=3, repetitions=5, weight=Decimal(100), order_index=0)]
+    )
+    db.add(plan)
+    db.commit()
+
+    response = client.post(
+        "/api/v1/scheduled-workouts",
+        json={"workout_plan_id": plan.id, "scheduled_date": WORKOUT_DAY.isoformat()},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return plan.id, exercise.id, response.json()["id"]
+
+
+def _volume(client, headers: dict) -> list:
+    response = client.get("/api/v1/analytics/volume", headers=headers)
+    assert response.status_code == 200, response.text
+    return [(row["week_start"], Decimal(row["volume"]), row["workouts"]) for row in response.json()]
+
+
+def _edit_plan(client, plan_id: int, exercise_id: int, headers: dict) -> None:
+    response = client.put(
+        f"/api/v1/workout-plans/{plan_id}/exercises/{exercise_id}",
+        json={"weight": "140"},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_uncomplete_after_plan_edit_removes_what_was_added(client, db, user, auth_headers):
+    plan_id, exercise_id, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    assert client.post(f"/api/v1/scheduled-workouts/{scheduled_id}/complete", json={}, headers=auth_headers).status_code == 200
+    assert [row[1:] for row in _volume(client, auth_headers)] == [(Decimal(1500), 1)]
+
+    _edit_plan(client, plan_id, exercise_id, auth_headers)
+    response = client.put(f"/api/v1/scheduled-workouts/{scheduled_id}", json={"status": "scheduled"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["completed_at"] is None
+    assert _volume(client, auth_headers) == []
+
+
+def test_delete_after_plan_edit_removes_what_was_added(client, db, user, auth_headers):
+    plan_id, exercise_id, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    client.post(f"/api/v1/scheduled-workouts/{scheduled_id}/complete", json={}, headers=auth_headers)
+
+    _edit_plan(client, plan_id, exercise_id, auth_headers)
+    # Another workout of the plan in the same week, completed after the edit
+    other_id = client.post(
+        "/api/v1/scheduled-workouts",
+        json={"workout_plan_id": plan_id, "scheduled_date": WORKOUT_DAY.isoformat()},
+        headers=auth_headers
+    ).json()["id"]
+    client.post(f"/api/v1/scheduled-workouts/{other_id}/complete", json={}, headers=auth_headers)
+    assert [row[1:] for row in _volume(client, auth_headers)] == [(Decimal(3600), 2)]
+
+    assert client.delete(f"/api/v1/scheduled-workouts/{scheduled_id}", headers=auth_headers).status_code == 204
+    assert [row[1:] for row in _volume(client, auth_headers)] == [(Decimal(2100), 1)]
+
+
+def test_moving_a_completed_workout_moves_its_snapshot(client, db, user, auth_headers):
+    plan_id, exercise_id, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    client.post(f"/api/v1/scheduled-workouts/{scheduled_id}/complete", json={}, headers=auth_headers)
+
+    _edit_plan(client, plan_id, exercise_id, auth_headers)
+    new_day = WORKOUT_DAY + timedelta(days=7)
+    response = client.put(
+        f"/api/v1/scheduled-workouts/{scheduled_id}",
+        json={"scheduled_date": new_day.isoformat()},
+        headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    week = (new_day - timedelta(days=new_day.weekday())).isoformat()
+    assert _volume(client, auth_headers) == [(week, Decimal(1500), 1)]
+
+
+def test_completing_through_update_sets_completed_at(client, db, user, auth_headers):
+    _, _, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    response = client.put(f"/api/v1/scheduled-workouts/{scheduled_id}", json={"status": "completed"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["completed_at"] is not None
+    assert [row[1:] for row in _volume(client, auth_headers)] == [(Decimal(1500), 1)]
+
+
+def test_rebuild_matches_the_incremental_rollup(client, db, user, auth_headers):
+    plan_id, exercise_id, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    client.post(f"/api/v1/scheduled-workouts/{scheduled_id}/complete", json={}, headers=auth_headers)
+    _edit_plan(client, plan_id, exercise_id, auth_headers)
+    incremental = _volume(client, auth_headers)
+
+    rebuild_training_volume(db)
+    assert _volume(client, auth_headers) == incremental
+
+
+def test_deleting_a_plan_removes_its_completed_workouts(client, db, user, auth_headers):
+    plan_id, _, scheduled_id = _seed(client, db, user["email"], auth_headers)
+    _, _, kept_id = _seed(client, db, user["email"], auth_headers)
+    for completed_id in (scheduled_id, kept_id):
+        client.post(f"/api/v1/scheduled-workouts/{completed_id}/complete", json={}, headers=auth_headers)
+    assert [row[1:] for row in _volume(client, auth_headers)] == [(Decimal(3000), 2)]
+
+    assert client.delete(f"/api/v1/workout-plans/{plan_id}", headers=auth_headers).status_code == 204
+    incremental = _volume(client, auth_headers)
+    assert [row[1:] for row in incremental] == [(Decimal(1500), 1)]
+
+    rebuild_training_volume(db)
+    assert _volume(client, auth_headers) == incremental
+
+
+def test_rebuild_snapshots_completed_workouts_without_one(db, user):
+    user_id = db.query(User.id).filter(User.email == user["email"]).scalar()
+    exercise = Exercise(name="Row", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.BACK, created_by=user_id)
+    db.add(exercise)
+    db.flush()
+    plan = WorkoutPlan(
+        name="Back",
+        user_id=user_id,
+        exercises=[WorkoutExercise(exercise_id=exercise.id, sets=4, repetitions=10, weight=Decimal(50), order_index=0)]
+    )
+    db.add(plan)
+    db.flush()
+    db.add(ScheduledWorkout(user_id=user_id, workout_plan_id=plan.id, scheduled_date=WORKOUT_DAY, status="completed"))
+    db.commit()
+
+    assert rebuild_training_volume(db, user_id) == 1
+    row = db.query(TrainingVolumeWeek).filter(TrainingVolumeWeek.user_id == user_id).one()
+    assert (row.volume, row.sets, row.workouts) == (Decimal(2000), 4, 1)
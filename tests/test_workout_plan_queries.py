@@ -0,0 +1,75 @@
+from app.models import Exercise, User, WorkoutExercise, WorkoutPlan
+from app.models.exercise import ExerciseCategory, MuscleGroup
+from app.core.request_timing import assert_query_budget, query_budget, response_query_count
+from app.services.workout_service import get_workout_plans
+
+EXERCISES_PER_PLAN = 3
+
+# Auth (user lookup), count, plan page, the page's exercises
+LIST_QUERY_BUDGET = 4
+# Auth (user lookup), plan, its exercises
+DETAIL_QUERY_BUDGET = 3
+
+
+def _seed_plans(db, email: str, count: int) -> int:
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    exercises = [
+        Exercise(name=f"Exercise {i}", category=ExerciseCategory.STRENGTH, muscle_group=MuscleGroup.LEGS, created_by=user_id)
+        for i in range(EXERCISES_PER_PLAN)
+    ]
+    db.add_all(exercises)
+    db.flush()
+    for i in range(count):
+        db.add(WorkoutPlan(
+            name=f"Plan {i}",
+            user_id=user_id,
+            exercises=[
+                WorkoutExercise(exercise_id=exercise.id, sets=3, repetitions=10, order_index=j)
+                for j, exercise in enumerate(exercises)
+            ]
+        ))
+    db.commit()
+    return user_id
+
+
+def test_plan_list_page_of_100_has_a_fixed_query_count(client, db, user, auth_headers):
+    _seed_plans(db, user["email"], 100)
+
+    response = client.get("/api/v1/workout-plans", params={"limit": 100}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    plans = response.json()
+    assert len(plans) == 100
+    assert all(len(plan["exercise"]) == EXERCISES_PER_PLAN for plan in plans)
+    assert_query_budget(response, LIST_QUERY_BUDGET)
+
+
+def test_plan_list_query_count_does_not_grow_with_page_size(client, db, user, auth_headers):
+    _seed_plans(db, user["email"], 100)
+
+    counts = []
+    for limit in (10, 100):
+        # Same principal cache state for both requests
+        client.get("/api/v1/workout-plans", params={"limit": 1}, headers=auth_headers)
+        response = client.get("/api/v1/workout-plans", params={"limit": limit}, headers=auth_headers)
+        counts.append(response_query_count(response))
+    assert counts[0] == counts[1]
+
+
+def test_plan_detail_loads_exercises_eagerly(client, db, user, auth_headers):
+    _seed_plans(db, user["email"], 1)
+    plan_id = db.query(WorkoutPlan.id).scalar()
+
+    response = client.get(f"/api/v1/workout-plans/{plan_id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert len(response.json()["exercise"]) == EXERCISES_PER_PLAN
+    assert_query_budget(response, DETAIL_QUERY_BUDGET)
+
+
+def test_orm_plan_page_serializes_without_lazy_loads(db, user):
+    user_id = _seed_plans(db, user["email"], 100)
+    db.expunge_all()
+
+    # Count, plan page, the page's exercises; reading exercises afterwards loads nothing
+    with query_budget(3):
+        plans, _, _ = get_workout_plans(db, user_id, limit=100)
+        assert sum(len(plan.exercises) for plan in plans) == 100 * EXERCISES_PER_PLAN